@@ -10,13 +10,29 @@ Downloads the pre-converted .sqlite file so you can immediately use nsys-ai
 without needing nsys or Modal installed.
 """
 
+import argparse
+import hashlib
+import importlib.util
 import os
-import subprocess
+import shutil
 import sys
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 HF_REPO = "GindaChen/nsys-hero"
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
 
+# Parallel range download: 32 MiB per request, 8 requests in flight
+RANGE_CHUNK = 32 * 1024 * 1024
+RANGE_WORKERS = 8
+# Files at least this large are fetched by worker processes, leaving the parent's
+# interpreter to the SHA256; smaller ones use threads, which are cheaper to start
+PROCESS_THRESHOLD = 256 * 1024 * 1024
+# Socket read / file write size; large reads keep Python-level loop overhead negligible
+STREAM_CHUNK = 1024 * 1024
+
 # Remote names on HuggingFace
 _HF_SQLITE = "distca-0/baseline.t128k.host-fs-mbz-gpu-899.sqlite"
 _HF_NSYS = "distca-0/baseline.t128k.host-fs-mbz-gpu-899.nsys-rep"
@@ -26,13 +42,358 @@ LOCAL_SQLITE = "megatron_distca.sqlite"
 LOCAL_NSYS = "megatron_distca.nsys-rep"
 
 
+def _configure_hf_transfer(enabled):
+    """Toggle hf_transfer's multi-connection downloader.
+
+    Must run before ``huggingface_hub`` is imported: the library reads
+    ``HF_HUB_ENABLE_HF_TRANSFER`` once, at import time.
+    """
+    if enabled:
+        os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+    else:
+        os.environ["HF_HUB_ENABLE_HF_TRANSFER"] = "0"
+
+
+class _Progress:
+    """Thread-safe byte counter shared by the range-download workers."""
+
+    def __init__(self, total, done=0):
+        self.total = total
+        self.done = done
+        self._shown = -1
+        self._lock = threading.Lock()
+
+    def add(self, n):
+        with self._lock:
+            self.done += n
+            pct = self.done * 100 // self.total
+            if pct == self._shown:
+                return
+            self._shown = pct
+        print(f"\r  {pct:3d}%  {self.done / 1e6:,.0f} / {self.total / 1e6:,.0f} MB", end="")
+
+
+def _remote_size(url, headers):
+    """Total size of *url* if the server honours byte ranges, else None."""
+    req = urllib.request.Request(url, headers={**headers, "Range": "bytes=0-0"})
+    with urllib.request.urlopen(req) as r:
+        if r.status != 206:
+            return None
+        total = r.headers.get("Content-Range", "").rpartition("/")[2]
+    return int(total) if total.isdigit() else None
+
+
+def _fetch_range(url, headers, fd, lo, hi, progress):
+    """Write bytes [lo, hi) of *url* into *fd* at the matching offset."""
+    req = urllib.request.Request(url, headers={**headers, "Range": f"bytes={lo}-{hi - 1}"})
+    with urllib.request.urlopen(req) as r:
+        if r.status != 206:
+            raise OSError(f"server ignored Range request for bytes {lo}-{hi - 1}")
+        offset = lo
+        while buf := r.read(STREAM_CHUNK):
+            os.pwrite(fd, buf, offset)
+            offset += len(buf)
+            if progress is not None:
+                progress.add(len(buf))
+    if offset != hi:
+        raise OSError(f"short read for bytes {lo}-{hi - 1}: got {offset - lo}")
+
+
+def _fetch_range_to(url, headers, path, lo, hi, progress=None):
+    """Process-pool entry point: open *path* and fetch bytes [lo, hi) into it."""
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        _fetch_range(url, headers, fd, lo, hi, progress)
+    finally:
+        os.close(fd)
+
+
+def _preallocate(fd, size):
+    """Reserve *size* bytes for *fd* up front so parallel writes don't fragment it."""
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except OSError:
+            pass  # filesystem without fallocate support; ftruncate below still sizes it
+    elif sys.platform == "darwin":
+        import fcntl
+        import struct
+
+        f_preallocate = getattr(fcntl, "F_PREALLOCATE", 42)
+        # fstore_t {flags, posmode=F_PEOFPOSMODE, offset, length, bytesalloc}
+        for flags in (0x2 | 0x4, 0x4):  # F_ALLOCATECONTIG|F_ALLOCATEALL, then F_ALLOCATEALL
+            try:
+                fcntl.fcntl(fd, f_preallocate, struct.pack("Iiqqq", flags, 3, 0, size, 0))
+                break
+            except OSError:
+                continue
+    os.ftruncate(fd, size)
+
+
+def _discard(partial):
+    """Remove a partial download and its chunk journal, if present."""
+    for path in (partial, partial + ".done"):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class _TeeWriter:
+    """File writer that feeds every chunk to a SHA256 as it is written."""
+
+    def __init__(self, f, h):
+        self._f = f
+        self._h = h
+
+    def write(self, chunk):
+        self._f.write(chunk)
+        self._h.update(chunk)
+        return len(chunk)
+
+    def hexdigest(self):
+        return self._h.hexdigest()
+
+
+class _OrderedHasher:
+    """SHA256 over a range-downloaded file, advanced as chunks complete.
+
+    Chunks finish out of order; each is hashed once every chunk before it is
+    done, reading it back while it is still hot in the page cache. This
+    overlaps hashing with the download instead of re-reading the whole file
+    afterwards.
+    """
+
+    def __init__(self, path, size):
+        # Unbuffered pread: a buffered reader's read-ahead would cache bytes of
+        # the next chunk before its worker has written them.
+        self._fd = os.open(path, os.O_RDONLY)
+        self._h = hashlib.sha256()
+        self._size = size
+        self._next = 0
+        self._ready = set()
+
+    def complete(self, lo):
+        self._ready.add(lo)
+        while self._next in self._ready:
+            self._ready.remove(self._next)
+            hi = min(self._next + RANGE_CHUNK, self._size)
+            pos = self._next
+            while pos < hi:
+                buf = os.pread(self._fd, min(STREAM_CHUNK, hi - pos), pos)
+                self._h.update(buf)
+                pos += len(buf)
+            self._next = hi
+
+    def hexdigest(self):
+        os.close(self._fd)
+        return self._h.hexdigest()
+
+
+def _stream_download(url, partial, headers):
+    """Sequential download that resumes from the length of an existing *partial*.
+
+    Returns the SHA256 of the complete file.
+    """
+    have = os.path.getsize(partial) if os.path.exists(partial) else 0
+    req_headers = {**headers, "Range": f"bytes={have}-"} if have else headers
+    try:
+        r = urllib.request.urlopen(urllib.request.Request(url, headers=req_headers))
+    except urllib.error.HTTPError as e:
+        if have and e.code == 416:  # nothing left past the end: already complete
+            return _sha256_file(partial)
+        raise
+    with r:
+        if r.status != 206:
+            have = 0  # the server ignored the Range header; start over
+        h = _sha256_file(partial, hexdigest=False) if have else hashlib.sha256()
+        with open(partial, "ab" if have else "wb") as f:
+            tee = _TeeWriter(f, h)
+            shutil.copyfileobj(r, tee, STREAM_CHUNK)
+    return tee.hexdigest()
+
+
+def _range_download(url, partial, headers):
+    """Download *url* into *partial* with concurrent byte-range GETs; return its SHA256.
+
+    Finished chunk offsets are appended to ``<partial>.done`` so an
+    interrupted download resumes with only the missing chunks. Large files
+    are fetched by worker processes that ``pwrite`` straight into the
+    preallocated file, so the parent's hashing never competes with them for
+    the GIL; progress is then reported per finished chunk. Falls back to
+    one sequential (tail-resuming) stream when the server does not answer
+    ``Range`` requests with 206 Partial Content.
+    """
+    size = _remote_size(url, headers)
+    journal = partial + ".done"
+    if size is None or not hasattr(os, "pwrite"):
+        if os.path.exists(journal):  # chunked leftovers are not a contiguous prefix
+            _discard(partial)
+        return _stream_download(url, partial, headers)
+
+    done = set()
+    if os.path.exists(journal) and os.path.exists(partial) and os.path.getsize(partial) == size:
+        with open(journal) as f:
+            done = {int(line) for line in f if line.strip()}
+    else:
+        _discard(partial)
+    todo = [lo for lo in range(0, size, RANGE_CHUNK) if lo not in done]
+    if done:
+        print(f"  Resuming: {len(done)} of {len(done) + len(todo)} chunks already on disk")
+
+    fd = os.open(partial, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        _preallocate(fd, size)
+        progress = _Progress(size, done=sum(min(lo + RANGE_CHUNK, size) - lo for lo in done))
+        hasher = _OrderedHasher(partial, size)
+        for lo in sorted(done):
+            hasher.complete(lo)
+        in_processes = size >= PROCESS_THRESHOLD
+        if in_processes:
+            pool = ProcessPoolExecutor(max_workers=RANGE_WORKERS)
+            fetch, target, shared = _fetch_range_to, partial, None
+        else:
+            pool = ThreadPoolExecutor(max_workers=RANGE_WORKERS)
+            fetch, target, shared = _fetch_range, fd, progress
+        with pool, open(journal, "a") as log:
+            futures = {
+                pool.submit(
+                    fetch, url, headers, target, lo, min(lo + RANGE_CHUNK, size), shared
+                ): lo
+                for lo in todo
+            }
+            try:
+                for fut in as_completed(futures):
+                    fut.result()
+                    lo = futures[fut]
+                    log.write(f"{lo}\n")
+                    log.flush()
+                    if in_processes:
+                        progress.add(min(lo + RANGE_CHUNK, size) - lo)
+                    hasher.complete(lo)
+            except BaseException:
+                pool.shutdown(cancel_futures=True)
+                raise
+        print()
+        return hasher.hexdigest()
+    finally:
+        os.close(fd)
+
+
+def _sha256_file(path, hexdigest=True):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while buf := f.read(STREAM_CHUNK):
+            h.update(buf)
+    return h.hexdigest() if hexdigest else h
+
+
+def _remote_sha256s(filenames):
+    """Look up *filenames* in the dataset repo with a single Hub request.
+
+    Returns ``{filename: sha256}`` for the files that exist (the hash is None
+    when the Hub has no LFS metadata for it), or None if the Hub can't be
+    queried.
+    """
+    from huggingface_hub import HfApi
+
+    try:
+        infos = HfApi().get_paths_info(HF_REPO, filenames, repo_type="dataset")
+    except Exception:
+        return None  # verification is best-effort; the download reports real errors
+    return {info.path: getattr(getattr(info, "lfs", None), "sha256", None) for info in infos}
+
+
+def _expected_sha256(filename):
+    """SHA256 recorded in the Hub's LFS metadata for *filename*, or None."""
+    return (_remote_sha256s([filename]) or {}).get(filename)
+
+
+def _download(filename, dest, expected=None):
+    """Fetch *filename* from the dataset repo into *dest*.
+
+    Uses hf_transfer when it is enabled and installed. Otherwise -- or if
+    hf_transfer fails, e.g. behind a proxy it cannot traverse -- the file is
+    fetched with parallel HTTP range requests into ``<dest>.partial``. Either
+    way it is checked against the Hub's SHA256 and only then moved to *dest*.
+    The expected hash is kept in a ``<dest>.sha256`` sidecar while a range
+    download is incomplete, so a rerun resumes the partial file unless the
+    remote file has changed.
+    *expected* skips the Hub lookup when the caller already has the hash.
+    """
+    from huggingface_hub import hf_hub_download, hf_hub_url
+    from huggingface_hub.utils import build_hf_headers
+
+    expected = expected or _expected_sha256(filename)
+    if os.environ.get("HF_HUB_ENABLE_HF_TRANSFER") == "1" and importlib.util.find_spec(
+        "hf_transfer"
+    ):
+        # A cache next to *dest* keeps the final move on one filesystem and,
+        # since it survives failures, lets hf_hub_download resume.
+        cache = os.path.join(os.path.dirname(dest), ".hf-cache")
+        try:
+            downloaded = hf_hub_download(
+                repo_id=HF_REPO,
+                filename=filename,
+                repo_type="dataset",
+                cache_dir=cache,
+            )
+        except Exception as e:
+            if "hf_transfer" not in str(e):
+                raise
+            print(f"⚠  hf_transfer failed ({e}); falling back to range requests...")
+        else:
+            # The snapshot entry is a symlink into the cache's blob store. move()
+            # renames when it can and otherwise copies in-kernel (sendfile) --
+            # e.g. when the cache dir is itself a mount point.
+            blob = os.path.realpath(downloaded)
+            actual = _sha256_file(blob)
+            if expected and actual != expected:
+                shutil.rmtree(cache, ignore_errors=True)
+                raise OSError(f"SHA256 mismatch for {filename}: expected {expected}, got {actual}")
+            shutil.move(blob, dest)
+            shutil.rmtree(cache, ignore_errors=True)
+            return
+
+    partial = dest + ".partial"
+    sidecar = dest + ".sha256"
+    recorded = None
+    if os.path.exists(sidecar):
+        with open(sidecar) as f:
+            fields = f.read().split()
+        recorded = fields[0] if fields else None
+    if recorded != (expected or "-"):
+        _discard(partial)  # first attempt, or the remote file changed
+        with open(sidecar, "w") as f:
+            f.write(f"{expected or '-'}  {os.path.basename(dest)}\n")
+
+    url = hf_hub_url(HF_REPO, filename, repo_type="dataset")
+    actual = _range_download(url, partial, build_hf_headers())
+    if expected and actual != expected:
+        _discard(partial)
+        os.remove(sidecar)
+        raise OSError(f"SHA256 mismatch for {filename}: expected {expected}, got {actual}")
+    os.replace(partial, dest)
+    os.remove(sidecar)
+    _discard(partial)  # drops the chunk journal
+
+
 def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--no-hf-transfer",
+        action="store_true",
+        help="disable hf_transfer parallel downloads (e.g. behind an HTTP proxy)",
+    )
+    args = parser.parse_args()
+    _configure_hf_transfer(not args.no_hf_transfer)
+
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     sqlite_path = os.path.join(OUTPUT_DIR, LOCAL_SQLITE)
     nsys_path = os.path.join(OUTPUT_DIR, LOCAL_NSYS)
 
-    # Check if already downloaded
+    # Downloads land under their final name only after verification
     if os.path.exists(sqlite_path):
         size_mb = os.path.getsize(sqlite_path) / 1e6
         print(f"✓ SQLite already exists: {LOCAL_SQLITE} ({size_mb:.1f} MB)")
@@ -40,63 +401,33 @@ def main():
         print(f"  nsys-ai info output/{LOCAL_SQLITE}")
         return
 
-    # Try to import huggingface_hub, install if missing
-    try:
-        from huggingface_hub import hf_hub_download
-    except ImportError:
-        print("Installing huggingface_hub...")
-        subprocess.run(
-            [sys.executable, "-m", "pip", "install", "huggingface_hub"],
-            capture_output=True,
-        )
-        from huggingface_hub import hf_hub_download
-
-    # Try downloading pre-converted .sqlite first
-    print(f"↓ Downloading profile from {HF_REPO}...")
-    try:
-        hf_hub_download(
-            repo_id=HF_REPO,
-            filename=_HF_SQLITE,
-            repo_type="dataset",
-            local_dir=OUTPUT_DIR,
-            local_dir_use_symlinks=False,
-        )
-        # Move from HF subdirectory to simplified local name
-        downloaded = os.path.join(OUTPUT_DIR, _HF_SQLITE)
-        if os.path.exists(downloaded):
-            os.rename(downloaded, sqlite_path)
-            try:
-                os.rmdir(os.path.join(OUTPUT_DIR, "distca-0"))
-            except OSError:
-                pass
+    if importlib.util.find_spec("huggingface_hub") is None:
+        sys.exit("huggingface_hub is required: pip install huggingface_hub hf_transfer")
 
-        size_mb = os.path.getsize(sqlite_path) / 1e6
-        print(f"✅ Downloaded: {LOCAL_SQLITE} ({size_mb:.1f} MB)")
-        print()
-        print("Next steps:")
-        print(f"  nsys-ai info output/{LOCAL_SQLITE}")
-        print(f"  nsys-ai timeline output/{LOCAL_SQLITE} --gpu 4 --trim 39 42")
-        return
-    except Exception as e:
-        print(f"⚠  SQLite not available on HuggingFace: {e}")
-        print("   Falling back to .nsys-rep download...")
+    # Probe both candidates in one request so a missing .sqlite goes straight
+    # to the .nsys-rep instead of failing a download first
+    remote = _remote_sha256s([_HF_SQLITE, _HF_NSYS]) or {}
+    if remote and _HF_SQLITE not in remote:
+        print("ℹ  No pre-converted SQLite on HuggingFace; using the .nsys-rep instead")
+    else:
+        # Try downloading pre-converted .sqlite first
+        print(f"↓ Downloading profile from {HF_REPO}...")
+        try:
+            _download(_HF_SQLITE, sqlite_path, remote.get(_HF_SQLITE))
+            size_mb = os.path.getsize(sqlite_path) / 1e6
+            print(f"✅ Downloaded: {LOCAL_SQLITE} ({size_mb:.1f} MB)")
+            print()
+            print("Next steps:")
+            print(f"  nsys-ai info output/{LOCAL_SQLITE}")
+            print(f"  nsys-ai timeline output/{LOCAL_SQLITE} --gpu 4 --trim 39 42")
+            return
+        except Exception as e:
+            print(f"⚠  SQLite download failed: {e}")
+            print("   Falling back to .nsys-rep download...")
 
     # Fallback: download .nsys-rep
     print(f"↓ Downloading .nsys-rep from {HF_REPO}...")
-    hf_hub_download(
-        repo_id=HF_REPO,
-        filename=_HF_NSYS,
-        repo_type="dataset",
-        local_dir=OUTPUT_DIR,
-        local_dir_use_symlinks=False,
-    )
-    downloaded = os.path.join(OUTPUT_DIR, _HF_NSYS)
-    if os.path.exists(downloaded):
-        os.rename(downloaded, nsys_path)
-        try:
-            os.rmdir(os.path.join(OUTPUT_DIR, "distca-0"))
-        except OSError:
-            pass
+    _download(_HF_NSYS, nsys_path, remote.get(_HF_NSYS))
 
     size_mb = os.path.getsize(nsys_path) / 1e6
     print(f"✅ Downloaded: {LOCAL_NSYS} ({size_mb:.1f} MB)")
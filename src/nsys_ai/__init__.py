@@ -1,13 +1,6 @@
 """nsight — Python library for Nsight Systems profile analysis and visualization."""
 
-from importlib.metadata import PackageNotFoundError, version
-
-try:
-    __version__: str = version("nsys-ai")
-except PackageNotFoundError:  # running from source without install
-    __version__ = "0.0.0+dev"
-
-from . import export, export_flat, overlap, profile, projection, search, summary, tree, web
+import importlib
 
 __all__ = [
     "__version__",
@@ -21,3 +14,32 @@ __all__ = [
     "export_flat",
     "web",
 ]
+
+_LAZY_SUBMODULES = frozenset(__all__) - {"__version__"}
+
+
+def _package_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("nsys-ai")
+    except PackageNotFoundError:  # running from source without install
+        return "0.0.0+dev"
+
+
+def __getattr__(name: str):
+    # PEP 562: import public submodules on first attribute access so that
+    # `import nsys_ai` (and every CLI invocation) stays cheap.  __version__ is
+    # resolved the same way: importlib.metadata alone costs tens of ms.
+    if name == "__version__":
+        globals()[name] = __version__ = _package_version()
+        return __version__
+    if name in _LAZY_SUBMODULES:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _LAZY_SUBMODULES | {"__version__"})
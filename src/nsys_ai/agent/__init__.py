@@ -2,8 +2,9 @@
 nsys_ai.agent — The nsys-ai agent: a CUDA ML systems performance expert.
 
 This package provides:
-    persona.py  — Agent identity, system prompt, knowledge layers
-    loop.py     — Core analysis loop: profile → skill selection → execution → report
+    persona.py     — Agent identity, system prompt, knowledge layers
+    loop.py        — Core analysis loop: profile → skill selection → execution → report
+    skill_cache.py — On-disk cache of skill results across runs
 """
 
 from .loop import Agent
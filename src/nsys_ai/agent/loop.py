@@ -8,22 +8,134 @@ extra installed, can delegate to an LLM for natural language analysis.
 """
 
 import logging
+import os
 import sqlite3
+import sys
+import tempfile
+import threading
+import urllib.parse
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 
 from ..exceptions import NsysAiError
-from ..profile import Profile
+from ..indexing import _quote_identifier
+from ..profile import Profile, _connect_sqlite, _read_transaction, _readonly_uri
+from ..skills.base import ensure_indexes
 from ..skills.registry import get_skill, run_skill
+from . import skill_cache
 
 log = logging.getLogger(__name__)
 
 
+class _AnalyzeSession:
+    """Trim-window copy of the kernel table shared by :meth:`Agent.analyze` workers.
+
+    Most core skills re-read the kernel table for the same trim window.  On
+    first use, the kernels overlapping the window are copied once (with the
+    profile's kernel indexes) into a scratch SQLite file; each worker
+    connection attaches it and shadows the profile's kernel table with a TEMP
+    view of the copy, so skills read the small, contiguous copy instead of
+    range-probing the full table.
+
+    Only the skills in :attr:`SKILLS` run under the view: every kernel read
+    they make carries the trim predicate, which the copy is a superset of.
+    Skills that also read kernels outside the window (e.g. iteration_timing,
+    whose iterations may start before it, or Profile-based skills whose
+    discovery scans the whole table) would see a truncated table.
+    """
+
+    SKILLS = frozenset(
+        {
+            "top_kernels",
+            "gpu_idle_gaps",
+            "nccl_anomaly",
+            "kernel_launch_overhead",
+            "kernel_launch_pattern",
+            "stream_concurrency",
+        }
+    )
+
+    _SCHEMA = "_nsysai_window"
+
+    def __init__(self, profile_path: str, kernel_table: str, trim_ns: tuple[int, int]):
+        self._profile_path = profile_path
+        self._kernel_name = kernel_table
+        self._kernel_table = _quote_identifier(kernel_table)
+        self._trim_ns = trim_ns
+        self._lock = threading.Lock()
+        self._built = False
+        self._path: str | None = None
+
+    def _build(self) -> str | None:
+        """Write the scratch file; return its path, or None if it could not be built."""
+        fd, path = tempfile.mkstemp(prefix="nsys-ai-window-", suffix=".sqlite")
+        os.close(fd)
+        table = self._kernel_table
+        try:
+            conn = sqlite3.connect(f"file:{urllib.parse.quote(path)}", uri=True)
+            try:
+                conn.execute("ATTACH DATABASE ? AS src", (_readonly_uri(self._profile_path),))
+                conn.execute(
+                    f"CREATE TABLE {table} AS SELECT * FROM src.{table} "
+                    "WHERE [end] >= ? AND start <= ?",
+                    self._trim_ns,
+                )
+                index_sql = conn.execute(
+                    "SELECT sql FROM src.sqlite_master "
+                    "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                    (self._kernel_name,),
+                ).fetchall()
+                for (sql,) in index_sql:
+                    conn.execute(sql)
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            log.debug("Could not build trim-window kernel copy: %s", e, exc_info=True)
+            os.unlink(path)
+            return None
+        return path
+
+    def attach(self, conn: sqlite3.Connection) -> None:
+        """Point *conn*'s unqualified kernel-table reads at the window copy."""
+        with self._lock:
+            if not self._built:
+                self._built = True
+                self._path = self._build()
+        if self._path is None:
+            return
+        try:
+            conn.execute(f"ATTACH DATABASE ? AS {self._SCHEMA}", (_readonly_uri(self._path),))
+            # TEMP objects count as writes under the "scan" preset's query_only
+            query_only = conn.execute("PRAGMA query_only").fetchone()[0]
+            conn.execute("PRAGMA query_only = 0")
+            try:
+                conn.execute(
+                    f"CREATE TEMP VIEW {self._kernel_table} AS "
+                    f"SELECT * FROM {self._SCHEMA}.{self._kernel_table}"
+                )
+            finally:
+                conn.execute(f"PRAGMA query_only = {int(query_only)}")
+        except sqlite3.Error as e:
+            log.debug("Could not attach trim-window kernel copy: %s", e, exc_info=True)
+
+    def close(self) -> None:
+        """Delete the scratch file, if one was built."""
+        if self._path is not None:
+            try:
+                os.unlink(self._path)
+            except OSError:
+                pass
+            self._path = None
+
+
 class Agent:
     """GPU profile analysis agent.
 
     Usage:
-        agent = Agent("profile.sqlite")
-        report = agent.analyze()         # auto-report
-        answer = agent.ask("why slow?")  # targeted question
+        with Agent("profile.sqlite") as agent:
+            report = agent.analyze()         # auto-report
+            answer = agent.ask("why slow?")  # targeted question
     """
 
     # Keywords → skills mapping for non-LLM skill selection
@@ -109,6 +221,11 @@ class Agent:
         "estimate": ["speedup_estimator"],
         "projection": ["speedup_estimator"],
     }
+    # Flattened, interned form of _KEYWORD_MAP scanned by _select_skills
+    _KEYWORD_ITEMS = tuple(
+        (sys.intern(keyword), tuple(sys.intern(name) for name in skill_names))
+        for keyword, skill_names in _KEYWORD_MAP.items()
+    )
 
     def __init__(self, profile_path: str, trim_ns: tuple[int, int] | None = None):
         self.profile_path = profile_path
@@ -119,30 +236,95 @@ class Agent:
         try:
             self.profile = Profile(profile_path)
         except (NsysAiError, sqlite3.Error, ValueError) as e:
-            import sqlite3 as _sqlite3
-
             log.warning(
                 "Could not open as Nsight profile (skills may be limited): %s",
                 e,
             )
             # Fallback: open as a raw SQLite connection so the agent can still
-            # run generic SQL queries even if schema detection fails.
+            # run generic SQL queries even if schema detection fails.  Nothing
+            # here needs to write, so it is opened read-only.
             self.profile = None  # type: ignore[assignment]
-            self.conn = _sqlite3.connect(profile_path, check_same_thread=False)
-            self.conn.row_factory = _sqlite3.Row
+            self.conn = _connect_sqlite(profile_path, read_only=True)
             return
         self.conn = self.profile.db if self.profile.db is not None else self.profile.conn
 
+    def _open_worker_conn(self):
+        """Open a connection a worker thread can query alongside ``self.conn``.
+
+        DuckDB cursors share the database (and its views) but keep their own
+        temp tables; for SQLite a separate read-only handle on the file is used.
+        """
+        from ..connection import DuckDBAdapter, wrap_connection
+
+        if isinstance(wrap_connection(self.conn), DuckDBAdapter):
+            return self.conn.cursor()
+        return _connect_sqlite(self.profile_path, read_only=True)
+
+    def _analyze_session(self) -> _AnalyzeSession | None:
+        """Return an :class:`_AnalyzeSession` for the trim window, if one applies.
+
+        Only trimmed runs on the SQLite backend benefit; DuckDB reads Parquet.
+        """
+        from ..connection import SQLiteAdapter, wrap_connection
+
+        if not self._trim_kwargs or self.profile is None:
+            return None
+        adapter = wrap_connection(self.conn)
+        if not isinstance(adapter, SQLiteAdapter):
+            return None
+        kernel_table = adapter.resolve_activity_tables().get("kernel")
+        if kernel_table is None:
+            return None
+        trim_ns = (self._trim_kwargs["trim_start_ns"], self._trim_kwargs["trim_end_ns"])
+        return _AnalyzeSession(self.profile_path, kernel_table, trim_ns)
+
+    def _execute_isolated(self, skill, session: _AnalyzeSession | None = None) -> list[dict]:
+        """Execute *skill* on a private connection (see :meth:`_open_worker_conn`)."""
+        conn = self._open_worker_conn()
+        if session is not None:
+            session.attach(conn)
+        try:
+            with _read_transaction(conn):
+                return skill.execute(conn, **self._trim_kwargs)
+        finally:
+            conn.close()
+
+    def _execute_cached(
+        self, skill, isolated: bool = False, session: _AnalyzeSession | None = None
+    ) -> list[dict]:
+        """Execute *skill*, serving repeat runs from :mod:`.skill_cache`."""
+        rows = skill_cache.load(skill_cache.key_for(self.profile_path, skill, self._trim_kwargs))
+        if rows is not None:
+            return rows
+        if isolated:
+            rows = self._execute_isolated(skill, session)
+        else:
+            rows = skill.execute(self.conn, **self._trim_kwargs)
+        # Keyed after running: building indexes on first use bumps the mtime.
+        skill_cache.store(skill_cache.key_for(self.profile_path, skill, self._trim_kwargs), rows)
+        return rows
+
     def close(self):
+        """Close the profile (or fallback connection); later calls are no-ops."""
+        if getattr(self, "_closed", False):
+            return
+        self._closed = True
         if self.profile is not None:
             self.profile.close()
         elif hasattr(self, "conn"):
             self.conn.close()
 
+    def __enter__(self) -> "Agent":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     def analyze(self) -> str:
         """Run a full auto-analysis of the profile.
 
-        Executes the core skills in order:
+        Executes the core skills concurrently, one connection per worker, and
+        reports them in this order:
         1. top_kernels
         2. gpu_idle_gaps
         3. memory_transfers
@@ -161,8 +343,16 @@ class Agent:
         Returns:
             Formatted multi-section report with optional AI synthesis.
         """
-        sections = []
-        sections.append("═══ nsys-ai Auto-Analysis Report ═══\n")
+        return "".join(self.analyze_iter())
+
+    def analyze_iter(self) -> Iterator[str]:
+        """Yield the :meth:`analyze` report section by section.
+
+        Each skill's section is yielded as soon as it and every skill before
+        it have finished, so callers can print the report while the
+        remaining skills are still running.
+        """
+        yield "═══ nsys-ai Auto-Analysis Report ═══\n\n"
 
         # Structured evidence for LLM (JSON-serializable)
         evidence = {}
@@ -185,19 +375,41 @@ class Agent:
             "nvtx_layer_breakdown",
         ]
 
-        for skill_name in core_skills:
-            try:
-                skill = get_skill(skill_name)
-                if skill is None:
-                    continue
-                rows = skill.execute(self.conn, **self._trim_kwargs)
-                evidence[skill_name] = rows
-                text = skill.format_rows(rows)
-                sections.append(text)
-                sections.append("")
-            except Exception as e:
-                log.debug("Skill '%s' failed: %s", skill_name, e, exc_info=True)
-                sections.append(f"({skill_name}: skipped — {e})\n")
+        skills = [skill for skill in map(get_skill, core_skills) if skill is not None]
+        # Workers open read-only SQLite handles, so build the indexes up front.
+        ensure_indexes(self.conn)
+        session = self._analyze_session()
+        try:
+            with ThreadPoolExecutor(max_workers=min(len(skills), os.cpu_count() or 1)) as pool:
+                futures = [
+                    (
+                        skill,
+                        pool.submit(
+                            self._execute_cached,
+                            skill,
+                            True,
+                            session if skill.name in _AnalyzeSession.SKILLS else None,
+                        ),
+                    )
+                    for skill in skills
+                ]
+                try:
+                    for skill, future in futures:
+                        try:
+                            rows = future.result()
+                            evidence[skill.name] = rows
+                            text = skill.format_rows(rows)
+                        except Exception as e:
+                            log.debug("Skill '%s' failed: %s", skill.name, e, exc_info=True)
+                            yield f"({skill.name}: skipped — {e})\n\n"
+                        else:
+                            yield text + "\n\n"
+                finally:
+                    # Closing the generator early should not wait on unstarted skills
+                    pool.shutdown(cancel_futures=True)
+        finally:
+            if session is not None:
+                session.close()
 
         # LLM synthesis with structured JSON evidence
         llm_answer = self._try_llm_synthesis(
@@ -205,11 +417,10 @@ class Agent:
             evidence,
         )
         if llm_answer:
-            sections.append("\n── AI Analysis ──")
-            sections.append(llm_answer)
+            yield "\n── AI Analysis ──\n"
+            yield llm_answer + "\n"
 
-        sections.append("═══ End of Report ═══")
-        return "\n".join(sections)
+        yield "═══ End of Report ═══"
 
     def ask(self, question: str) -> str:
         """Answer a natural language question about the profile.
@@ -237,7 +448,7 @@ class Agent:
         try:
             skill = get_skill(triage_skill)
             if skill:
-                rows = skill.execute(self.conn, **self._trim_kwargs)
+                rows = self._execute_cached(skill)
                 evidence[triage_skill] = rows
                 sections.append("── Phase 1: Triage (Root Cause Matcher) ──")
                 sections.append(skill.format_rows(rows))
@@ -270,7 +481,7 @@ class Agent:
                 skill = get_skill(skill_name)
                 if skill is None:
                     continue
-                rows = skill.execute(self.conn, **self._trim_kwargs)
+                rows = self._execute_cached(skill)
                 evidence[skill_name] = rows
                 text = skill.format_rows(rows)
                 sections.append(text)
@@ -345,7 +556,7 @@ class Agent:
         """Select skills relevant to a question using keyword matching."""
         q_lower = question.lower()
         selected = set()
-        for keyword, skill_names in self._KEYWORD_MAP.items():
+        for keyword, skill_names in self._KEYWORD_ITEMS:
             if keyword in q_lower:
                 selected.update(skill_names)
         return sorted(selected)
@@ -384,6 +595,18 @@ class Agent:
                 log.debug("Failed to load persona prompt", exc_info=True)
                 return "You are an expert GPU profiling assistant."
 
+        # Pick best available model based on API keys.  Without any key there is
+        # nothing to call: return before the slow SDK imports and the JSON dump.
+        model = None
+        if os.environ.get("GEMINI_API_KEY"):
+            model = "gemini/gemini-2.5-flash"
+        elif os.environ.get("OPENAI_API_KEY"):
+            model = "gpt-4o-mini"
+        elif os.environ.get("ANTHROPIC_API_KEY"):
+            model = "claude-sonnet-4-20250514"
+        if model is None:
+            return None
+
         evidence_json = json.dumps(evidence, indent=2, default=str)
         user_msg = (
             f"Profile analysis data (structured JSON):\n"
@@ -395,27 +618,17 @@ class Agent:
         try:
             import litellm
 
-            # Pick best available model based on API keys
-            model = None
-            if os.environ.get("GEMINI_API_KEY"):
-                model = "gemini/gemini-2.5-flash"
-            elif os.environ.get("OPENAI_API_KEY"):
-                model = "gpt-4o-mini"
-            elif os.environ.get("ANTHROPIC_API_KEY"):
-                model = "claude-sonnet-4-20250514"
-
-            if model:
-                system = _build_system_with_trace_context()
+            system = _build_system_with_trace_context()
 
-                resp = litellm.completion(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": system},
-                        {"role": "user", "content": user_msg},
-                    ],
-                    max_tokens=2048,
-                )
-                return resp.choices[0].message.content
+            resp = litellm.completion(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user_msg},
+                ],
+                max_tokens=2048,
+            )
+            return resp.choices[0].message.content
         except ImportError:
             pass
         except Exception as e:
@@ -423,15 +636,14 @@ class Agent:
             return f"(LLM synthesis failed: {e})"
 
         # Fallback: direct Anthropic SDK (legacy path)
+        api_key = os.environ.get("ANTHROPIC_API_KEY")
+        if not api_key:
+            return None
         try:
             import anthropic
         except ImportError:
             return None
 
-        api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
-            return None
-
         try:
             system = _build_system_with_trace_context()
 
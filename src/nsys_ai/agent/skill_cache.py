@@ -0,0 +1,170 @@
+"""
+skill_cache.py — On-disk cache of skill results for the agent.
+
+``analyze`` and ``ask`` re-run the same SQL skills against the same profile
+on every invocation.  Results are stored as JSON under
+``$XDG_CACHE_HOME/nsys-ai/skills`` (default ``~/.cache/nsys-ai/skills``),
+keyed by the profile's path, size and mtime, the package version, a stamp
+of the installed sources, the skill's SQL (or its Python implementation's
+source file) and the trim window, so a rewritten profile or an edited or
+upgraded skill misses the cache automatically.  Entries unused for
+``MAX_AGE_DAYS`` and the least recently used beyond ``MAX_ENTRIES`` are
+pruned once per process.
+
+Environment:
+  ``NSYS_AI_SKILL_CACHE=0`` — disable the cache.
+  ``NSYS_AI_SKILL_CACHE_DIR`` — override the cache directory.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+MAX_ENTRIES = 2000
+MAX_AGE_DAYS = 30
+
+_pruned = False
+
+
+def enabled() -> bool:
+    """Whether skill results should be read from and written to disk."""
+    return os.environ.get("NSYS_AI_SKILL_CACHE", "1").strip() != "0"
+
+
+def cache_dir() -> Path:
+    """Return the directory holding cached skill results."""
+    override = os.environ.get("NSYS_AI_SKILL_CACHE_DIR", "").strip()
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME", "").strip() or Path.home() / ".cache"
+    return Path(base) / "nsys-ai" / "skills"
+
+
+@functools.cache
+def _package_stamp() -> str:
+    """Digest of the sizes and mtimes of this package's sources.
+
+    Editing any module (a Python skill or a helper it calls) changes the
+    stamp even when ``__version__`` does not, e.g. on an editable install.
+    """
+    root = Path(__file__).resolve().parent.parent
+    h = hashlib.blake2b(digest_size=16)
+    for path in sorted(root.rglob("*.py")):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        h.update(f"{path.relative_to(root)}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def _source_stamp(fn) -> str:
+    """Path, size and mtime of the file defining *fn* ("" if unknown)."""
+    try:
+        path = inspect.getsourcefile(fn)
+        st = os.stat(path)
+    except (TypeError, OSError):
+        return ""
+    return f"{path}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def key_for(profile_path: str, skill, trim_kwargs: dict) -> str | None:
+    """Cache key for running *skill* on *profile_path*, or None if uncacheable."""
+    if not enabled():
+        return None
+    try:
+        st = os.stat(profile_path)
+    except OSError:
+        return None
+    from .. import __version__
+
+    parts = [
+        os.path.abspath(profile_path),
+        str(st.st_size),
+        str(st.st_mtime_ns),
+        __version__,
+        _package_stamp(),
+        skill.name,
+        hashlib.sha256(skill.sql.encode()).hexdigest(),
+        _source_stamp(skill.execute_fn) if skill.execute_fn is not None else "",
+        json.dumps(trim_kwargs, sort_keys=True),
+    ]
+    return hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+
+
+def load(key: str | None) -> list[dict] | None:
+    """Return the rows cached under *key*, or None on a miss."""
+    if key is None:
+        return None
+    path = cache_dir() / f"{key}.json"
+    try:
+        rows = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    try:
+        os.utime(path)  # recently used entries survive pruning
+    except OSError:
+        pass
+    return rows
+
+
+def prune(max_entries: int = MAX_ENTRIES, max_age_days: float = MAX_AGE_DAYS) -> int:
+    """Delete stale and least recently used entries; return how many were removed."""
+    try:
+        with os.scandir(cache_dir()) as it:
+            entries = [(e.stat().st_mtime, e.path) for e in it if e.name.endswith(".json")]
+    except OSError:
+        return 0
+    entries.sort(reverse=True)
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for i, (mtime, path) in enumerate(entries):
+        if i >= max_entries or mtime < cutoff:
+            try:
+                os.unlink(path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def store(key: str | None, rows: list[dict]) -> None:
+    """Cache *rows* under *key*, atomically; failures are only logged.
+
+    Rows that do not survive a JSON round trip unchanged (tuples, non-string
+    dict keys, ...) are not cached, so a hit always equals a fresh run.
+    """
+    if key is None:
+        return
+    try:
+        text = json.dumps(rows)
+        if json.loads(text) != rows:
+            return
+    except (TypeError, ValueError):
+        return
+    directory = cache_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, directory / f"{key}.json")
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError as e:
+        log.debug("Could not cache skill result %s: %s", key, e)
+        return
+    global _pruned
+    if not _pruned:
+        _pruned = True
+        prune()
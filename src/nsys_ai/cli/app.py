@@ -81,41 +81,33 @@ def show_help():
 # Entry point
 # ---------------------------------------------------------------------------
 
+# Read-only commands dominated by full-table scans; they open profiles with the
+# "scan" SQLite preset (mmap on, query_only) unless the user chose one.
+_SCAN_HEAVY_COMMANDS = frozenset(
+    {"analyze", "summary", "overlap", "nccl", "iters", "tree", "markdown", "search", "export-csv"}
+)
+
 
 def main():
-    from .parsers import _build_legacy_parser, _build_parser
-
-    legacy_commands = {
-        "analyze",
-        "summary",
-        "overlap",
-        "nccl",
-        "iters",
-        "tree",
-        "markdown",
-        "search",
-        "export-csv",
-        "export-json",
-        "viewer",
-        "timeline-html",
-        "perfetto",
-        "tui",
-        "timeline",
-        "agent",
-    }
-    use_legacy_skill_mgmt = (
-        len(sys.argv) > 2 and sys.argv[1] == "skill" and sys.argv[2] in {"add", "remove", "save"}
-    )
-    if len(sys.argv) > 1 and (sys.argv[1] in legacy_commands or use_legacy_skill_mgmt):
-        parser = _build_legacy_parser()
-    else:
-        parser = _build_parser()
-    args = parser.parse_args()
+    import os
+
+    from .parsers import _parser_builder_for, _split_global_options
+
+    global_opts, argv = _split_global_options(sys.argv[1:])
+    if global_opts.mmap_bytes is not None:
+        os.environ["NSYS_AI_SQLITE_MMAP_BYTES"] = str(global_opts.mmap_bytes)
+
+    command = argv[0] if argv else None
+    parser = _parser_builder_for(argv)(command)
+    args = parser.parse_args(argv)
+    trim = getattr(args, "trim", None)
+    if trim and trim[0] >= trim[1]:
+        parser.error(f"--trim START ({trim[0]}s) must be less than END ({trim[1]}s)")
 
     if not args.command:
         # Zero-arg / unknown: if first arg looks like a profile path, open timeline-web;
         # otherwise show help (intentional: no interactive launcher; see PR/docs for rationale).
-        remaining = sys.argv[1:]
+        remaining = argv
         if remaining and not remaining[0].startswith("-"):
             candidate = remaining[0]
             if (
@@ -134,18 +126,22 @@ def main():
         show_help()
         return
 
-    if args.command == "help":
+    handler = getattr(args, "handler", None)
+    if handler is None:
+        # ``help`` is the only subcommand registered without a handler
         show_help()
         return
 
+    if args.command in _SCAN_HEAVY_COMMANDS:
+        os.environ.setdefault("NSYS_AI_SQLITE_PRESET", "scan")
+
     from nsys_ai import profile as _profile
     from nsys_ai.exceptions import NsysAiError
 
     try:
-        args.handler(args, _profile)
+        handler(args, _profile)
     except NsysAiError as e:
         import json as _json
-        import os
 
         if os.environ.get("NSYS_AI_AGENT") == "1":
             # Machine-readable output for external AI agents
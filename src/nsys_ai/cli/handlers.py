@@ -12,6 +12,9 @@ import os
 # subprocess is used for explicit argv-based CLI invocation.
 import subprocess  # nosec B404
 import sys
+from typing import NamedTuple
+
+from nsys_ai.formatting import seconds_to_ns as _seconds_to_ns
 
 # ---------------------------------------------------------------------------
 # cutracer subcommand
@@ -121,8 +124,9 @@ def _cutracer_run(args, _profile):
     launch_cmd = getattr(args, "launch_cmd", "") or ""
     top_n = getattr(args, "top_n", 5)
     device = getattr(args, "device", 0) or 0
-    # build_plan expects (start_s, end_s) and performs ns conversion itself.
-    trim = tuple(args.trim) if getattr(args, "trim", None) else None
+    # build_plan expects (start_s, end_s) and performs ns conversion itself;
+    # _parse_trim rejects an empty or inverted window first.
+    trim = tuple(args.trim) if _parse_trim(args) else None
     dry_run = getattr(args, "dry_run", False)
     backend = getattr(args, "backend", "local")
     modal_save = getattr(args, "modal_save", None)
@@ -253,8 +257,9 @@ def _cutracer_plan(args, _profile):
     from nsys_ai.cutracer.planner import build_plan, format_plan_script, format_plan_summary
 
     profile_path = args.profile
-    # build_plan expects (start_s, end_s) and performs ns conversion itself.
-    trim = tuple(args.trim) if getattr(args, "trim", None) else None
+    # build_plan expects (start_s, end_s) and performs ns conversion itself;
+    # _parse_trim rejects an empty or inverted window first.
+    trim = tuple(args.trim) if _parse_trim(args) else None
     top_n = getattr(args, "top_n", 5)
     device = getattr(args, "device", 0) or 0
     output_dir = getattr(args, "output_dir", "./cutracer_out") or "./cutracer_out"
@@ -299,11 +304,34 @@ def _add_gpu_trim(p, gpu_required=True, trim_required=True):
     )
 
 
+class Trim(NamedTuple):
+    """A validated ``--trim`` window in nanoseconds."""
+
+    start_ns: int
+    end_ns: int
+
+
 def _parse_trim(args):
-    """Convert --trim seconds to a nanoseconds tuple, or None."""
+    """Convert --trim seconds to a :class:`Trim`, or None.
+
+    Exits with an error when the window is empty or inverted, which would
+    otherwise silently select nothing; ``main()`` already reports that as a
+    usage error, so this guards direct callers.  The result is cached on *args*.
+    """
+    if "_parsed_trim" in vars(args):
+        return args._parsed_trim
+    trim = None
     if getattr(args, "trim", None):
-        return (int(args.trim[0] * 1e9), int(args.trim[1] * 1e9))
-    return None
+        start_s, end_s = args.trim
+        if start_s >= end_s:
+            print(
+                f"Error: --trim START ({start_s}s) must be less than END ({end_s}s)",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        trim = Trim(_seconds_to_ns(start_s), _seconds_to_ns(end_s))
+    args._parsed_trim = trim
+    return trim
 
 
 def _coerce_param_value(raw_value, param_type):
@@ -604,13 +632,11 @@ def _cmd_diff_web(args, _profile):
 
 
 def _cmd_summary(args, _profile):
-    from nsys_ai.summary import auto_commentary, format_text, gpu_summary
+    from nsys_ai.summary import auto_commentary, format_text, gpu_summary_batch
 
     with _profile.open(args.profile) as prof:
-        trim = _parse_trim(args)
         gpus = [args.gpu] if args.gpu is not None else prof.meta.devices
-        for gpu in gpus:
-            s = gpu_summary(prof, gpu, trim)
+        for s in gpu_summary_batch(prof, gpus, _parse_trim(args)).values():
             print(format_text(s))
             print()
             print(auto_commentary(s))
@@ -754,7 +780,7 @@ def _cmd_open(args, _profile):
             args.gpu if args.gpu is not None else (prof.meta.devices[0] if prof.meta.devices else 0)
         )
         if args.trim:
-            trim_ns = (int(args.trim[0] * 1e9), int(args.trim[1] * 1e9))
+            trim_ns = _parse_trim(args)
         else:
             trim_ns = (int(prof.meta.time_range[0]), int(prof.meta.time_range[1]))
         port = args.port if args.port is not None else (8143 if args.viewer == "perfetto" else 8142)
@@ -843,9 +869,7 @@ def _cmd_evidence(args, _profile):
         return
 
     with _profile.open(args.profile) as prof:
-        trim = None
-        if getattr(args, "trim", None):
-            trim = (int(args.trim[0] * 1e9), int(args.trim[1] * 1e9))
+        trim = _parse_trim(args)
 
         device = getattr(args, "gpu", 0) or 0
         builder = EvidenceBuilder(prof, device=device, trim=trim)
@@ -995,6 +1019,7 @@ def _cmd_skill(args, _profile):
         import duckdb
 
         from nsys_ai.parquet_cache import open_cached_db
+        from nsys_ai.profile import _connect_sqlite
 
         fmt = getattr(args, "format", "text")
         no_cache = getattr(args, "no_cache", False)
@@ -1012,14 +1037,15 @@ def _cmd_skill(args, _profile):
             logging.getLogger("nsys_ai").warning(
                 "DuckDB cache unavailable (%s), falling back to raw SQLite", exc
             )
-            conn = sqlite3.connect(args.profile)
+            # Read-write on purpose: skills persist their performance indexes
+            conn = _connect_sqlite(args.profile)
 
         # Build trim kwargs if --trim was provided
         trim_kwargs = {}
         trim = getattr(args, "trim", None)
         if trim:
-            trim_kwargs["trim_start_ns"] = int(trim[0] * 1e9)
-            trim_kwargs["trim_end_ns"] = int(trim[1] * 1e9)
+            trim_kwargs["trim_start_ns"] = _seconds_to_ns(trim[0])
+            trim_kwargs["trim_end_ns"] = _seconds_to_ns(trim[1])
 
         # Resolve --iteration N to trim range (conflicts with --trim)
         iteration_n = getattr(args, "iteration", None)
@@ -1261,13 +1287,11 @@ def _cmd_agent(args, _profile):
     from nsys_ai.agent.loop import Agent
 
     if args.agent_action == "analyze":
-        trim_ns = None
-        trim = getattr(args, "trim", None)
-        if trim:
-            trim_ns = (int(trim[0] * 1e9), int(trim[1] * 1e9))
-        agent = Agent(args.profile, trim_ns=trim_ns)
-        try:
-            print(agent.analyze())
+        with Agent(args.profile, trim_ns=_parse_trim(args)) as agent:
+            for chunk in agent.analyze_iter():
+                sys.stdout.write(chunk)
+                sys.stdout.flush()
+            print()
             # Optionally produce evidence findings JSON
             if getattr(args, "evidence", False):
                 from nsys_ai.annotation import save_findings
@@ -1280,14 +1304,9 @@ def _cmd_agent(args, _profile):
                     out = getattr(args, "output", None) or "findings.json"
                     save_findings(report, out)
                     print(f"Evidence: {len(report.findings)} finding(s) → {out}")
-        finally:
-            agent.close()
     elif args.agent_action == "ask":
-        agent = Agent(args.profile)
-        try:
+        with Agent(args.profile) as agent:
             print(agent.ask(args.question))
-        finally:
-            agent.close()
     else:
         print("Usage: nsys-ai agent {analyze,ask} ...")
         sys.exit(1)
@@ -1297,11 +1316,8 @@ def _cmd_ask(args, _profile):
     """Simplified alias for `agent ask`."""
     from nsys_ai.agent.loop import Agent
 
-    agent = Agent(args.profile)
-    try:
+    with Agent(args.profile) as agent:
         print(agent.ask(args.question))
-    finally:
-        agent.close()
 
 
 def _cmd_agent_guide(args, _profile):
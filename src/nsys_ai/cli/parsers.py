@@ -7,8 +7,7 @@ Extracted from app.py to reduce file size and improve maintainability.
 from __future__ import annotations
 
 import argparse
-
-from nsys_ai.cutracer.installer import NVBIT_VERSION
+import functools
 
 from .handlers import (
     _add_gpu_trim,
@@ -50,6 +49,40 @@ from .handlers import (
 # ---------------------------------------------------------------------------
 
 
+def _add_global_options(parser):
+    """Add process-wide options accepted anywhere on the command line."""
+    parser.add_argument(
+        "--mmap-bytes",
+        type=int,
+        default=None,
+        metavar="N",
+        help=(
+            "SQLite mmap_size for profile reads, overriding the preset (default: 0 — "
+            "keeps RSS bounded on multi-GB profiles; 256 MiB for scan-heavy commands "
+            "such as analyze and summary)"
+        ),
+    )
+
+
+@functools.cache
+def _gpu_trim_parent(gpu_required=True, trim_required=True):
+    """Parent parser carrying the shared ``profile``/``--gpu``/``--trim`` arguments.
+
+    Cached per requirement combination, so subcommands share one set of
+    actions through ``parents=[...]`` instead of each building its own.
+    """
+    parent = argparse.ArgumentParser(add_help=False)
+    _add_gpu_trim(parent, gpu_required=gpu_required, trim_required=trim_required)
+    return parent
+
+
+def _split_global_options(argv):
+    """Parse global options out of *argv*; return ``(options, remaining_argv)``."""
+    pre = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    _add_global_options(pre)
+    return pre.parse_known_args(argv)
+
+
 def _register_info_parser(sub):
     """Register the ``info`` subcommand on *sub*."""
     p = sub.add_parser("info", help="Show profile metadata and GPU info")
@@ -212,25 +245,180 @@ def _register_root_cause_parser(sub):
     return p
 
 
+_NO_BROWSER_ARG = (("--no-browser",), {"action": "store_true", "help": "Don't auto-open browser"})
+_MIN_MS_ARG = (("--min-ms",), {"type": float, "default": 0, "help": "Min duration to show (ms)"})
+
+# Subcommands made of the shared profile/--gpu/--trim arguments plus a few flat
+# options, as (name, help, handler, (gpu_required, trim_required), extra args)
+# where each extra argument is an ``add_argument`` (flags, kwargs) pair.
+_GPU_TRIM_COMMANDS = (
+    (
+        "web",
+        "Serve interactive web viewer",
+        _cmd_web,
+        (True, True),
+        (
+            (("--port",), {"type": int, "default": 8142, "help": "HTTP port (default: 8142)"}),
+            _NO_BROWSER_ARG,
+        ),
+    ),
+    (
+        "timeline-web",
+        "Serve timeline-focused web UI",
+        _cmd_timeline_web,
+        (False, False),
+        (
+            (("--port",), {"type": int, "default": 8144, "help": "HTTP port (default: 8144)"}),
+            _NO_BROWSER_ARG,
+            (
+                ("--findings",),
+                {"default": None, "help": "Path to findings.json for evidence overlay"},
+            ),
+            (
+                ("--auto-analyze",),
+                {"action": "store_true", "help": "Run AI analysis on startup and show findings"},
+            ),
+        ),
+    ),
+    (
+        "report",
+        "Generate performance report",
+        _cmd_report,
+        (True, True),
+        ((("-o", "--output"), {"default": None, "help": "Write markdown report to file"}),),
+    ),
+    (
+        "export",
+        "Export Perfetto JSON traces",
+        _cmd_export,
+        (False, True),
+        ((("-o", "--output"), {"default": ".", "help": "Output directory"}),),
+    ),
+    (
+        "analyze",
+        "Full auto-report: bottlenecks, overlap, iters, NVTX hierarchy",
+        _cmd_analyze,
+        (True, True),
+        ((("-o", "--output"), {"default": None, "help": "Write markdown report to file"}),),
+    ),
+    ("summary", "GPU kernel summary with top kernels", _cmd_summary, (False, False), ()),
+    ("overlap", "Compute/NCCL overlap analysis", _cmd_overlap, (True, True), ()),
+    ("nccl", "NCCL collective breakdown", _cmd_nccl, (True, True), ()),
+    ("iters", "Detect training iterations", _cmd_iters, (False, False), ()),
+    ("tree", "NVTX hierarchy as text", _cmd_tree, (True, True), ()),
+    ("markdown", "NVTX hierarchy as markdown", _cmd_markdown, (True, True), ()),
+    (
+        "export-csv",
+        "Export kernel data as flat CSV",
+        _cmd_export_csv,
+        (True, True),
+        ((("-o", "--output"), {"default": None, "help": "Output file (default: stdout)"}),),
+    ),
+    (
+        "export-json",
+        "Export kernel data as flat JSON",
+        _cmd_export_json,
+        (True, True),
+        (
+            (("-o", "--output"), {"default": None, "help": "Output file (default: stdout)"}),
+            (
+                ("--summary",),
+                {"action": "store_true", "help": "Export summary instead of flat list"},
+            ),
+        ),
+    ),
+    (
+        "viewer",
+        "Generate interactive HTML viewer",
+        _cmd_viewer,
+        (True, True),
+        ((("-o", "--output"), {"default": "nvtx_tree.html", "help": "Output HTML file"}),),
+    ),
+    (
+        "timeline-html",
+        "Generate horizontal timeline HTML",
+        _cmd_timeline_html,
+        (True, True),
+        ((("-o", "--output"), {"default": "timeline.html", "help": "Output HTML file"}),),
+    ),
+    (
+        "perfetto",
+        "Open trace in Perfetto UI",
+        _cmd_perfetto,
+        (True, True),
+        (
+            (
+                ("--port",),
+                {"type": int, "default": 8143, "help": "HTTP port for trace (default: 8143)"},
+            ),
+            _NO_BROWSER_ARG,
+        ),
+    ),
+    (
+        "tui",
+        "Terminal tree view; press A for AI chat",
+        _cmd_tui,
+        (True, True),
+        (
+            (("--depth",), {"type": int, "default": -1, "help": "Max tree depth (-1=all)"}),
+            _MIN_MS_ARG,
+        ),
+    ),
+    (
+        "timeline",
+        "Horizontal timeline; press A for AI chat",
+        _cmd_timeline,
+        (False, True),
+        (_MIN_MS_ARG,),
+    ),
+)
+
+
+def _register_gpu_trim_command(sub, spec):
+    """Register the :data:`_GPU_TRIM_COMMANDS` entry *spec* on *sub*."""
+    name, help_, handler, (gpu_required, trim_required), extras = spec
+    p = sub.add_parser(
+        name,
+        parents=[_gpu_trim_parent(gpu_required=gpu_required, trim_required=trim_required)],
+        help=help_,
+    )
+    for flags, kwargs in extras:
+        p.add_argument(*flags, **kwargs)
+    p.set_defaults(handler=handler)
+    return p
+
+
+# Command name -> registration function for every _GPU_TRIM_COMMANDS entry
+_GPU_TRIM_REGISTRATIONS = {
+    spec[0]: functools.partial(_register_gpu_trim_command, spec=spec) for spec in _GPU_TRIM_COMMANDS
+}
+
+
+def _register_help_parser(sub):
+    """Register the ``help`` subcommand on *sub*."""
+    return sub.add_parser("help", help="Show getting-started guide and available commands")
+
+
+def _select_registrations(registry, command):
+    """Return the registration functions needed to parse *command*.
+
+    A known *command* only needs its own subparser, which keeps ordinary
+    invocations from paying for every other subcommand's construction.
+    Anything else (``--help``, a typo, no command) gets the full set so
+    argparse can list or suggest all choices.
+    """
+    if command in registry:
+        return (registry[command],)
+    return tuple(registry.values())
+
+
 # ---------------------------------------------------------------------------
 # Main parser — public CLI surface visible to ``nsys-ai --help``
 # ---------------------------------------------------------------------------
 
 
-def _build_parser():
-    parser = argparse.ArgumentParser(
-        prog="nsys-ai",
-        description="Web-first Nsight Systems analysis CLI (with AI backend tools)",
-    )
-    sub = parser.add_subparsers(
-        dest="command",
-        metavar=(
-            "{open,web,timeline-web,chat,ask,agent-guide,"
-            "info,skill,evidence,report,diff,diff-web,export,help}"
-        ),
-    )
-
-    # Public commands (simplified)
+def _register_open_parser(sub):
+    """Register the ``open`` subcommand on *sub*."""
     p = sub.add_parser("open", help="Open profile quickly in Perfetto/web/TUI")
     p.add_argument("profile", help="Path to profile (.sqlite or .nsys-rep)")
     p.add_argument(
@@ -257,40 +445,35 @@ def _build_parser():
         "--no-browser", action="store_true", help="Don't auto-open browser (perfetto/web)"
     )
     p.set_defaults(handler=_cmd_open)
+    return p
 
-    p = sub.add_parser("web", help="Serve interactive web viewer")
-    _add_gpu_trim(p)
-    p.add_argument("--port", type=int, default=8142, help="HTTP port (default: 8142)")
-    p.add_argument("--no-browser", action="store_true", help="Don't auto-open browser")
-    p.set_defaults(handler=_cmd_web)
-
-    p = sub.add_parser("timeline-web", help="Serve timeline-focused web UI")
-    _add_gpu_trim(p, gpu_required=False, trim_required=False)
-    p.add_argument("--port", type=int, default=8144, help="HTTP port (default: 8144)")
-    p.add_argument("--no-browser", action="store_true", help="Don't auto-open browser")
-    p.add_argument("--findings", default=None, help="Path to findings.json for evidence overlay")
-    p.add_argument(
-        "--auto-analyze", action="store_true", help="Run AI analysis on startup and show findings"
-    )
-    p.set_defaults(handler=_cmd_timeline_web)
 
+def _register_chat_parser(sub):
+    """Register the ``chat`` subcommand on *sub*."""
     p = sub.add_parser("chat", help="AI chat TUI")
     p.add_argument("profile", help="Path to profile (.sqlite or .nsys-rep)")
     p.set_defaults(handler=_cmd_chat)
+    return p
+
 
+def _register_ask_parser(sub):
+    """Register the ``ask`` subcommand on *sub*."""
     p = sub.add_parser("ask", help="Ask AI a backend analysis question")
     p.add_argument("profile", help="Path to .sqlite file")
     p.add_argument("question", help="Natural language question")
     p.set_defaults(handler=_cmd_ask)
+    return p
+
 
+def _register_agent_guide_parser(sub):
+    """Register the ``agent-guide`` subcommand on *sub*."""
     p = sub.add_parser("agent-guide", help="Print machine-readable guide for AI agents")
     p.set_defaults(handler=_cmd_agent_guide)
+    return p
 
-    p = sub.add_parser("report", help="Generate performance report")
-    _add_gpu_trim(p)
-    p.add_argument("-o", "--output", default=None, help="Write markdown report to file")
-    p.set_defaults(handler=_cmd_report)
 
+def _register_diff_parser(sub):
+    """Register the ``diff`` subcommand on *sub*."""
     p = sub.add_parser("diff", help="Compare two profiles (before/after)")
     p.add_argument("before", help="Path to baseline profile (.sqlite or .nsys-rep)")
     p.add_argument("after", help="Path to candidate profile (.sqlite or .nsys-rep)")
@@ -339,7 +522,11 @@ def _build_parser():
         help="Start interactive AI chat for diff analysis (Phase C tools)",
     )
     p.set_defaults(handler=_cmd_diff)
+    return p
+
 
+def _register_diff_web_parser(sub):
+    """Register the ``diff-web`` subcommand on *sub*."""
     p = sub.add_parser("diff-web", help="Serve web diff viewer for two profiles")
     p.add_argument("before", help="Path to baseline profile (.sqlite or .nsys-rep)")
     p.add_argument("after", help="Path to candidate profile (.sqlite or .nsys-rep)")
@@ -355,13 +542,14 @@ def _build_parser():
     p.add_argument("--port", type=int, default=8145, help="HTTP port (default: 8145)")
     p.add_argument("--no-browser", action="store_true", help="Don't auto-open browser")
     p.set_defaults(handler=_cmd_diff_web)
+    return p
 
-    p = sub.add_parser("export", help="Export Perfetto JSON traces")
-    _add_gpu_trim(p, gpu_required=False)
-    p.add_argument("-o", "--output", default=".", help="Output directory")
-    p.set_defaults(handler=_cmd_export)
 
-    # CUTracer drill-down
+def _register_cutracer_parser(sub):
+    """Register the ``cutracer`` subcommand on *sub*."""
+    # Imported here: the installer pulls in urllib, which other commands never need
+    from nsys_ai.cutracer.installer import NVBIT_VERSION
+
     p = sub.add_parser("cutracer", help="CUTracer instruction-level drill-down")
     ct_sub = p.add_subparsers(dest="cutracer_action", required=True)
 
@@ -564,60 +752,63 @@ def _build_parser():
     )
 
     p.set_defaults(handler=_cmd_cutracer)
+    return p
 
-    # Agent-facing commands (promoted from legacy so --help exposes them)
-    _register_info_parser(sub)
-    _register_skill_parser(sub, include_management=False)
-    _register_evidence_parser(sub)
-    _register_root_cause_parser(sub)
-
-    sub.add_parser("help", help="Show getting-started guide and available commands")
 
+# Command name -> registration function, in ``--help`` order.  The trailing
+# agent-facing commands were promoted from legacy so --help exposes them.
+_MAIN_COMMANDS = {
+    "open": _register_open_parser,
+    "web": _GPU_TRIM_REGISTRATIONS["web"],
+    "timeline-web": _GPU_TRIM_REGISTRATIONS["timeline-web"],
+    "chat": _register_chat_parser,
+    "ask": _register_ask_parser,
+    "agent-guide": _register_agent_guide_parser,
+    "report": _GPU_TRIM_REGISTRATIONS["report"],
+    "diff": _register_diff_parser,
+    "diff-web": _register_diff_web_parser,
+    "export": _GPU_TRIM_REGISTRATIONS["export"],
+    "cutracer": _register_cutracer_parser,
+    "info": _register_info_parser,
+    "skill": _register_skill_parser,
+    "evidence": _register_evidence_parser,
+    "root-cause": _register_root_cause_parser,
+    "help": _register_help_parser,
+}
+
+
+def _build_parser(command=None):
+    """Build the public parser; see :func:`_select_registrations` for *command*."""
+    parser = argparse.ArgumentParser(
+        prog="nsys-ai",
+        description="Web-first Nsight Systems analysis CLI (with AI backend tools)",
+    )
+    _add_global_options(parser)
+    sub = parser.add_subparsers(
+        dest="command",
+        metavar=(
+            "{open,web,timeline-web,chat,ask,agent-guide,"
+            "info,skill,evidence,report,diff,diff-web,export,help}"
+        ),
+    )
+    for register in _select_registrations(_MAIN_COMMANDS, command):
+        register(sub)
     return parser
 
 
-def _register_legacy_commands(sub):
-    """Register legacy commands on the provided subparser collection."""
-    _register_info_parser(sub)
+# ---------------------------------------------------------------------------
+# Legacy parser — full command surface, hidden from ``nsys-ai --help``
+# ---------------------------------------------------------------------------
+
 
+def _register_search_parser(sub):
+    """Register the ``search`` subcommand on *sub*."""
     p = sub.add_parser(
-        "analyze", help="Full auto-report: bottlenecks, overlap, iters, NVTX hierarchy"
+        "search",
+        parents=[_gpu_trim_parent(gpu_required=False, trim_required=False)],
+        help="Search kernels/NVTX by name",
     )
-    _add_gpu_trim(p)
-    p.add_argument("-o", "--output", default=None, help="Write markdown report to file")
-    p.set_defaults(handler=_cmd_analyze)
-
-    p = sub.add_parser("summary", help="GPU kernel summary with top kernels")
-    _add_gpu_trim(p, gpu_required=False, trim_required=False)
-    p.set_defaults(handler=_cmd_summary)
-
-    p = sub.add_parser("overlap", help="Compute/NCCL overlap analysis")
-    _add_gpu_trim(p)
-    p.set_defaults(handler=_cmd_overlap)
-
-    p = sub.add_parser("nccl", help="NCCL collective breakdown")
-    _add_gpu_trim(p)
-    p.set_defaults(handler=_cmd_nccl)
-
-    p = sub.add_parser("iters", help="Detect training iterations")
-    _add_gpu_trim(p, gpu_required=False, trim_required=False)
-    p.set_defaults(handler=_cmd_iters)
-
-    p = sub.add_parser("tree", help="NVTX hierarchy as text")
-    _add_gpu_trim(p)
-    p.set_defaults(handler=_cmd_tree)
-
-    p = sub.add_parser("markdown", help="NVTX hierarchy as markdown")
-    _add_gpu_trim(p)
-    p.set_defaults(handler=_cmd_markdown)
-
-    p = sub.add_parser("search", help="Search kernels/NVTX by name")
-    p.add_argument("profile", help="Path to profile (.sqlite or .nsys-rep)")
     p.add_argument("--query", "-q", required=True, help="Search query (substring)")
-    p.add_argument("--gpu", type=int, default=None, help="GPU device ID")
-    p.add_argument(
-        "--trim", nargs=2, type=float, metavar=("START_S", "END_S"), help="Time window in seconds"
-    )
     p.add_argument("--parent", default=None, help="NVTX parent pattern for hierarchical search")
     p.add_argument(
         "--type",
@@ -627,47 +818,11 @@ def _register_legacy_commands(sub):
     )
     p.add_argument("--limit", type=int, default=200, help="Max results")
     p.set_defaults(handler=_cmd_search)
+    return p
 
-    p = sub.add_parser("export-csv", help="Export kernel data as flat CSV")
-    _add_gpu_trim(p)
-    p.add_argument("-o", "--output", default=None, help="Output file (default: stdout)")
-    p.set_defaults(handler=_cmd_export_csv)
-
-    p = sub.add_parser("export-json", help="Export kernel data as flat JSON")
-    _add_gpu_trim(p)
-    p.add_argument("-o", "--output", default=None, help="Output file (default: stdout)")
-    p.add_argument("--summary", action="store_true", help="Export summary instead of flat list")
-    p.set_defaults(handler=_cmd_export_json)
-
-    p = sub.add_parser("viewer", help="Generate interactive HTML viewer")
-    _add_gpu_trim(p)
-    p.add_argument("-o", "--output", default="nvtx_tree.html", help="Output HTML file")
-    p.set_defaults(handler=_cmd_viewer)
-
-    p = sub.add_parser("timeline-html", help="Generate horizontal timeline HTML")
-    _add_gpu_trim(p)
-    p.add_argument("-o", "--output", default="timeline.html", help="Output HTML file")
-    p.set_defaults(handler=_cmd_timeline_html)
-
-    p = sub.add_parser("perfetto", help="Open trace in Perfetto UI")
-    _add_gpu_trim(p)
-    p.add_argument("--port", type=int, default=8143, help="HTTP port for trace (default: 8143)")
-    p.add_argument("--no-browser", action="store_true", help="Don't auto-open browser")
-    p.set_defaults(handler=_cmd_perfetto)
-
-    p = sub.add_parser("tui", help="Terminal tree view; press A for AI chat")
-    _add_gpu_trim(p)
-    p.add_argument("--depth", type=int, default=-1, help="Max tree depth (-1=all)")
-    p.add_argument("--min-ms", type=float, default=0, help="Min duration to show (ms)")
-    p.set_defaults(handler=_cmd_tui)
-
-    p = sub.add_parser("timeline", help="Horizontal timeline; press A for AI chat")
-    _add_gpu_trim(p, gpu_required=False)
-    p.add_argument("--min-ms", type=float, default=0, help="Min duration to show (ms)")
-    p.set_defaults(handler=_cmd_timeline)
-
-    _register_skill_parser(sub, include_management=True)
 
+def _register_agent_parser(sub):
+    """Register the ``agent`` subcommand on *sub*."""
     p = sub.add_parser("agent", help="AI agent for profile analysis")
     agent_sub = p.add_subparsers(dest="agent_action")
     sp_analyze = agent_sub.add_parser("analyze", help="Full auto-analysis report")
@@ -693,19 +848,65 @@ def _register_legacy_commands(sub):
     sp_ask.add_argument("profile", help="Path to .sqlite file")
     sp_ask.add_argument("question", help="Natural language question")
     p.set_defaults(handler=_cmd_agent)
+    return p
 
-    # ── evidence ──────────────────────────────────────────────────
-    _register_evidence_parser(sub)
 
-    sub.add_parser("help", help="Show getting-started guide and available commands")
+_LEGACY_COMMANDS = {
+    "info": _register_info_parser,
+    "analyze": _GPU_TRIM_REGISTRATIONS["analyze"],
+    "summary": _GPU_TRIM_REGISTRATIONS["summary"],
+    "overlap": _GPU_TRIM_REGISTRATIONS["overlap"],
+    "nccl": _GPU_TRIM_REGISTRATIONS["nccl"],
+    "iters": _GPU_TRIM_REGISTRATIONS["iters"],
+    "tree": _GPU_TRIM_REGISTRATIONS["tree"],
+    "markdown": _GPU_TRIM_REGISTRATIONS["markdown"],
+    "search": _register_search_parser,
+    "export-csv": _GPU_TRIM_REGISTRATIONS["export-csv"],
+    "export-json": _GPU_TRIM_REGISTRATIONS["export-json"],
+    "viewer": _GPU_TRIM_REGISTRATIONS["viewer"],
+    "timeline-html": _GPU_TRIM_REGISTRATIONS["timeline-html"],
+    "perfetto": _GPU_TRIM_REGISTRATIONS["perfetto"],
+    "tui": _GPU_TRIM_REGISTRATIONS["tui"],
+    "timeline": _GPU_TRIM_REGISTRATIONS["timeline"],
+    "agent": _register_agent_parser,
+    "skill": functools.partial(_register_skill_parser, include_management=True),
+    "evidence": _register_evidence_parser,
+    "help": _register_help_parser,
+}
+
+
+def _register_legacy_commands(sub, command=None):
+    """Register legacy commands on the provided subparser collection."""
+    for register in _select_registrations(_LEGACY_COMMANDS, command):
+        register(sub)
 
 
-def _build_legacy_parser():
+def _build_legacy_parser(command=None):
     """Build full legacy parser used for explicit legacy command invocations."""
     parser = argparse.ArgumentParser(
         prog="nsys-ai",
         description="Legacy Nsight Systems CLI (full command surface)",
     )
+    _add_global_options(parser)
     sub = parser.add_subparsers(dest="command")
-    _register_legacy_commands(sub)
+    _register_legacy_commands(sub, command)
     return parser
+
+
+# ``skill`` actions that only the legacy parser registers
+_LEGACY_SKILL_ACTIONS = frozenset({"add", "remove", "save"})
+
+
+def _parser_builder_for(argv):
+    """Return the builder (public or legacy) whose parser owns *argv*'s command.
+
+    Commands registered only in :data:`_LEGACY_COMMANDS`, and the ``skill``
+    management actions, are parsed by the legacy parser; everything else —
+    including no command at all — by the public one.
+    """
+    command = argv[0] if argv else None
+    if command in _LEGACY_COMMANDS and command not in _MAIN_COMMANDS:
+        return _build_legacy_parser
+    if command == "skill" and len(argv) > 1 and argv[1] in _LEGACY_SKILL_ACTIONS:
+        return _build_legacy_parser
+    return _build_parser
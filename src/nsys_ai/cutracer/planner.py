@@ -103,8 +103,10 @@ def build_plan(
     candidate_limit = max(top_n * 3, 15)
     kwargs: dict = {"limit": candidate_limit, "device": device}
     if trim:
-        kwargs["trim_start_ns"] = int(trim[0] * 1e9)
-        kwargs["trim_end_ns"] = int(trim[1] * 1e9)
+        from nsys_ai.formatting import seconds_to_ns
+
+        kwargs["trim_start_ns"] = seconds_to_ns(trim[0])
+        kwargs["trim_end_ns"] = seconds_to_ns(trim[1])
 
     try:
         rows = top_kernels_skill.execute_fn(conn, **kwargs)
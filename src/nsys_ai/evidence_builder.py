@@ -56,18 +56,21 @@ class EvidenceBuilder:
         """
         from .skills.registry import get_skill
 
-        findings: list[Finding] = []
-        for analyzer_name, (skill_name, params) in self._SKILL_PIPELINE.items():
-            if only is not None and analyzer_name not in only:
-                continue
-
+        pipeline = [
+            (analyzer_name, skill_name, params)
+            for analyzer_name, (skill_name, params) in self._SKILL_PIPELINE.items()
+            if only is None or analyzer_name in only
+        ]
+
+        def _run(worker: Profile, entry: tuple) -> list[Finding]:
+            analyzer_name, skill_name, params = entry
             try:
                 skill = get_skill(skill_name)
                 if skill is None:
                     _log.debug(
                         "Analyzer %s skipped (skill %s not found)", analyzer_name, skill_name
                     )
-                    continue
+                    return []
 
                 # Map runtime parameters into skill args
                 kwargs = {**params, "device": self.device}
@@ -76,14 +79,19 @@ class EvidenceBuilder:
                     kwargs["trim_end_ns"] = self.trim[1]
 
                 # Use DuckDB if available, fallback to SQLite
-                conn = self.prof.db if self.prof.db is not None else self.prof.conn
+                conn = worker.db if worker.db is not None else worker.conn
                 rows = skill.execute(conn, **kwargs)
-                if skill.to_findings_fn:
-                    findings.extend(skill.to_findings_fn(rows))
+                return skill.to_findings_fn(rows) if skill.to_findings_fn else []
             except Exception as e:
                 _log.error(
                     "Analyzer %s (skill %s) failed: %s", analyzer_name, skill_name, e, exc_info=True
                 )
+                return []
+
+        # Findings keep pipeline order.
+        findings: list[Finding] = [
+            f for found in self.prof.map_workers(_run, pipeline) for f in found
+        ]
 
         return EvidenceReport(
             title="Auto-Analysis",
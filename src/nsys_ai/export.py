@@ -23,7 +23,7 @@ def gpu_trace(prof, gpu: int, trim: tuple[int, int]) -> list[dict]:
     events, streams = [], set()
 
     # Kernels
-    for k in prof.kernels(gpu, trim):
+    for k in prof.kernels_iter(gpu, trim):
         events.append(
             dict(
                 name=k["name"],
@@ -85,18 +85,18 @@ def write_json(events: list[dict], path: str):
 
 def all_gpu_traces(db_path: str, trim: tuple[int, int], out_dir: str):
     """Generate per-GPU JSON traces for all active GPUs."""
-    prof = _profile.open(db_path)
     os.makedirs(out_dir, exist_ok=True)
 
-    for gpu in prof.meta.devices:
-        events = gpu_trace(prof, gpu, trim)
-        if not events:
-            print(f"  GPU {gpu}: no kernels, skipped")
-            continue
-        out = os.path.join(out_dir, f"trace_gpu{gpu}.json")
-        write_json(events, out)
-        nk = sum(1 for e in events if e.get("cat") == "gpu_kernel")
-        nn = sum(1 for e in events if e.get("cat") == "nvtx_projected")
-        print(f"  GPU {gpu}: {nk} kernels, {nn} NVTX → {out} ({os.path.getsize(out) // 1024} KB)")
-
-    prof.close()
+    with _profile.open(db_path) as prof:
+        for gpu in prof.meta.devices:
+            events = gpu_trace(prof, gpu, trim)
+            if not events:
+                print(f"  GPU {gpu}: no kernels, skipped")
+                continue
+            out = os.path.join(out_dir, f"trace_gpu{gpu}.json")
+            write_json(events, out)
+            nk = sum(1 for e in events if e.get("cat") == "gpu_kernel")
+            nn = sum(1 for e in events if e.get("cat") == "nvtx_projected")
+            print(
+                f"  GPU {gpu}: {nk} kernels, {nn} NVTX → {out} ({os.path.getsize(out) // 1024} KB)"
+            )
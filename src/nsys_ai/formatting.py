@@ -3,9 +3,12 @@ formatting.py — Shared time/duration formatting helpers.
 
 These utilities are used by both the tree TUI (tui.py) and the timeline
 TUI (tui_timeline.py). Centralising them here eliminates duplication and
-provides a single place to adjust display precision.
+provides a single place to adjust display precision.  ``seconds_to_ns``
+is the matching parser for user-typed second values such as ``--trim``.
 """
 
+import decimal
+
 
 def fmt_dur(ms: float) -> str:
     """Format a duration given in milliseconds to a human-readable string.
@@ -36,6 +39,16 @@ def fmt_ns(ns: float | None) -> str:
     return f"{ns / 1e9:.3f}s"
 
 
+def seconds_to_ns(seconds: float) -> int:
+    """Convert seconds to integer nanoseconds without binary float rounding.
+
+    Scales the shortest decimal repr of *seconds* — for a ``--trim`` value,
+    exactly what the user typed — so ``8.2`` becomes 8_200_000_000 where
+    ``int(8.2 * 1e9)`` truncates to 8_199_999_999.
+    """
+    return int(decimal.Decimal(repr(seconds)).scaleb(9))
+
+
 def fmt_relative(ns_offset: float) -> str:
     """Format a nanosecond offset as a relative time string (+Xs / +Xms).
 
@@ -9,6 +9,7 @@ All callers should use ``ensure_performance_indexes()`` which is idempotent,
 silent on read-only connections, and tolerant of missing tables.
 """
 
+import contextlib
 import logging
 import sqlite3
 
@@ -16,6 +17,10 @@ _log = logging.getLogger(__name__)
 
 # Track connections that have already been indexed to avoid repeated work.
 _indexed_connections: set[int] = set()
+# Indexed connections stay referenced so a later connection cannot recycle
+# their id() and be mistaken for an indexed one (same trade-off as the
+# SQLite probe bags in connection.py).
+_indexed_refs: list[sqlite3.Connection] = []
 
 
 def _quote_identifier(name: str) -> str:
@@ -29,6 +34,37 @@ def _quote_identifier(name: str) -> str:
     return '"' + name.replace('"', '""') + '"'
 
 
+@contextlib.contextmanager
+def _index_build_session(conn: sqlite3.Connection):
+    """Lift the "scan" preset's ``query_only`` and journal-off pragmas for an index build.
+
+    ``query_only`` would make every ``CREATE INDEX`` fail, and writing the
+    user's profile without a rollback journal risks corrupting it if the
+    build is interrupted.  Both pragmas are restored afterwards.
+    """
+    restore: list[str] = []
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    try:
+        if cursor.execute("PRAGMA query_only").fetchone()[0]:
+            conn.execute("PRAGMA query_only = 0")
+            restore.append("PRAGMA query_only = 1")
+        journal = str(cursor.execute("PRAGMA journal_mode").fetchone()[0]).lower()
+        if journal == "off":
+            conn.execute("PRAGMA journal_mode = DELETE")
+            restore.append("PRAGMA journal_mode = OFF")
+    except sqlite3.Error:
+        _log.debug("ensure_performance_indexes: could not adjust pragmas", exc_info=True)
+    try:
+        yield
+    finally:
+        for stmt in restore:
+            try:
+                conn.execute(stmt)
+            except sqlite3.Error:
+                _log.debug("ensure_performance_indexes: could not run %s", stmt, exc_info=True)
+
+
 def ensure_performance_indexes(conn: sqlite3.Connection) -> None:
     """Create all performance indexes needed by skills, MFU, and evidence analysis.
 
@@ -64,6 +100,12 @@ def ensure_performance_indexes(conn: sqlite3.Connection) -> None:
                 f"CREATE INDEX IF NOT EXISTS _nsysai_kernel_short ON {qt}(shortName)",
                 # Streamwise index for window-function skills (gpu_idle_gaps, kernel_launch_pattern)
                 f"CREATE INDEX IF NOT EXISTS _nsysai_kernel_stream ON {qt}(streamId, start)",
+                # Per-device filters and DISTINCT scans (Profile.kernels/_discover/gpu_threads)
+                f"CREATE INDEX IF NOT EXISTS _nsysai_kernel_dev_start ON {qt}(deviceId, start)",
+                # Covering index for per-stream LAG windows: ordered scan, no table lookups;
+                # its (deviceId, streamId) prefix also serves per-device stream lookups
+                f"CREATE INDEX IF NOT EXISTS _nsysai_kernel_dev_stream_start "
+                f"ON {qt}(deviceId, streamId, start, [end], shortName)",
             ]
         )
 
@@ -104,35 +146,39 @@ def ensure_performance_indexes(conn: sqlite3.Connection) -> None:
         qt = _quote_identifier(memset_table)
         index_stmts.append(f"CREATE INDEX IF NOT EXISTS _nsysai_memset_corr ON {qt}(correlationId)")
 
+    if not index_stmts:
+        return
     any_success = False
-    for stmt in index_stmts:
-        try:
-            conn.execute(stmt)
-            any_success = True
-        except sqlite3.OperationalError as exc:
-            # "no such table" is expected (profile may lack NVTX/NCCL data).
-            # Other OperationalError (locked, readonly) logged for diagnostics.
-            _log.debug(
-                "ensure_performance_indexes: %s — %s",
-                stmt.split("ON")[0].strip(),
-                exc,
-                exc_info=True,
-            )
-        except Exception as exc:
-            _log.debug(
-                "ensure_performance_indexes: %s — %s",
-                stmt.split("ON")[0].strip(),
-                exc,
-                exc_info=True,
-            )
-
-    if any_success:
-        try:
-            conn.commit()
-        except Exception:
-            _log.debug("Failed to create index", exc_info=True)
+    with _index_build_session(conn):
+        for stmt in index_stmts:
+            try:
+                conn.execute(stmt)
+                any_success = True
+            except sqlite3.OperationalError as exc:
+                # "no such table" is expected (profile may lack NVTX/NCCL data).
+                # Other OperationalError (locked, readonly) logged for diagnostics.
+                _log.debug(
+                    "ensure_performance_indexes: %s — %s",
+                    stmt.split("ON")[0].strip(),
+                    exc,
+                    exc_info=True,
+                )
+            except Exception as exc:
+                _log.debug(
+                    "ensure_performance_indexes: %s — %s",
+                    stmt.split("ON")[0].strip(),
+                    exc,
+                    exc_info=True,
+                )
+
+        if any_success:
+            try:
+                conn.commit()
+            except Exception:
+                _log.debug("Failed to create index", exc_info=True)
 
     # Only mark as indexed if at least one index was created.
     # This allows retry on readonly connections that are later reopened as writable.
     if any_success:
         _indexed_connections.add(conn_id)
+        _indexed_refs.append(conn)
@@ -5,6 +5,7 @@ Quantifies how much GPU compute overlaps with NCCL communication,
 detects training iterations, and breaks down collective operations.
 """
 
+import functools
 from collections import defaultdict
 
 from .profile import Profile
@@ -21,8 +22,13 @@ NCCL_TYPES = {
 }
 
 
+@functools.lru_cache(maxsize=4096)
 def classify_kernel(name: str) -> str:
-    """Classify a kernel as 'compute', 'nccl_<type>', or 'other'."""
+    """Classify a kernel as 'compute', 'nccl_<type>', or 'other'.
+
+    Memoized: a profile repeats a few thousand kernel names across millions
+    of launches, and callers classify every launch.
+    """
     if "nccl" in name.lower():
         for key, label in NCCL_TYPES.items():
             if key.lower() in name.lower():
@@ -134,11 +140,23 @@ def nccl_breakdown(prof: Profile, device: int, trim: tuple[int, int] | None = No
     allowing direct cross-stream comparison to identify which parallelism
     dimension (TP/PP/DP) dominates communication cost.
     """
-    kernels = prof.kernels(device, trim)
+    # Only NCCL launches can classify as nccl_*: match the names once in
+    # StringIds and fetch just those kernels through the shortName index.
+    sql = f"""
+        SELECT k.streamId, k.start, k.[end], s.value AS name
+        FROM {prof.schema.kernel_table} k
+        JOIN StringIds s ON k.shortName = s.id
+        WHERE k.shortName IN (SELECT id FROM StringIds WHERE lower(value) LIKE '%nccl%')
+          AND k.deviceId = ?"""
+    params: list = [device]
+    if trim:
+        sql += " AND k.start >= ? AND k.[end] <= ?"
+        params += list(trim)
+    sql += " ORDER BY k.start"
 
     nccl_data = []
     total_nccl_ns = 0
-    for k in kernels:
+    for k in prof._iter_query(sql, params):
         ctype = classify_kernel(k["name"])
         if ctype.startswith("nccl_"):
             dur_ns = k["end"] - k["start"]
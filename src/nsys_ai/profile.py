@@ -5,16 +5,23 @@ Provides a thin wrapper around the SQLite export with typed accessors
 for kernels, NVTX events, CUDA runtime calls, and metadata.
 """
 
+import contextlib
+import copy
 import functools
+import hashlib
+import json
 import logging
 import os
 import re
 import shutil
 import sqlite3
 import subprocess  # nosec B404
+import tempfile
 import threading
 import typing
-from dataclasses import dataclass, field
+import urllib.parse
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
 
 # subprocess: nsys export (.nsys-rep→.sqlite) only; argv list, no shell.
 if typing.TYPE_CHECKING:
@@ -104,12 +111,12 @@ class NsightSchema:
         meta: dict[str, str] = {}
         for table in ("META_DATA_EXPORT", "META_DATA_CAPTURE"):
             meta.update(self._read_kv_table(table))
-
-        # Heuristic keys that might carry version information
-        for key in meta:
-            lk = key.lower()
-            if "nsight systems version" in lk or "exporter version" in lk:
-                return meta[key]
+            # Heuristic keys that might carry version information; a hit in
+            # META_DATA_EXPORT spares reading META_DATA_CAPTURE.
+            for key in meta:
+                lk = key.lower()
+                if "nsight systems version" in lk or "exporter version" in lk:
+                    return meta[key]
         # Fallback: sometimes the value itself contains 'Nsight Systems X.Y'
         for val in meta.values():
             if "Nsight Systems" in val:
@@ -167,6 +174,165 @@ class ProfileMeta:
     gpu_info: dict[int, GpuInfo] = field(default_factory=dict)  # deviceId -> GpuInfo
 
 
+# PRAGMA presets for profile connections, selected via NSYS_AI_SQLITE_PRESET.
+_SQLITE_PRESETS: dict[str, dict[str, object]] = {
+    # Bounded RSS: read multi-GB profiles through the page cache only.
+    "default": {"mmap_size": 0, "cache_size": -65536},
+    # Scan-heavy read-only commands: mmap cuts read() syscalls and page copies.
+    "scan": {
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -65536,
+        "query_only": 1,
+        "temp_store": "MEMORY",
+        "journal_mode": "OFF",
+    },
+}
+
+
+def _configure_sqlite_session(conn: sqlite3.Connection) -> None:
+    """Apply read-side pragmas to a freshly opened profile connection.
+
+    ``NSYS_AI_SQLITE_PRESET`` picks an entry of :data:`_SQLITE_PRESETS`
+    (default: ``default``, i.e. memory-mapping off so a multi-GB profile does
+    not inflate RSS). ``NSYS_AI_SQLITE_MMAP_BYTES`` (CLI: ``--mmap-bytes``)
+    overrides the preset's ``mmap_size`` and ``NSYS_AI_SQLITE_CACHE_MB`` its
+    page-cache size, e.g. to keep a whole multi-GB profile's hot pages cached
+    across skill queries.
+    """
+    log = logging.getLogger(__name__)
+    preset = os.environ.get("NSYS_AI_SQLITE_PRESET", "").strip().lower() or "default"
+    if preset not in _SQLITE_PRESETS:
+        log.warning("Ignoring unknown NSYS_AI_SQLITE_PRESET=%r", preset)
+        preset = "default"
+    pragmas = dict(_SQLITE_PRESETS[preset])
+    for env, pragma, scale in (
+        ("NSYS_AI_SQLITE_MMAP_BYTES", "mmap_size", 1),
+        # A negative cache_size is in KiB rather than pages
+        ("NSYS_AI_SQLITE_CACHE_MB", "cache_size", -1024),
+    ):
+        raw = os.environ.get(env, "").strip()
+        if raw:
+            try:
+                pragmas[pragma] = max(0, int(raw)) * scale
+            except ValueError:
+                log.warning("Ignoring invalid %s=%r", env, raw)
+    for name, value in pragmas.items():
+        try:
+            conn.execute(f"PRAGMA {name} = {value}")
+        except sqlite3.Error:
+            pass
+
+
+# ProfileMeta of recently opened SQLite profiles, keyed by (path, size,
+# mtime_ns): re-opening an unchanged file in the same process (chat tool
+# calls, TUI reloads) skips the discovery scans over the kernel table.
+_META_CACHE: dict[tuple[str, int, int], ProfileMeta] = {}
+_META_CACHE_MAX = 8
+_META_CACHE_LOCK = threading.Lock()
+
+
+def _meta_cache_key(path: str) -> tuple[str, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+# Across processes, the same key finds the ProfileMeta on disk as JSON under
+# $XDG_CACHE_HOME/nsys-ai/meta (NSYS_AI_META_CACHE_DIR overrides the
+# directory, NSYS_AI_META_CACHE=0 disables it).
+def _meta_disk_path(key: tuple[str, int, int]) -> Path | None:
+    if os.environ.get("NSYS_AI_META_CACHE", "1").strip() == "0":
+        return None
+    directory = os.environ.get("NSYS_AI_META_CACHE_DIR", "").strip()
+    if not directory:
+        base = os.environ.get("XDG_CACHE_HOME", "").strip() or Path.home() / ".cache"
+        directory = Path(base) / "nsys-ai" / "meta"
+    from . import __version__
+
+    digest = hashlib.blake2b(repr((key, __version__)).encode(), digest_size=16).hexdigest()
+    return Path(directory) / f"{digest}.json"
+
+
+def _load_disk_meta(key: tuple[str, int, int]) -> ProfileMeta | None:
+    path = _meta_disk_path(key)
+    if path is None:
+        return None
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        return ProfileMeta(
+            devices=raw["devices"],
+            streams={int(d): s for d, s in raw["streams"].items()},
+            time_range=tuple(raw["time_range"]),
+            kernel_count=raw["kernel_count"],
+            nvtx_count=raw["nvtx_count"],
+            tables=raw["tables"],
+            gpu_info={int(d): GpuInfo(**g) for d, g in raw["gpu_info"].items()},
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _store_disk_meta(key: tuple[str, int, int], meta: ProfileMeta) -> None:
+    path = _meta_disk_path(key)
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(asdict(meta), f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except (OSError, TypeError, ValueError) as e:
+        logging.getLogger(__name__).debug("Could not cache profile metadata: %s", e)
+
+
+def _readonly_uri(path: str) -> str:
+    """SQLite ``mode=ro`` URI for *path*, for ``uri=True`` connects and ATTACH."""
+    return f"file:{urllib.parse.quote(os.path.abspath(path))}?mode=ro"
+
+
+@contextlib.contextmanager
+def _read_transaction(conn) -> typing.Iterator[None]:
+    """Run a batch of reads on *conn* inside one SQLite transaction.
+
+    Outside a transaction every statement takes and drops the shared lock
+    and revalidates the page cache; one ``BEGIN`` amortises that over the
+    batch and gives its queries a consistent snapshot. A no-op for DuckDB
+    connections and when a transaction is already open.
+    """
+    if not isinstance(conn, sqlite3.Connection) or conn.in_transaction:
+        yield
+        return
+    conn.execute("BEGIN")
+    try:
+        yield
+    finally:
+        if conn.in_transaction:
+            conn.execute("COMMIT")
+
+
+def _connect_sqlite(path: str, *, read_only: bool = False) -> sqlite3.Connection:
+    """Open *path* as a profile session: ``sqlite3.Row`` rows plus read-side pragmas.
+
+    *read_only* opens through a ``mode=ro`` URI. Read-only handles cannot
+    create the performance indexes skills rely on, so only use them where
+    those already exist or are not needed.
+    """
+    if read_only:
+        conn = sqlite3.connect(_readonly_uri(path), uri=True, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    _configure_sqlite_session(conn)
+    return conn
+
+
 class Profile:
     """Handle to an opened Nsight Systems SQLite database.
 
@@ -199,8 +365,7 @@ class Profile:
             self.db = parquet_cache.open_parquetdir_db(path)
             self.conn = self.db
         else:
-            self.conn = sqlite3.connect(path, check_same_thread=False)
-            self.conn.row_factory = sqlite3.Row
+            self.conn = _connect_sqlite(path)
             try:
                 if cache_mode == "direct":
                     # Force direct SQLite via DuckDB — zero ETL, instant startup
@@ -232,9 +397,15 @@ class Profile:
                 self.db = None  # type: ignore[assignment]
         from .connection import wrap_connection
 
+        if self.db is None:
+            # Queries run on SQLite itself: index the columns _discover, kernels()
+            # and gpu_threads() filter on (a no-op once the file has them)
+            from .indexing import ensure_performance_indexes
+
+            ensure_performance_indexes(self.conn)
         self.adapter = wrap_connection(self.db if self.db is not None else self.conn)
         self.schema = NsightSchema(self.db if self.db is not None else self.conn)
-        self.meta = self._discover()
+        self.meta = self._discover_cached()
         self._nvtx_has_text_id = self.adapter.detect_nvtx_text_id()
 
     @classmethod
@@ -263,6 +434,82 @@ class Profile:
         obj._nvtx_has_text_id = obj.adapter.detect_nvtx_text_id()
         return obj
 
+    def worker(self) -> "Profile":
+        """Return a handle on this profile that can query alongside it from another thread.
+
+        The handle shares the discovered schema and metadata but gets its own
+        connection and lock: a DuckDB cursor, or a read-only SQLite
+        connection to :attr:`path`. Profiles wrapping a borrowed connection
+        have no path to reopen, so their handles share its lock instead.
+        Closing a handle never closes this profile's connections.
+        """
+        from .connection import wrap_connection
+
+        clone = copy.copy(self)
+        clone.meta = copy.deepcopy(self.meta)
+        clone._owns_conn = False
+        if self.db is not None:
+            clone.db = self.db.cursor()
+            if self.conn is self.db:
+                clone.conn = clone.db
+            clone._lock = threading.Lock()
+        elif self.path and self.backend == "sqlite":
+            clone.conn = _connect_sqlite(self.path, read_only=True)
+            clone._owns_conn = True
+            clone._lock = threading.Lock()
+        clone.adapter = wrap_connection(clone.db if clone.db is not None else clone.conn)
+        return clone
+
+    def map_workers(self, fn, items) -> list:
+        """Return ``[fn(handle, item) for item in items]``, each call on its own :meth:`worker`.
+
+        Use it for independent analyses over one profile: each worker handle
+        has its own connection, so their queries proceed concurrently in a
+        thread pool instead of queueing on this profile's lock. Results keep
+        the order of *items*. A profile wrapping a borrowed SQLite connection
+        has no path to reopen, so its handles would share that connection
+        across threads; those calls run one after another on the calling
+        thread instead.
+        """
+        items = list(items)
+        if self.db is None and not self.path:
+            return [fn(self, item) for item in items]
+
+        def _run(item):
+            handle = self.worker()
+            try:
+                return fn(handle, item)
+            finally:
+                handle.close()
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max(len(items), 1)) as pool:
+            return list(pool.map(_run, items))
+
+    def _discover_cached(self) -> ProfileMeta:
+        """:meth:`_discover`, reusing the result for an unchanged SQLite file.
+
+        Looks in this process first, then in the on-disk cache. Each caller
+        gets its own copy, so mutating ``prof.meta`` never leaks into other
+        profiles.
+        """
+        key = _meta_cache_key(self.path) if self.backend == "sqlite" else None
+        with _META_CACHE_LOCK:
+            meta = _META_CACHE.get(key) if key else None
+        if meta is None:
+            meta = _load_disk_meta(key) if key else None
+            if meta is None:
+                meta = self._discover()
+                if key:
+                    _store_disk_meta(key, meta)
+            if key:
+                with _META_CACHE_LOCK:
+                    if len(_META_CACHE) >= _META_CACHE_MAX:
+                        _META_CACHE.pop(next(iter(_META_CACHE)))
+                    _META_CACHE[key] = meta
+        return copy.deepcopy(meta)
+
     def _discover(self) -> ProfileMeta:
         tables = self.schema.tables
 
@@ -278,22 +525,21 @@ class Profile:
 
         kernel_table = self.schema.kernel_table
 
-        devices = [
-            r[0]
-            for r in self.adapter.execute(
-                f"SELECT DISTINCT deviceId FROM {kernel_table} ORDER BY deviceId"
-            ).fetchall()
-        ]
-
+        # Devices, streams and kernel counts all come from one per-(device,
+        # stream) count, which the (deviceId, streamId) index covers; folding
+        # MIN/MAX in too would force a row lookup per kernel.
         streams: dict[int, list[int]] = {}
-        for r in self.adapter.execute(
-            f"SELECT DISTINCT deviceId, streamId FROM {kernel_table} ORDER BY deviceId, streamId"
+        kcounts: dict[int, int] = {}
+        for dev, stream, n in self.adapter.execute(
+            f"SELECT deviceId, streamId, COUNT(*) FROM {kernel_table} "
+            "GROUP BY deviceId, streamId ORDER BY deviceId, streamId"
         ).fetchall():
-            streams.setdefault(r[0], []).append(r[1])
+            streams.setdefault(dev, []).append(stream)
+            kcounts[dev] = kcounts.get(dev, 0) + n
+        devices = list(streams)
+        kc = sum(kcounts.values())
 
         tr = self.adapter.execute(f"SELECT MIN(start), MAX([end]) FROM {kernel_table}").fetchone()
-
-        kc = self.adapter.execute(f"SELECT COUNT(*) FROM {kernel_table}").fetchone()[0]
         nc = (
             self.adapter.execute("SELECT COUNT(*) FROM NVTX_EVENTS").fetchone()[0]
             if "NVTX_EVENTS" in tables
@@ -307,20 +553,13 @@ class Profile:
             kernel_count=kc,
             nvtx_count=nc,
             tables=tables,
-            gpu_info=self._gpu_info(devices, streams, tables),
+            gpu_info=self._gpu_info(devices, streams, kcounts, tables),
         )
 
-    def _gpu_info(self, devices, streams, tables) -> dict[int, GpuInfo]:
-        """Query hardware metadata per GPU."""
+    def _gpu_info(self, devices, streams, kcounts, tables) -> dict[int, GpuInfo]:
+        """Query hardware metadata per GPU; *kcounts* maps deviceId -> kernel count."""
         info: dict[int, GpuInfo] = {}
-
-        # Kernel counts per device
-        kcounts = {}
         query_conn = self.db if self.db is not None else self.conn
-        for r in query_conn.execute(
-            f"SELECT deviceId, COUNT(*) FROM {self.schema.kernel_table} GROUP BY deviceId"
-        ).fetchall():
-            kcounts[r[0]] = r[1]
 
         # Hardware info from TARGET_INFO_GPU + TARGET_INFO_CUDA_DEVICE
         hw = {}
@@ -361,6 +600,20 @@ class Profile:
 
     def kernels(self, device: int | None, trim: tuple[int, int] | None = None) -> list[dict]:
         """All kernels on a device (or all devices if None), optionally trimmed to a time window."""
+        return self._duckdb_query(*self._kernels_sql(device, trim))
+
+    def kernels_iter(
+        self, device: int | None, trim: tuple[int, int] | None = None
+    ) -> typing.Iterator[dict]:
+        """Yield the rows of :meth:`kernels` lazily, in batches.
+
+        For single-pass consumers: only one batch is held in memory, and a
+        consumer that stops early never fetches the remaining kernels.
+        """
+        yield from self._iter_query(*self._kernels_sql(device, trim))
+
+    def _kernels_sql(self, device: int | None, trim: tuple[int, int] | None) -> tuple[str, list]:
+        """SQL and parameters shared by :meth:`kernels` and :meth:`kernels_iter`."""
         sql = """
             SELECT k.start, k.[end], k.streamId, k.correlationId,
                    s.value as name, d.value as demangled
@@ -378,7 +631,34 @@ class Profile:
             sql += " AND k.start >= ? AND k.[end] <= ?"
             params += list(trim)
         sql += " ORDER BY k.start"
-        return self._duckdb_query(sql, params)
+        return sql, params
+
+    def kernels_by_device(
+        self, devices: list[int], trim: tuple[int, int] | None = None
+    ) -> dict[int, list[dict]]:
+        """Kernels for several devices in one query, grouped by deviceId.
+
+        Rows match :meth:`kernels`; every requested device gets a (possibly
+        empty) list.
+        """
+        out: dict[int, list[dict]] = {d: [] for d in devices}
+        if not devices:
+            return out
+        sql = f"""
+            SELECT k.deviceId, k.start, k.[end], k.streamId, k.correlationId,
+                   s.value as name, d.value as demangled
+            FROM {self.schema.kernel_table} k
+            JOIN StringIds s ON k.shortName = s.id
+            JOIN StringIds d ON k.demangledName = d.id
+            WHERE k.deviceId IN ({",".join("?" * len(devices))})"""
+        params: list = list(devices)
+        if trim:
+            sql += " AND k.start >= ? AND k.[end] <= ?"
+            params += list(trim)
+        sql += " ORDER BY k.start"
+        for row in self._duckdb_query(sql, params):
+            out[row.pop("deviceId")].append(row)
+        return out
 
     def aggregate_kernels(
         self,
@@ -565,27 +845,28 @@ class Profile:
         return out
 
     def kernel_map(self, device: int) -> dict[int, dict]:
-        """Build correlationId -> kernel info for ALL kernels on a device."""
-        return {
-            r["correlationId"]: dict(
-                start=r["start"],
-                end=r["end"],
-                stream=r["streamId"],
-                name=r["name"],
-                demangled=r["demangled"],
-            )
-            for r in self._duckdb_query(
-                f"""
-                    SELECT k.start, k.[end], k.streamId, k.correlationId,
-                           s.value as name, d.value as demangled
-                    FROM {self.schema.kernel_table} k
-                    JOIN StringIds s ON k.shortName = s.id
-                    JOIN StringIds d ON k.demangledName = d.id
-                    WHERE k.deviceId = ?  ORDER BY k.start
-                """,
-                [device],
-            )
-        }
+        """Build correlationId -> kernel info for ALL kernels on a device.
+
+        Rows are streamed in batches and become the values directly, and
+        each distinct name string is shared by every kernel carrying it.
+        """
+        kmap: dict[int, dict] = {}
+        names: dict[str, str] = {}
+        for r in self._iter_query(
+            f"""
+                SELECT k.start, k.[end], k.streamId AS stream, k.correlationId,
+                       s.value as name, d.value as demangled
+                FROM {self.schema.kernel_table} k
+                JOIN StringIds s ON k.shortName = s.id
+                JOIN StringIds d ON k.demangledName = d.id
+                WHERE k.deviceId = ?  ORDER BY k.start
+            """,
+            [device],
+        ):
+            r["name"] = names.setdefault(r["name"], r["name"])
+            r["demangled"] = names.setdefault(r["demangled"], r["demangled"])
+            kmap[r.pop("correlationId")] = r
+        return kmap
 
     def gpu_threads(self, device: int) -> set[int]:
         """Find all CPU threads (globalTid) that launch kernels on this device."""
@@ -602,17 +883,34 @@ class Profile:
             )
         }
 
+    # Most threads that runtime_index binds as parameters; SQLite builds before
+    # 3.32 reject statements with more than 999 of them.
+    _RUNTIME_TID_IN_MAX = 500
+
     def runtime_index(self, threads: set[int], window: tuple[int, int]) -> dict[int, list]:
-        """Load CUDA runtime calls for threads, indexed by globalTid."""
-        idx = {}
-        for tid in threads:
-            idx[tid] = self._duckdb_query(
-                """
-                SELECT start, [end], correlationId FROM CUPTI_ACTIVITY_KIND_RUNTIME
-                WHERE globalTid = ? AND start >= ? AND [end] <= ?  ORDER BY start
-            """,
-                [tid, window[0], window[1]],
-            )
+        """Load CUDA runtime calls for threads, indexed by globalTid.
+
+        One query covers every thread; each gets a (possibly empty) list of
+        ``{start, end, correlationId}`` rows ordered by start. Past
+        ``_RUNTIME_TID_IN_MAX`` threads the query scans the window for all
+        threads and drops the others here, rather than binding a huge IN list.
+        """
+        idx: dict[int, list] = {tid: [] for tid in threads}
+        if not idx:
+            return idx
+        params: list = [window[0], window[1]]
+        tid_filter = ""
+        if len(idx) <= self._RUNTIME_TID_IN_MAX:
+            tid_filter = f"AND globalTid IN ({','.join('?' * len(idx))})"
+            params += idx
+        sql = f"""
+            SELECT globalTid, start, [end], correlationId FROM CUPTI_ACTIVITY_KIND_RUNTIME
+            WHERE start >= ? AND [end] <= ? {tid_filter}
+            ORDER BY globalTid, start"""
+        for row in self._duckdb_query(sql, params):
+            rows = idx.get(row.pop("globalTid"))
+            if rows is not None:
+                rows.append(row)
         return idx
 
     def nvtx_events(self, threads: set[int], window: tuple[int, int]) -> list:
@@ -624,7 +922,8 @@ class Profile:
         """
         if "NVTX_EVENTS" not in self.schema.tables or not threads:
             return []
-        tids = ",".join(map(str, threads))
+        tids = ",".join("?" * len(threads))
+        params = [window[0], window[1], *threads]
         if self._nvtx_has_text_id:
             return self._duckdb_query(
                 f"""
@@ -638,7 +937,7 @@ class Profile:
                   AND n.globalTid IN ({tids})
                 ORDER BY n.start
             """,
-                list(window),
+                params,
             )
         else:
             return self._duckdb_query(
@@ -649,15 +948,11 @@ class Profile:
                   AND globalTid IN ({tids})
                 ORDER BY start
             """,
-                list(window),
+                params,
             )
 
-    def _duckdb_query(self, sql: str, params=None) -> list[dict]:
-        """Execute a SQL query via DuckDB, falling back to SQLite.
-
-        Translates SQLite-dialect SQL (``[end]``) to DuckDB (``"end"``).
-        Returns results as a list of dicts.
-        """
+    def _query_adapter(self):
+        """Return ``(adapter, is_duckdb)`` for the connection queries run on."""
         conn = self.db if self.db is not None else self.conn
 
         from .connection import DuckDBAdapter, wrap_connection
@@ -673,6 +968,15 @@ class Profile:
                 "DuckDB cache unavailable or not in use; falling back to SQLite (slower)"
             )
             self._warned_sqlite_fallback = True
+        return adapter, is_duckdb
+
+    def _duckdb_query(self, sql: str, params=None) -> list[dict]:
+        """Execute a SQL query via DuckDB, falling back to SQLite.
+
+        Translates SQLite-dialect SQL (``[end]``) to DuckDB (``"end"``).
+        Returns results as a list of dicts.
+        """
+        adapter, is_duckdb = self._query_adapter()
 
         with self._lock:
             cur = adapter.execute(sql, params or [])
@@ -682,6 +986,41 @@ class Profile:
             else:
                 return [dict(r) for r in cur.fetchall()]
 
+    _ITER_BATCH_ROWS = 10_000
+
+    def _iter_query(self, sql: str, params=None) -> typing.Iterator[dict]:
+        """:meth:`_duckdb_query`, yielding rows ``fetchmany`` batch by batch."""
+        adapter, is_duckdb = self._query_adapter()
+        if is_duckdb:
+            from .connection import wrap_connection
+
+            # A private cursor: a later query on the shared DuckDB connection
+            # would otherwise discard this pending result mid-iteration.
+            cursor = adapter.raw_conn.cursor()
+            try:
+                cur = wrap_connection(cursor).execute(sql, params or [])
+                cols = [d[0] for d in cur.description]
+                while batch := cur.fetchmany(self._ITER_BATCH_ROWS):
+                    for row in batch:
+                        yield dict(zip(cols, row))
+            finally:
+                cursor.close()
+            return
+        with self._lock:
+            cur = adapter.execute(sql, params or [])
+        try:
+            while True:
+                # Locked per batch, not across yields, so the consumer can run
+                # other queries on this profile while iterating.
+                with self._lock:
+                    batch = cur.fetchmany(self._ITER_BATCH_ROWS)
+                if not batch:
+                    break
+                for row in batch:
+                    yield dict(row)
+        finally:
+            cur.close()
+
     def close(self):
         # Close the primary connection only if we own it.
         if getattr(self, "_owns_conn", True):
@@ -778,6 +1117,7 @@ def resolve_profile_path(path: str, *, backend: str = "sqlite") -> str:
             timeout=300,
         )
     except subprocess.TimeoutExpired as e:
+        _discard_partial_export(out)
         raise ExportTimeoutError(
             "nsys export timed out after 300 seconds. This may indicate that nsys is waiting "
             "for interactive input (for example, a license prompt) or that the .nsys-rep file "
@@ -785,6 +1125,7 @@ def resolve_profile_path(path: str, *, backend: str = "sqlite") -> str:
             f"  nsys export --type sqlite --include-blobs=true -o {out} --force-overwrite=true {path}\n"
         ) from e
     except subprocess.CalledProcessError as e:
+        _discard_partial_export(out)
         raise ExportError(
             f"nsys export failed: {e.stderr or e.stdout or str(e)}. "
             "Export manually: nsys export --type sqlite --include-blobs=true "
@@ -848,12 +1189,14 @@ def _resolve_parquetdir_path(path: str) -> str:
             timeout=300,
         )
     except subprocess.TimeoutExpired as e:
+        _discard_partial_export(out)
         raise ExportTimeoutError(
             "nsys export timed out after 300 seconds while producing a parquetdir export. "
             "Try running the export manually to inspect the full output:\n"
             f"  nsys export --type parquetdir --include-blobs=true --force-overwrite=true -o {out} {path}\n"
         ) from e
     except subprocess.CalledProcessError as e:
+        _discard_partial_export(out)
         raise ExportError(
             f"nsys parquetdir export failed: {e.stderr or e.stdout or str(e)}. "
             "Export manually: nsys export --type parquetdir --include-blobs=true "
@@ -867,6 +1210,19 @@ def _resolve_parquetdir_path(path: str) -> str:
     return out
 
 
+def _discard_partial_export(out: str) -> None:
+    """Remove what a failed ``nsys export`` left at *out*.
+
+    A partial file or directory there would be newer than the .nsys-rep and
+    get reused as an up-to-date export on the next open.
+    """
+    if os.path.isdir(out):
+        shutil.rmtree(out, ignore_errors=True)
+    else:
+        with contextlib.suppress(OSError):
+            os.unlink(out)
+
+
 def _sqlite_needs_blob_reexport(path: str) -> bool:
     """Check whether a SQLite export is missing NVTX payload schema/blob support.
 
@@ -876,7 +1232,7 @@ def _sqlite_needs_blob_reexport(path: str) -> bool:
     if not (os.path.exists(path) and os.path.getsize(path) > 0):
         return True
     try:
-        with sqlite3.connect(path) as conn:
+        with contextlib.closing(sqlite3.connect(path)) as conn:
             cur = conn.cursor()
             tables = {
                 row[0] for row in cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
@@ -927,7 +1283,12 @@ def open(path: str, *, backend: str = "sqlite", cache_mode: str = "auto") -> Pro
     # file without the .sqlite suffix exists and is a non-empty SQLite DB,
     # prefer the sibling. This helps when users accidentally point nsys-ai
     # at a placeholder file instead of the real Nsight export.
-    if backend == "sqlite" and path.endswith(".sqlite") and os.path.exists(path) and not os.path.getsize(path):
+    if (
+        backend == "sqlite"
+        and path.endswith(".sqlite")
+        and os.path.exists(path)
+        and not os.path.getsize(path)
+    ):
         base = path[:-7]
         if os.path.exists(base) and os.path.getsize(base) > 0:
             path = base
@@ -7,87 +7,98 @@ optional markdown output. Aligns with Nsight Systems practice of focused
 profiling (trim window) and post-processing SQLite results into a report.
 """
 
-import statistics
-
-from .overlap import (
-    detect_iterations,
-    format_iterations,
-    format_nccl,
-    format_overlap,
-    nccl_breakdown,
-    overlap_analysis,
-)
-from .profile import Profile
-from .summary import auto_commentary, format_text, gpu_summary
-from .tree import build_nvtx_tree
-
-
-def _nvtx_hierarchy_summary(prof: Profile, device: int, trim: tuple[int, int]) -> str:
+import typing
+
+# The analysis modules are imported where used: this module is only needed
+# by `analyze`, and importing it should not pull them all in.
+if typing.TYPE_CHECKING:
+    from .profile import Profile
+
+
+def _nvtx_hierarchy_summary(prof: "Profile", device: int, trim: tuple[int, int]) -> str:
     """Short summary of top-level NVTX regions (name + duration)."""
+    from .tree import build_nvtx_tree
+
     roots = build_nvtx_tree(prof, device, trim)
     if not roots:
         return "NVTX hierarchy: (none or no kernels in trim window)"
     lines = ["NVTX hierarchy (top-level regions)"]
-    for node in roots:
-        dur_ms = (node["end"] - node["start"]) / 1e6
-        lines.append(f"  {node['name']}: {dur_ms:.1f}ms")
-    nvtx_count = sum(1 for n in _walk_nodes(roots) if n.get("type") == "nvtx")
-    kern_count = sum(1 for n in _walk_nodes(roots) if n.get("type") == "kernel")
+    lines += [f"  {n['name']}: {(n['end'] - n['start']) / 1e6:.1f}ms" for n in roots]
+    nvtx_count, kern_count = _count_nodes(roots)
     lines.append(f"  ({len(roots)} top-level, {nvtx_count} NVTX, {kern_count} kernels)")
     return "\n".join(lines)
 
 
-def _walk_nodes(nodes):
-    """Yield all nodes in tree (roots + descendants)."""
-    for node in nodes:
-        yield node
-        yield from _walk_nodes(node.get("children", []))
+def _count_nodes(roots) -> tuple[int, int]:
+    """Count (NVTX, kernel) nodes in the tree, in one iterative pass."""
+    nvtx_count = kern_count = 0
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        kind = node.get("type")
+        if kind == "nvtx":
+            nvtx_count += 1
+        elif kind == "kernel":
+            kern_count += 1
+        stack.extend(node.get("children", ()))
+    return nvtx_count, kern_count
 
 
 def _iteration_regression_flags(iters: list[dict]) -> list[str]:
     """Flag iterations that are unusually slow (e.g. >1.5x median)."""
+    import statistics
+
     if len(iters) < 2:
         return []
     durs = [it["duration_ms"] for it in iters]
     med = statistics.median(durs)
     if med <= 0:
         return []
-    flags = []
-    for it in iters:
-        if it["duration_ms"] > 1.5 * med:
-            pct = 100 * it["duration_ms"] / med
-            flags.append(
-                f"  ⚠ iter {it['iteration']}: {it['duration_ms']:.1f}ms "
-                f"(~{pct:.0f}% of median {med:.1f}ms)"
-            )
-    return flags
-
-
-def run_analyze(prof: Profile, device: int, trim: tuple[int, int]) -> dict:
+    threshold = 1.5 * med
+    return [
+        f"  ⚠ iter {it['iteration']}: {dur:.1f}ms (~{100 * dur / med:.0f}% of median {med:.1f}ms)"
+        for it, dur in zip(iters, durs)
+        if dur > threshold
+    ]
+
+
+def run_analyze(prof: "Profile", device: int, trim: tuple[int, int]) -> dict:
     """
     Run all analyses and return a structured dict for formatting.
 
     Keys: summary, overlap, nccl_breakdown, iters, iters_regression, nvtx_summary.
     """
-    summary = gpu_summary(prof, device, trim)
-    overlap = overlap_analysis(prof, device, trim)
-    nccl = nccl_breakdown(prof, device, trim)
-    iters = detect_iterations(prof, device, trim)
-    iters_regression = _iteration_regression_flags(iters) if iters else []
-    nvtx_summary = _nvtx_hierarchy_summary(prof, device, trim)
+    from .overlap import detect_iterations, nccl_breakdown, overlap_analysis
+    from .summary import gpu_summary
+
+    # Independent analyses; results keep this dict's order.
+    analyses = {
+        "summary": gpu_summary,
+        "overlap": overlap_analysis,
+        "nccl_breakdown": nccl_breakdown,
+        "iters": detect_iterations,
+        "nvtx_summary": _nvtx_hierarchy_summary,
+    }
 
+    results = prof.map_workers(lambda worker, fn: fn(worker, device, trim), analyses.values())
+    data = dict(zip(analyses, results))
+
+    iters = data["iters"]
     return {
-        "summary": summary,
-        "overlap": overlap,
-        "nccl_breakdown": nccl,
+        "summary": data["summary"],
+        "overlap": data["overlap"],
+        "nccl_breakdown": data["nccl_breakdown"],
         "iters": iters,
-        "iters_regression": iters_regression,
-        "nvtx_summary": nvtx_summary,
+        "iters_regression": _iteration_regression_flags(iters) if iters else [],
+        "nvtx_summary": data["nvtx_summary"],
     }
 
 
 def format_report_terminal(data: dict) -> str:
     """Format the full report for terminal (plain text)."""
+    from .overlap import format_iterations, format_nccl, format_overlap
+    from .summary import auto_commentary, format_text
+
     sections = []
 
     # 1. Top bottlenecks + AI-style commentary
@@ -129,6 +140,9 @@ def format_report_terminal(data: dict) -> str:
 
 def format_report_markdown(data: dict, profile_path: str, trim: tuple[int, int]) -> str:
     """Format the full report as markdown (for -o file.md)."""
+    from .overlap import format_iterations, format_nccl, format_overlap
+    from .summary import auto_commentary
+
     s = data["summary"]
     trim_label = f"{trim[0] / 1e9:.1f}s – {trim[1] / 1e9:.1f}s" if trim else "full range"
     lines = [
@@ -29,7 +29,7 @@ def search_kernels(
     results = []
 
     for dev in devices:
-        for k in prof.kernels(dev, trim):
+        for k in prof.kernels_iter(dev, trim):
             if q in k["name"].lower():
                 results.append(
                     dict(
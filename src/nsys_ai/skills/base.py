@@ -4,6 +4,7 @@ base.py — Skill dataclass and execution helpers.
 A Skill is the minimum analyzable unit: SQL template + parameters + formatter.
 """
 
+import functools
 import logging
 import sqlite3
 from collections.abc import Callable
@@ -91,6 +92,11 @@ class Skill:
     tags: list[str] = field(default_factory=list)
     execute_fn: Callable | None = None
     to_findings_fn: Callable | None = None
+    # True when the SQL has no braces, so formatting it would be a no-op
+    _is_static: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._is_static = "{" not in self.sql and "}" not in self.sql
 
     def execute(self, conn: sqlite3.Connection, **kwargs) -> list[dict]:
         """Run the skill against a connection.
@@ -108,6 +114,17 @@ class Skill:
         Returns:
             List of result rows as dicts
         """
+        return self._execute(conn, kwargs, columnar=False)
+
+    def execute_columnar(self, conn: sqlite3.Connection, **kwargs) -> dict[str, list]:
+        """Run the skill like :meth:`execute`, returning ``{column: values}``.
+
+        For large result sets: SQL skills transpose the fetched rows once
+        instead of building one dict per row.
+        """
+        return self._execute(conn, kwargs, columnar=True)
+
+    def _execute(self, conn, kwargs: dict, *, columnar: bool):
         # Auto-create performance indexes (one-time per connection).
         ensure_indexes(conn)
 
@@ -141,7 +158,10 @@ class Skill:
         # Compute profiler overhead union duration dynamically.
         # Probe the known profiler overhead table-name variants directly and
         # treat DB_ERRORS as "table not present" so we can fall back cleanly.
-        if "overhead_ns" not in resolved:
+        # SQL skills only need it when their template references it.
+        if "overhead_ns" not in resolved and (
+            self.execute_fn is not None or "{overhead_ns}" in self.sql
+        ):
             overhead_ns = 0
             for oh_table in ("profiler_overhead", "PROFILER_OVERHEAD"):
                 try:
@@ -181,7 +201,8 @@ class Skill:
 
         # Python-level skill: delegate to execute_fn with resolved params.
         if self.execute_fn is not None:
-            return self.execute_fn(conn, **resolved)
+            rows = self.execute_fn(conn, **resolved)
+            return _to_columns(rows) if columnar else rows
 
         # --- SQL Execution Path ---
         # Inject resolved activity table names for versioned-table support.
@@ -229,10 +250,17 @@ class Skill:
                 resolved.setdefault("nvtx_text_expr", "n.text")
                 resolved.setdefault("nvtx_text_join", "")
 
-        sql = self.sql.format(**resolved) if resolved else self.sql
+        sql = self.sql if self._is_static or not resolved else _render_sql(self.sql, resolved)
         try:
             cursor = adapter.execute(sql)
+            if isinstance(cursor, sqlite3.Cursor):
+                # Rows are rebuilt as dicts (or columns) below; skip building a
+                # sqlite3.Row per row on Profile connections that set that factory.
+                cursor.row_factory = None
             columns = [desc[0] for desc in cursor.description] if cursor.description else []
+            if columnar:
+                values = list(zip(*cursor.fetchall())) or [()] * len(columns)
+                return {col: list(vals) for col, vals in zip(columns, values)}
             return [dict(zip(columns, row)) for row in cursor.fetchall()]
         except Exception as exc:
             db_errors = (sqlite3.Error,)
@@ -271,18 +299,53 @@ class Skill:
         return f"[{self.name}] {self.title}: {self.description}{params_desc}"
 
 
+@functools.lru_cache(maxsize=256)
+def _render_sql_cached(template: str, items: tuple) -> str:
+    return template.format_map(dict(items))
+
+
+def _render_sql(template: str, params: dict) -> str:
+    """``template.format(**params)``, memoized for repeated parameter sets.
+
+    The agent and evidence builder run the same skills with the same trim
+    window and tables over and over; only unhashable parameters bypass the
+    cache.
+    """
+    try:
+        return _render_sql_cached(template, tuple(sorted(params.items())))
+    except TypeError:
+        return template.format_map(params)
+
+
+def ellipsize(text: str, width: int) -> str:
+    """Cut *text* to *width* characters, marking a cut with a trailing "..."."""
+    return text if len(text) <= width else text[: width - 3] + "..."
+
+
+def _to_columns(rows: list[dict]) -> dict[str, list]:
+    """Transpose dict rows into ``{column: values}``, columns in first-seen order."""
+    columns: dict[str, list] = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, [])
+    for key, values in columns.items():
+        values.extend(row.get(key) for row in rows)
+    return columns
+
+
 def _default_format(skill: Skill, rows: list[dict]) -> str:
     """Simple tabular format for skill results."""
     if not rows:
         return f"({skill.title}: no results)"
 
     cols = list(rows[0].keys())
-    # Compute column widths
-    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in cols}
+    # Stringify each cell once; widths and output lines both reuse it
+    cells = [[str(r.get(c, "")) for c in cols] for r in rows]
+    widths = [max(len(c), *map(len, col)) for c, col in zip(cols, zip(*cells))]
 
-    header = "  ".join(c.ljust(widths[c]) for c in cols)
-    sep = "  ".join("─" * widths[c] for c in cols)
+    header = "  ".join(c.ljust(w) for c, w in zip(cols, widths))
+    sep = "  ".join("─" * w for w in widths)
     lines = [f"── {skill.title} ──", header, sep]
-    for row in rows:
-        lines.append("  ".join(str(row.get(c, "")).ljust(widths[c]) for c in cols))
+    for row in cells:
+        lines.append("  ".join(s.ljust(w) for s, w in zip(row, widths)))
     return "\n".join(lines)
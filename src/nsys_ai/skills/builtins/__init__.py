@@ -1 +1,41 @@
-"""Built-in skills for nsys-ai. Each module exports a SKILL constant."""
+"""Built-in skills for nsys-ai. Each module exports a SKILL constant.
+
+The registry imports the modules listed in ``MODULES`` instead of scanning
+this package; add new skill modules there.
+"""
+
+MODULES = (
+    "arithmetic_intensity",
+    "cpu_gpu_pipeline",
+    "cutracer_analysis",
+    "gc_impact",
+    "gpu_idle_gaps",
+    "host_sync_parent_ranges",
+    "iteration_detail",
+    "iteration_timing",
+    "kernel_instances",
+    "kernel_launch_overhead",
+    "kernel_launch_pattern",
+    "kernel_overlap_matrix",
+    "memory_bandwidth",
+    "memory_transfers",
+    "module_loading",
+    "nccl_anomaly",
+    "nccl_breakdown",
+    "nccl_communicator_analysis",
+    "nvtx_kernel_map",
+    "nvtx_layer_breakdown",
+    "overlap_breakdown",
+    "pipeline_bubble_metrics",
+    "profile_health_manifest",
+    "region_mfu",
+    "root_cause_matcher",
+    "schema_inspect",
+    "speedup_estimator",
+    "stream_concurrency",
+    "sync_cost_analysis",
+    "tensor_core_usage",
+    "theoretical_flops",
+    "thread_utilization",
+    "top_kernels",
+)
@@ -2,7 +2,7 @@
 
 from nsys_ai.connection import DB_ERRORS, wrap_connection
 
-from ..base import Skill
+from ..base import Skill, ellipsize
 
 
 def _format(rows):
@@ -15,8 +15,7 @@ def _format(rows):
     ]
     for r in rows:
         name = r["event_name"]
-        if len(name) > 28:
-            name = name[:25] + "..."
+        name = ellipsize(name, 28)
         lines.append(
             f"{name:<30s}  {r['occurrences']:>7d}  {r['total_ms']:>10.2f}  "
             f"{r['max_ms']:>10.2f}  {r['avg_ms']:>10.2f}"
@@ -10,7 +10,7 @@ import sqlite3
 
 from nsys_ai.connection import DB_ERRORS, wrap_connection
 
-from ..base import Skill, SkillParam
+from ..base import Skill, SkillParam, ellipsize
 
 _log = logging.getLogger(__name__)
 
@@ -67,29 +67,46 @@ def _execute(conn: sqlite3.Connection, **kwargs):
         trim_params += [int(trim_start), int(trim_end)]
 
     # --- Phase 1: Find all gaps ---
+    # Gaps are computed on the kernel table alone (served by the covering
+    # _nsysai_kernel_dev_stream_start index); names are joined for the top rows only.
+    # Kernels without a StringIds row stay out of the LAG, so every top gap has names.
     gap_sql = f"""\
 WITH ordered AS (
     SELECT k.streamId,
            k.deviceId,
-           k.start, k.[end],
-           s.value AS kernel_name,
-           LAG(k.[end]) OVER (PARTITION BY k.deviceId, k.streamId ORDER BY k.start) AS prev_end,
-           LAG(s.value) OVER (PARTITION BY k.deviceId, k.streamId ORDER BY k.start) AS prev_kernel
+           k.start,
+           k.shortName,
+           LAG(k.[end]) OVER w AS prev_end,
+           LAG(k.shortName) OVER w AS prev_short
     FROM {kernel_tbl} k
-    JOIN StringIds s ON k.shortName = s.id
     WHERE k.deviceId = ? {trim_clause}
+      AND k.shortName IN (SELECT id FROM StringIds)
+    WINDOW w AS (PARTITION BY k.deviceId, k.streamId ORDER BY k.start)
+),
+gaps AS (
+    SELECT streamId,
+           deviceId,
+           prev_end AS start_ns,
+           start AS end_ns,
+           (start - prev_end) AS gap_ns,
+           prev_short,
+           shortName
+    FROM ordered
+    WHERE prev_end IS NOT NULL AND (start - prev_end) > ?
+    ORDER BY gap_ns DESC
+    LIMIT ?
 )
-SELECT streamId,
-       deviceId,
-       prev_end AS start_ns,
-       start AS end_ns,
-       (start - prev_end) AS gap_ns,
-       prev_kernel AS before_kernel,
-       kernel_name AS after_kernel
-FROM ordered
-WHERE prev_end IS NOT NULL AND (start - prev_end) > ?
-ORDER BY gap_ns DESC
-LIMIT ?"""
+SELECT g.streamId,
+       g.deviceId,
+       g.start_ns,
+       g.end_ns,
+       g.gap_ns,
+       sb.value AS before_kernel,
+       sa.value AS after_kernel
+FROM gaps g
+JOIN StringIds sb ON g.prev_short = sb.id
+JOIN StringIds sa ON g.shortName = sa.id
+ORDER BY g.gap_ns DESC"""
     try:
         cur = adapter.execute(gap_sql, trim_params + [min_gap_ns, limit])
         cols = [d[0] for d in cur.description]
@@ -256,8 +273,7 @@ def _format(rows):
 
     for r in data_rows:
         before = r.get("before_kernel") or "(start of stream)"
-        if len(before) > 38:
-            before = before[:35] + "..."
+        before = ellipsize(before, 38)
 
         attr = r.get("attribution", {})
         attr_text = attr.get("category", "") if attr else ""
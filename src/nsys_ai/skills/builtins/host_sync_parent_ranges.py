@@ -7,7 +7,9 @@ report the total sync time and event count. Used by Mode 6 to localize
 code via `grep` (PRINCIPLES.md §5.7 Step 1).
 """
 
-from ...connection import DB_ERRORS, wrap_connection
+from collections import defaultdict
+
+from ...connection import DB_ERRORS, DuckDBAdapter, wrap_connection
 from ..base import Skill, SkillParam
 
 # Substring patterns matched via SQL `LIKE '%<pattern>%'`. Intentionally narrow:
@@ -19,6 +21,48 @@ DEFAULT_PATTERNS = "item,_local_scalar_dense,cudaStreamSynchronize"
 _MAX_LIMIT = 1000
 
 
+def _sweep_parent_totals(rows, limit: int) -> list[tuple]:
+    """Ancestry attribution by a per-thread sweep over start-ordered ranges.
+
+    ``rows`` are ``(label, tid, start, end_ns, is_sync)`` ordered by
+    ``(tid, start, end_ns DESC)``, so every ancestor of a range is seen
+    before it.  The ranges still open at a child's start are its only
+    candidate parents, making the cost O(N × nesting depth) instead of the
+    O(N²) range self-join SQLite would run.  Produces the same
+    ``(parent_range, n_syncs, sync_ns, top_child_label)`` rows as the SQL.
+    """
+    parent_totals: dict[str, list[int]] = {}
+    child_totals: dict[tuple[str, str], list[int]] = defaultdict(lambda: [0, 0])
+    open_ranges: list[tuple] = []
+    cur_tid = None
+    for label, tid, start, end_ns, is_sync in rows:
+        if tid != cur_tid:
+            open_ranges = []
+            cur_tid = tid
+        elif open_ranges:
+            open_ranges = [r for r in open_ranges if r[2] >= start]
+        if is_sync and label is not None:
+            sync_ns = end_ns - start
+            for p_label, p_start, p_end in open_ranges:
+                if p_label is None or p_end < end_ns or (p_start == start and p_end == end_ns):
+                    continue
+                totals = parent_totals.setdefault(p_label, [0, 0])
+                totals[0] += 1
+                totals[1] += sync_ns
+                child = child_totals[(p_label, label)]
+                child[0] += 1
+                child[1] += sync_ns
+        open_ranges.append((label, start, end_ns))
+
+    top_child: dict[str, tuple] = {}
+    for (parent, child), (n, ns) in child_totals.items():
+        key = (-ns, -n, child)
+        if parent not in top_child or key < top_child[parent]:
+            top_child[parent] = key
+    ranked = sorted(parent_totals.items(), key=lambda kv: -kv[1][1])[:limit]
+    return [(parent, n, ns, top_child[parent][2]) for parent, (n, ns) in ranked]
+
+
 def _execute(conn, **kwargs):
     try:
         limit = int(kwargs.get("limit", 5))
@@ -76,9 +120,10 @@ def _execute(conn, **kwargs):
     #
     # Performance: we pre-filter sync children into their own CTE so the
     # ancestry join runs over only the rows that match the sync patterns,
-    # instead of the full NVTX set.
-    sql = f"""
-        WITH resolved AS (
+    # instead of the full NVTX set.  DuckDB runs the range join as an
+    # IEJoin; SQLite has no range join and would nest-loop it, so there the
+    # resolved ranges are streamed in order into _sweep_parent_totals.
+    resolved_sql = f"""
             SELECT {label_expr} AS label,
                    n.globalTid   AS tid,
                    n.start       AS start,
@@ -87,7 +132,9 @@ def _execute(conn, **kwargs):
             {label_join}
             WHERE n.[end] > n.start
               AND n.eventType IN (59, 60)
-              {trim_where}
+              {trim_where}"""
+    sql = f"""
+        WITH resolved AS ({resolved_sql}
         ),
         sync_children AS (
             SELECT label, tid, start, end_ns
@@ -143,8 +190,19 @@ def _execute(conn, **kwargs):
     """
 
     try:
-        cur = adapter.execute(sql, trim_params + like_params)
-        rows = cur.fetchall()
+        if isinstance(adapter, DuckDBAdapter):
+            rows = adapter.execute(sql, trim_params + like_params).fetchall()
+        else:
+            cur = adapter.execute(
+                f"""
+                SELECT label, tid, start, end_ns, ({like_clause}) AS is_sync
+                FROM ({resolved_sql}
+                )
+                ORDER BY tid, start, end_ns DESC
+                """,
+                trim_params + like_params,
+            )
+            rows = _sweep_parent_totals(cur, limit)
     except DB_ERRORS as exc:
         return [
             {
@@ -7,7 +7,7 @@ a slow iteration.
 
 import statistics
 
-from ..base import Skill, SkillParam
+from ..base import Skill, SkillParam, ellipsize
 
 
 def _execute(conn, **kwargs):
@@ -60,8 +60,7 @@ def _execute(conn, **kwargs):
     for k in kernels[:5]:
         pct = round(k["total_ns"] / total_kernel_ns * 100, 1) if total_kernel_ns > 0 else 0
         name = k.get("demangled", "?")
-        if len(name) > 60:
-            name = name[:57] + "..."
+        name = ellipsize(name, 60)
         top_kernels.append(
             {
                 "name": name,
@@ -5,7 +5,7 @@ nanosecond start/end timestamps. Essential for building findings.json
 evidence overlays on the timeline viewer.
 """
 
-from ..base import Skill, SkillParam
+from ..base import Skill, SkillParam, ellipsize
 
 
 def _execute(conn, **kwargs):
@@ -63,8 +63,7 @@ def _format(rows):
     lines = ["── Kernel Instances ──"]
     for r in rows:
         name = r.get("kernel_name", "?")
-        if len(name) > 60:
-            name = name[:57] + "..."
+        name = ellipsize(name, 60)
         lines.append(
             f"  {name:<62s}  {r['duration_ms']:>8.3f}ms  "
             f"stream={r['stream_id']}  "
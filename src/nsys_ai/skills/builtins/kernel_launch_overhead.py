@@ -1,6 +1,6 @@
 """CUDA API launch overhead — time between API call and kernel execution."""
 
-from ..base import Skill, SkillParam
+from ..base import Skill, SkillParam, ellipsize
 
 
 def _format(rows):
@@ -13,8 +13,7 @@ def _format(rows):
     ]
     for r in rows:
         name = r["kernel_name"]
-        if len(name) > 48:
-            name = name[:45] + "..."
+        name = ellipsize(name, 48)
         lines.append(
             f"{name:<50s}  {r['api_ms']:>8.3f}  {r['kernel_ms']:>9.3f}  {r['overhead_us']:>13.1f}"
         )
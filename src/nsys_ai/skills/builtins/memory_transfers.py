@@ -2,8 +2,6 @@
 
 from ..base import Skill, SkillParam
 
-_COPY_KINDS = {1: "H2D", 2: "D2H", 8: "D2D", 10: "P2P"}
-
 
 def _format(rows):
     if not rows:
@@ -14,9 +12,8 @@ def _format(rows):
         "─" * 44,
     ]
     for r in rows:
-        direction = _COPY_KINDS.get(r["copyKind"], f"kind={r['copyKind']}")
         lines.append(
-            f"{direction:<10s}  {r['count']:>7d}  {r['total_mb']:>10.2f}  {r['total_ms']:>10.2f}"
+            f"{r['direction']:<10s}  {r['count']:>7d}  {r['total_mb']:>10.2f}  {r['total_ms']:>10.2f}"
         )
     return "\n".join(lines)
 
@@ -32,6 +29,10 @@ SKILL = Skill(
     category="memory",
     sql="""\
 SELECT k.copyKind,
+       CASE k.copyKind
+           WHEN 1 THEN 'H2D' WHEN 2 THEN 'D2H' WHEN 8 THEN 'D2D' WHEN 10 THEN 'P2P'
+           ELSE 'kind=' || CAST(k.copyKind AS VARCHAR)
+       END AS direction,
        COUNT(*) AS count,
        ROUND(SUM(k.bytes) / 1e6, 2) AS total_mb,
        ROUND(SUM(k.[end] - k.start) / 1e6, 2) AS total_ms
@@ -19,7 +19,13 @@ SKILL = Skill(
     ),
     category="communication",
     sql="""\
-WITH nccl_ops AS (
+WITH nccl_names AS MATERIALIZED (
+    -- Match the names once, not once per kernel row
+    SELECT id, value
+    FROM StringIds
+    WHERE value LIKE '%nccl%' OR value LIKE '%NCCL%'
+),
+nccl_ops AS (
     SELECT
         s.value AS name,
         k.correlationId,
@@ -28,8 +34,8 @@ WITH nccl_ops AS (
         k.[end],
         (k.[end] - k.start) AS dur_ns
     FROM {kernel_table} k
-    JOIN StringIds s ON k.shortName = s.id
-    WHERE (s.value LIKE '%nccl%' OR s.value LIKE '%NCCL%')
+    JOIN nccl_names s ON k.shortName = s.id
+    WHERE k.shortName IN (SELECT id FROM nccl_names)
         {trim_clause}
 ),
 op_stats AS (
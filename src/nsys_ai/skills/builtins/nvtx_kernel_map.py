@@ -1,6 +1,6 @@
 """Map NVTX annotation ranges to their GPU kernel children."""
 
-from ..base import Skill, SkillParam
+from ..base import Skill, SkillParam, ellipsize
 
 
 def _execute(conn, **kwargs):
@@ -43,12 +43,8 @@ def _format(rows):
         "─" * 126,
     ]
     for r in rows:
-        nvtx = r["nvtx_text"] or "(unnamed)"
-        if len(nvtx) > 48:
-            nvtx = nvtx[:45] + "..."
-        kern = r["kernel_name"]
-        if len(kern) > 48:
-            kern = kern[:45] + "..."
+        nvtx = ellipsize(r["nvtx_text"] or "(unnamed)", 48)
+        kern = ellipsize(r["kernel_name"], 48)
         lines.append(f"{nvtx:<50s}  {kern:<50s}  {r['start_ms']:>10.3f}  {r['end_ms']:>10.3f}")
     return "\n".join(lines)
 
@@ -22,7 +22,7 @@ from nsys_ai.connection import (
     cached_nvtx_map_uses_path_id,
 )
 
-from ..base import Skill, SkillParam
+from ..base import Skill, SkillParam, ellipsize
 
 # Compact vs full output (CLI --report removed; skills still accept -p report=…).
 REPORT_FULL = "full"
@@ -892,8 +892,7 @@ def _format(rows):
         else:
             for tk in r.get("top_kernels", []):
                 k_name = tk["kernel_name"]
-                if len(k_name) > 50:
-                    k_name = k_name[:47] + "..."
+                k_name = ellipsize(k_name, 50)
                 lines.append(f"    └─ {k_name}  ({tk['total_ms']:.3f}ms)")
     return "\n".join(lines)
 
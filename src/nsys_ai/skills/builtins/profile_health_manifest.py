@@ -13,7 +13,7 @@ import dataclasses
 import logging
 from datetime import datetime, timezone
 
-from ..base import Skill, SkillParam
+from ..base import Skill, SkillParam, ellipsize
 
 _log = logging.getLogger(__name__)
 
@@ -114,8 +114,7 @@ def _execute(conn, **kwargs):
     top_kernels = []
     for r in agg_kernels[:5]:
         name = r.get("demangled", "?")
-        if len(name) > 60:
-            name = name[:57] + "..."
+        name = ellipsize(name, 60)
         top_kernels.append(
             {
                 "name": name,
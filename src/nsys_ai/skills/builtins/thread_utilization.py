@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from ..base import Skill, SkillParam
+from ..base import Skill, SkillParam, ellipsize
 
 
 def _execute(conn: Any, *, limit: int = 10, **_kwargs):
@@ -18,18 +18,30 @@ def _execute(conn: Any, *, limit: int = 10, **_kwargs):
     if "COMPOSITE_EVENTS" not in tables:
         return []
 
+    # Aggregate per thread once; the total and the thread-name lookups then
+    # run over the per-thread rows instead of rescanning COMPOSITE_EVENTS.
     sql = f"""\
-SELECT ce.globalTid % 0x1000000 AS tid,
-       (SELECT s.value FROM StringIds s
-        WHERE s.id = (SELECT tn.nameId FROM ThreadNames tn
-                      WHERE tn.globalTid = ce.globalTid LIMIT 1)
-       ) AS thread_name,
-       ROUND(100.0 * SUM(ce.cpuCycles) / (
-           SELECT MAX(1, SUM(cpuCycles)) FROM COMPOSITE_EVENTS
-       ), 2) AS cpu_pct
-FROM COMPOSITE_EVENTS ce
-GROUP BY ce.globalTid
-ORDER BY cpu_pct DESC
+WITH per_thread AS (
+    SELECT globalTid, SUM(cpuCycles) AS cycles
+    FROM COMPOSITE_EVENTS
+    GROUP BY globalTid
+),
+total AS (
+    SELECT MAX(1, SUM(cycles)) AS cycles FROM per_thread
+),
+names AS (
+    SELECT globalTid, MIN(nameId) AS nameId
+    FROM ThreadNames
+    GROUP BY globalTid
+)
+SELECT pt.globalTid % 0x1000000 AS tid,
+       s.value AS thread_name,
+       ROUND(100.0 * pt.cycles / total.cycles, 2) AS cpu_pct
+FROM per_thread pt
+CROSS JOIN total
+LEFT JOIN names n ON n.globalTid = pt.globalTid
+LEFT JOIN StringIds s ON s.id = n.nameId
+ORDER BY pt.cycles DESC, tid
 LIMIT {int(limit)}"""
 
     cursor = adapter.execute(sql)
@@ -47,8 +59,7 @@ def _format(rows):
     ]
     for r in rows:
         name = r["thread_name"] or "(unnamed)"
-        if len(name) > 38:
-            name = name[:35] + "..."
+        name = ellipsize(name, 38)
         cpu_pct = r["cpu_pct"] if r["cpu_pct"] is not None else 0
         lines.append(f"{r['tid']:>8d}  {name:<40s}  {cpu_pct:>7.2f}")
     return "\n".join(lines)
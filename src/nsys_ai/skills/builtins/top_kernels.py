@@ -1,8 +1,10 @@
 """Top GPU kernels by total execution time."""
 
+import sqlite3
+
 from nsys_ai.connection import DB_ERRORS
 
-from ..base import Skill, SkillParam
+from ..base import Skill, SkillParam, ellipsize
 
 
 def _format(rows):
@@ -15,8 +17,7 @@ def _format(rows):
     ]
     for r in rows:
         name = r["kernel_name"]
-        if len(name) > 55:
-            name = name[:52] + "..."
+        name = ellipsize(name, 55)
 
         tc_status = "[-]"
         if r.get("tc_eligible") is None:
@@ -31,6 +32,42 @@ def _format(rows):
     return "\n".join(lines)
 
 
+# Per-connection TEMP table of per-(shortName, demangledName) duration stats.
+# The untrimmed fallback aggregates this instead of rescanning every kernel,
+# so repeated runs (different ``limit`` values) cost O(distinct kernels).
+_STATS_TABLE = "_nsysai_kernel_stats"
+
+
+def _kernel_stats_table(conn, kernel_table: str) -> str | None:
+    """Materialize the kernel stats TEMP table once; None if it can't be created."""
+    try:
+        # TEMP objects count as writes under the "scan" preset's query_only
+        query_only = isinstance(conn, sqlite3.Connection) and bool(
+            conn.execute("PRAGMA query_only").fetchone()[0]
+        )
+        if query_only:
+            conn.execute("PRAGMA query_only = 0")
+        try:
+            conn.execute(
+                f"""
+                CREATE TEMP TABLE IF NOT EXISTS {_STATS_TABLE} AS
+                SELECT shortName, demangledName,
+                       COUNT(*) AS n,
+                       SUM("end" - start) AS total_ns,
+                       MIN("end" - start) AS min_ns,
+                       MAX("end" - start) AS max_ns
+                FROM {kernel_table}
+                GROUP BY shortName, demangledName
+                """
+            )
+        finally:
+            if query_only:
+                conn.execute("PRAGMA query_only = 1")
+    except DB_ERRORS:
+        return None
+    return _STATS_TABLE
+
+
 def _execute(conn, **kwargs):
     limit = int(kwargs.get("limit", 15))
     trim_start = kwargs.get("trim_start_ns")
@@ -87,24 +124,45 @@ def _execute(conn, **kwargs):
         if trim_start is not None and trim_end is not None:
             trim_clause = 'AND k.start >= ? AND k."end" <= ?'
             params.extend([trim_start, trim_end])
-
-        sql = f"""
-            SELECT COALESCE(d.value, s.value, 'kernel_' || CAST(k.shortName AS VARCHAR)) AS kernel_name,
-                   COUNT(*) AS invocations,
-                   ROUND(SUM(k."end" - k.start) / 1e6, 2) AS total_ms,
-                   ROUND(AVG(k."end" - k.start) / 1e6, 2) AS avg_ms,
-                   ROUND(MIN(k."end" - k.start) / 1e6, 2) AS min_ms,
-                   ROUND(MAX(k."end" - k.start) / 1e6, 2) AS max_ms,
-                   NULL AS tc_eligible,
-                   NULL AS tc_active
-            FROM {kernel_table} k
-            LEFT JOIN StringIds s ON k.shortName = s.id
-            LEFT JOIN StringIds d ON k.demangledName = d.id
-            WHERE 1=1 {trim_clause}
-            GROUP BY COALESCE(d.value, s.value, 'kernel_' || CAST(k.shortName AS VARCHAR))
-            ORDER BY total_ms DESC
-            LIMIT {limit}
-        """
+            stats_table = None
+        else:
+            stats_table = _kernel_stats_table(conn, kernel_table)
+
+        if stats_table:
+            sql = f"""
+                SELECT COALESCE(d.value, s.value, 'kernel_' || CAST(k.shortName AS VARCHAR)) AS kernel_name,
+                       SUM(k.n) AS invocations,
+                       ROUND(SUM(k.total_ns) / 1e6, 2) AS total_ms,
+                       ROUND(SUM(k.total_ns) / CAST(SUM(k.n) AS DOUBLE) / 1e6, 2) AS avg_ms,
+                       ROUND(MIN(k.min_ns) / 1e6, 2) AS min_ms,
+                       ROUND(MAX(k.max_ns) / 1e6, 2) AS max_ms,
+                       NULL AS tc_eligible,
+                       NULL AS tc_active
+                FROM {stats_table} k
+                LEFT JOIN StringIds s ON k.shortName = s.id
+                LEFT JOIN StringIds d ON k.demangledName = d.id
+                GROUP BY COALESCE(d.value, s.value, 'kernel_' || CAST(k.shortName AS VARCHAR))
+                ORDER BY total_ms DESC
+                LIMIT {limit}
+            """
+        else:
+            sql = f"""
+                SELECT COALESCE(d.value, s.value, 'kernel_' || CAST(k.shortName AS VARCHAR)) AS kernel_name,
+                       COUNT(*) AS invocations,
+                       ROUND(SUM(k."end" - k.start) / 1e6, 2) AS total_ms,
+                       ROUND(AVG(k."end" - k.start) / 1e6, 2) AS avg_ms,
+                       ROUND(MIN(k."end" - k.start) / 1e6, 2) AS min_ms,
+                       ROUND(MAX(k."end" - k.start) / 1e6, 2) AS max_ms,
+                       NULL AS tc_eligible,
+                       NULL AS tc_active
+                FROM {kernel_table} k
+                LEFT JOIN StringIds s ON k.shortName = s.id
+                LEFT JOIN StringIds d ON k.demangledName = d.id
+                WHERE 1=1 {trim_clause}
+                GROUP BY COALESCE(d.value, s.value, 'kernel_' || CAST(k.shortName AS VARCHAR))
+                ORDER BY total_ms DESC
+                LIMIT {limit}
+            """
         rows = conn.execute(sql, params).fetchall()
         cols = [
             "kernel_name",
@@ -1,13 +1,13 @@
 """
-registry.py — Skill auto-discovery and lookup.
+registry.py — Skill registration and lookup.
 
-Walks the builtins/ directory for Python files that export a SKILL constant.
+Imports the builtins/ modules listed in ``builtins.MODULES``; each exports a
+SKILL constant.
 Also supports loading skills from markdown files in custom directories.
 """
 
 import importlib
 import logging
-import pkgutil
 import re
 import sqlite3
 from pathlib import Path
@@ -20,17 +20,18 @@ _log = logging.getLogger(__name__)
 # Global registry
 _SKILLS: dict[str, Skill] = {}
 _LOADED = False
+_CATALOG: str | None = None  # rendered skill_catalog(), see _invalidate()
 
 
 def _load_builtins():
-    """Import all modules in nsys_ai.skills.builtins and register their SKILL."""
+    """Import the modules in nsys_ai.skills.builtins.MODULES and register their SKILL."""
     global _LOADED
     if _LOADED:
         return
 
-    from . import builtins
+    from .builtins import MODULES
 
-    for _importer, modname, _ispkg in pkgutil.iter_modules(builtins.__path__):
+    for modname in MODULES:
         mod = importlib.import_module(f".builtins.{modname}", package="nsys_ai.skills")
         skill = getattr(mod, "SKILL", None)
         if isinstance(skill, Skill):
@@ -44,9 +45,16 @@ def _load_builtins():
     _LOADED = True
 
 
+def _invalidate():
+    """Drop cached views of the registry; call after changing ``_SKILLS``."""
+    global _CATALOG
+    _CATALOG = None
+
+
 def register(skill: Skill):
     """Register a skill manually (for user-contributed skills)."""
     _SKILLS[skill.name] = skill
+    _invalidate()
 
 
 def list_skills() -> list[str]:
@@ -80,12 +88,18 @@ def run_skill(name: str, conn: sqlite3.Connection, **kwargs) -> str:
 
 
 def skill_catalog() -> str:
-    """Return the full skill catalog as text (for agent system prompts)."""
+    """Return the full skill catalog as text (for agent system prompts).
+
+    Rendered once and reused until a skill is registered or removed.
+    """
+    global _CATALOG
     _load_builtins()
-    lines = ["## Available Skills", ""]
-    for skill in all_skills():
-        lines.append(skill.to_tool_description())
-    return "\n".join(lines)
+    if _CATALOG is None:
+        lines = ["## Available Skills", ""]
+        for skill in all_skills():
+            lines.append(skill.to_tool_description())
+        _CATALOG = "\n".join(lines)
+    return _CATALOG
 
 
 # ---------------------------------------------------------------------------
@@ -211,6 +225,7 @@ def remove_custom_skill(name: str, dir_path: str) -> bool:
         target.unlink()
         if name in _SKILLS:
             del _SKILLS[name]
+            _invalidate()
         _log.debug("Removed custom skill '%s' from %s", name, dir_path)
         return True
     return False
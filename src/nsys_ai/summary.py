@@ -15,8 +15,23 @@ def gpu_summary(prof: Profile, device: int, trim: tuple[int, int] | None = None)
 
     Returns a dict with: hardware, top_kernels, streams, nvtx_top_level, timing.
     """
+    return _summarize(prof, device, prof.kernels(device, trim))
+
+
+def gpu_summary_batch(
+    prof: Profile, devices: list[int], trim: tuple[int, int] | None = None
+) -> dict[int, dict]:
+    """
+    Generate :func:`gpu_summary` reports for several GPUs from one kernel query.
+
+    Returns ``{device: summary}`` in the order of *devices*.
+    """
+    by_device = prof.kernels_by_device(devices, trim)
+    return {device: _summarize(prof, device, by_device[device]) for device in devices}
+
+
+def _summarize(prof: Profile, device: int, kernels: list[dict]) -> dict:
     info = prof.meta.gpu_info.get(device)
-    kernels = prof.kernels(device, trim)
 
     if not kernels:
         return {"device": device, "error": "no kernels found"}
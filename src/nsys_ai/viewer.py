@@ -5,6 +5,7 @@ Uses string.Template with HTML template files for clean separation between
 Python logic and HTML/CSS/JS presentation.
 """
 
+import functools
 import html
 import json
 import logging
@@ -22,13 +23,19 @@ _CUDA_MEMCPY_KIND_LABELS = {
     8: "D2D",
     10: "P2P",
 }
+# JSON embedded in pages or served to the browser: no ", " / ": " padding and
+# raw UTF-8 instead of \uXXXX escapes, which only inflate the payload.
+_JSON_KW = {"separators": (",", ":"), "ensure_ascii": False}
 
 
+@functools.lru_cache(maxsize=16)
 def _load_template(name: str) -> Template:
-    """Load an HTML template from the templates directory."""
-    path = os.path.join(_TEMPLATE_DIR, name)
-    with open(path, encoding="utf-8") as f:
-        return Template(f.read())
+    """Load an HTML template from the templates directory.
+
+    Cached for the life of the process; call ``_load_template.cache_clear()``
+    to pick up edited templates.
+    """
+    return Template(_read_template_text(name))
 
 
 def _read_template_text(name: str) -> str:
@@ -53,7 +60,7 @@ def _escape_json_for_html_attr(value) -> str:
     if isinstance(value, str):
         json_text = value
     else:
-        json_text = json.dumps(value)
+        json_text = json.dumps(value, **_JSON_KW)
     # Escape HTML-sensitive characters and single quotes for single-quoted attrs.
     return (
         json_text.replace("&", "&amp;")
@@ -82,13 +89,13 @@ def generate_html(prof, device: int, trim: tuple[int, int]) -> str:
     profile_id = f"{device}_{trim_sec[0]:.1f}_{trim_sec[1]:.1f}"
 
     # Escape profile path for safe embedding in <script>
-    safe_profile_path = _escape_json_for_html_script(json.dumps(prof.path))
+    safe_profile_path = _escape_json_for_html_script(json.dumps(prof.path, **_JSON_KW))
 
     tmpl = _load_template("nvtx_tree.html")
     db_agent_flag = os.environ.get("NSYS_AI_DB_AGENT", "").strip().lower()
     db_agent_enabled = bool(db_agent_flag) and db_agent_flag not in ("0", "false", "no", "off")
     return tmpl.safe_substitute(
-        DATA=json.dumps(tree_json),
+        DATA=_escape_json_for_html_script(json.dumps(tree_json, **_JSON_KW)),
         GPU_LABEL=gpu_label,
         TRIM_LABEL=f"{trim[0] / 1e9:.1f}s - {trim[1] / 1e9:.1f}s",
         PROFILE_ID=profile_id,
@@ -276,7 +283,7 @@ def generate_timeline_data_json(prof, devices, trim: tuple[int, int]) -> str:
     Called by the ``/api/data`` endpoint for on-demand tile loading.
     """
     gpu_entries = build_timeline_gpu_data(prof, devices, trim)
-    return json.dumps({"gpus": gpu_entries})
+    return json.dumps({"gpus": gpu_entries}, **_JSON_KW)
 
 
 def generate_timeline_html(
@@ -313,14 +320,14 @@ def generate_timeline_html(
             detail["mem_gb"] = round(gpu_info.memory_bytes / 1e9)
             gpu_type = gpu_info.name
         gpu_details.append(detail)
-    gpu_info_json = json.dumps(gpu_details)
+    gpu_info_json = json.dumps(gpu_details, **_JSON_KW)
     gpu_label = f"{len(devices)}× {gpu_type}" if len(devices) > 1 else gpu_type
-    gpu_label_json = json.dumps(gpu_label)
+    gpu_label_json = json.dumps(gpu_label, **_JSON_KW)
 
     if trim is not None:
         # Full data baked into HTML (kernel-first payload).
         gpu_entries = build_timeline_gpu_data(prof, devices, trim)
-        data_json = json.dumps({"gpus": gpu_entries})
+        data_json = json.dumps({"gpus": gpu_entries}, **_JSON_KW)
         trim_label = f"{trim[0] / 1e9:.1f}s - {trim[1] / 1e9:.1f}s"
         progressive = ""
     else:
@@ -335,9 +342,9 @@ def generate_timeline_html(
     safe_data_json = _escape_json_for_html_script(data_json)
     safe_gpu_info_json = _escape_json_for_html_script(gpu_info_json)
     safe_gpu_label_json = _escape_json_for_html_script(gpu_label_json)
-    safe_findings_json = _escape_json_for_html_script(json.dumps(findings_data or []))
+    safe_findings_json = _escape_json_for_html_script(json.dumps(findings_data or [], **_JSON_KW))
     safe_profile_path_json = _escape_json_for_html_script(
-        json.dumps(profile_path) if profile_path is not None else "null"
+        json.dumps(profile_path, **_JSON_KW) if profile_path is not None else "null"
     )
 
     tmpl = _load_template("timeline.html")
@@ -409,7 +416,7 @@ def generate_evidence_html(
         if gpu_info:
             gpu_type = gpu_info.name
     gpu_label = f"{len(devices)}× {gpu_type}" if len(devices) > 1 else gpu_type
-    gpu_label_json = json.dumps(gpu_label)
+    gpu_label_json = json.dumps(gpu_label, **_JSON_KW)
 
     # Time range
     time_range = list(prof.meta.time_range)
@@ -10,15 +10,17 @@ Usage:
     nsys-ai perfetto profile.sqlite --gpu 0 --trim 39 42
 """
 
+import gzip
+import io
 import json
 import logging
 import os
 import queue
+import select
 import signal
 import socketserver
 import threading
 import time as _time
-import webbrowser
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from urllib.parse import quote
 
@@ -34,6 +36,148 @@ CHAT_SERVER_QUEUE_SIZE = 16
 _TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
 
 
+def _gzip_payload(body: bytes) -> bytes:
+    """Compress a static page/trace once at server start.
+
+    Level 1 keeps start-up fast while still shrinking repetitive HTML/JSON
+    by an order of magnitude; ``mtime=0`` keeps the output deterministic.
+    Callers drop the uncompressed source afterwards: ``_run_server`` blocks
+    in their frame, so a live local would pin a second copy for the
+    server's lifetime.
+    """
+    return gzip.compress(body, compresslevel=1, mtime=0)
+
+
+# Events per json.dumps call when streaming a Perfetto trace into gzip.
+_TRACE_ENCODE_BATCH = 10_000
+
+
+def _gzip_trace_json(events: list[dict]) -> tuple[bytes, int]:
+    """Encode ``{"traceEvents": events, ...}`` straight into a gzip stream.
+
+    Batches go through the C ``json`` encoder and are compressed as they are
+    produced, so the full uncompressed JSON never exists in memory.  The
+    decompressed bytes equal ``json.dumps(..., **_JSON_KW)`` of the whole trace.
+    Returns ``(gzip_bytes, uncompressed_size)``.
+    """
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=1, mtime=0) as gz:
+        gz.write(b'{"traceEvents":[')
+        for i in range(0, len(events), _TRACE_ENCODE_BATCH):
+            if i:
+                gz.write(b",")
+            batch = json.dumps(events[i : i + _TRACE_ENCODE_BATCH], **_JSON_KW)
+            gz.write(batch[1:-1].encode("utf-8"))
+        gz.write(b'],"displayTimeUnit":"ms"}')
+        size = gz.tell()
+    return buf.getvalue(), size
+
+
+def _parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse a single-range ``Range: bytes=...`` header into ``(start, stop)``.
+
+    Returns None when there is no header or it is not one byte range (the
+    whole body is served).  Raises ValueError when the range is unsatisfiable.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, sep, last = header[len("bytes=") :].strip().partition("-")
+    if not sep or not (first + last).isdigit():
+        return None
+    if not first:  # suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        stop = size if int(last) else 0
+    else:
+        start = int(first)
+        stop = min(int(last) + 1, size) if last else size
+        if last and int(last) < start:
+            return None
+    if start >= stop:
+        raise ValueError(f"unsatisfiable range {header!r} for {size} bytes")
+    return start, stop
+
+
+def _begin_gzipped(
+    handler: BaseHTTPRequestHandler,
+    body_gz: bytes,
+    content_type: str,
+    *,
+    ranges: bool = False,
+) -> bytes:
+    """Send the status line and headers for a pre-gzipped body; return the body to write.
+
+    Clients that do not advertise gzip get the payload inflated per request.
+    With ``ranges=True`` a single ``Range`` request is answered with 206 (or
+    416); offsets refer to the bytes actually sent, i.e. the gzip stream when
+    the client accepts gzip.
+    The caller adds any extra headers, then ``end_headers()`` and writes.
+    """
+    accepts_gzip = "gzip" in handler.headers.get("Accept-Encoding", "")
+    body = body_gz if accepts_gzip else gzip.decompress(body_gz)
+    size = len(body)
+    span = None
+    if ranges:
+        try:
+            span = _parse_byte_range(handler.headers.get("Range"), size)
+        except ValueError:
+            handler.send_response(416)
+            handler.send_header("Content-Range", f"bytes */{size}")
+            handler.send_header("Content-Length", "0")
+            return b""
+    if span is None:
+        handler.send_response(200)
+    else:
+        body = body[span[0] : span[1]]
+        handler.send_response(206)
+        handler.send_header("Content-Range", f"bytes {span[0]}-{span[1] - 1}/{size}")
+    handler.send_header("Content-Type", content_type)
+    if accepts_gzip:
+        handler.send_header("Content-Encoding", "gzip")
+    handler.send_header("Vary", "Accept-Encoding")
+    if ranges:
+        handler.send_header("Accept-Ranges", "bytes")
+    handler.send_header("Content-Length", str(len(body)))
+    return body
+
+
+# Seconds an idle keep-alive connection may hold a pool worker.
+_KEEPALIVE_TIMEOUT = 5
+# How often an idle keep-alive connection checks whether others are queued.
+_KEEPALIVE_POLL = 0.05
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 handler: browsers reuse one connection for page, assets and tiles.
+
+    Every response must carry Content-Length (or close the connection).  An
+    idle connection keeps its pool worker for at most ``_KEEPALIVE_TIMEOUT``
+    and closes as soon as another connection is queued, so idle browser
+    sockets never delay new requests on the bounded worker pool.
+    """
+
+    protocol_version = "HTTP/1.1"
+    timeout = _KEEPALIVE_TIMEOUT
+
+    def handle(self):
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self._await_next_request():
+            self.handle_one_request()
+
+    def _await_next_request(self) -> bool:
+        """Wait for the client's next request; False closes the idle connection."""
+        waiting = getattr(self.server, "_request_queue", None)
+        deadline = _time.monotonic() + self.timeout
+        while True:
+            readable, _, _ = select.select([self.connection], [], [], _KEEPALIVE_POLL)
+            if readable:
+                return True
+            if waiting is not None and not waiting.empty():
+                return False
+            if _time.monotonic() >= deadline:
+                return False
+
+
 class _ThreadPoolMixIn(socketserver.ThreadingMixIn):
     """Use a fixed-size thread pool instead of one thread per request. Prevents thread exhaustion."""
 
@@ -78,8 +222,8 @@ class _ThreadedHTTPServer(_ThreadPoolMixIn, socketserver.ThreadingMixIn, HTTPSer
     allow_reuse_address = True
 
 
-from .export import gpu_trace  # noqa: E402
 from .viewer import (  # noqa: E402
+    _JSON_KW,
     build_timeline_gpu_data,
     generate_evidence_html,
     generate_html,
@@ -105,6 +249,8 @@ def _run_server(server, open_url, prof):
         )
     print("Press Ctrl-C to stop.")
     if open_url:
+        import webbrowser
+
         open_target = (
             actual_url if (open_url and open_url.startswith("http://127.0.0.1:")) else open_url
         )
@@ -161,12 +307,12 @@ def _handle_chat_stream(body_bytes: bytes):
     return None
 
 
-class _ViewerHandler(BaseHTTPRequestHandler):
+class _ViewerHandler(_KeepAliveHandler):
     """Serve the pre-rendered HTML on GET; GET /api/models for model list;
     GET /api/data for on-demand tile data; GET /api/meta for profile metadata;
     POST /api/chat for AI chat."""
 
-    html_bytes: bytes = b""
+    html_gz: bytes = b""  # gzip-compressed page, see _gzip_payload
     prof = None  # set by serve_timeline
     devices: list = []  # set by serve_timeline
     _prebuilt_data: list = []  # pre-built timeline payload per GPU
@@ -205,11 +351,9 @@ class _ViewerHandler(BaseHTTPRequestHandler):
             with _FINDINGS_LOCK:
                 self._json_response(list(self._findings))
             return
-        self.send_response(200)
-        self.send_header("Content-Type", "text/html; charset=utf-8")
-        self.send_header("Content-Length", str(len(self.html_bytes)))
+        body = _begin_gzipped(self, self.html_gz, "text/html; charset=utf-8")
         self.end_headers()
-        self.wfile.write(self.html_bytes)
+        self.wfile.write(body)
 
     def _serve_asset(self, filename: str, content_type: str):
         """Serve static timeline assets from package templates directory."""
@@ -339,7 +483,7 @@ class _ViewerHandler(BaseHTTPRequestHandler):
                     # Backward-compatible fallback for older in-memory format.
                     filtered = _filter_nodes_by_time(gpu_data["data"], start_ns, end_ns)
                     gpu_entries.append({"id": gpu_data["id"], "data": filtered})
-            data_json = json.dumps({"gpus": gpu_entries})
+            data_json = json.dumps({"gpus": gpu_entries}, **_JSON_KW)
             body = data_json.encode("utf-8")
             elapsed = _time.monotonic() - t0
             print(
@@ -430,10 +574,7 @@ class _ViewerHandler(BaseHTTPRequestHandler):
                 print("[chat] stream request received", flush=True)
                 gen = _handle_chat_stream(body)
                 if gen is None:
-                    self.send_response(501)
-                    self.send_header("Content-Type", "application/json; charset=utf-8")
-                    self.end_headers()
-                    self.wfile.write(b'{"error":"LLM not configured"}')
+                    self._json_response({"error": "LLM not configured"}, 501)
                     return
                 self.send_response(200)
                 self.send_header("Content-Type", "text/event-stream")
@@ -448,10 +589,7 @@ class _ViewerHandler(BaseHTTPRequestHandler):
                 return
             out = _handle_chat_request(body)
             if out is None:
-                self.send_response(501)
-                self.send_header("Content-Type", "application/json; charset=utf-8")
-                self.end_headers()
-                self.wfile.write(b'{"error":"LLM not configured"}')
+                self._json_response({"error": "LLM not configured"}, 501)
                 return
             self.send_response(200)
             self.send_header("Content-Type", "application/json; charset=utf-8")
@@ -463,10 +601,7 @@ class _ViewerHandler(BaseHTTPRequestHandler):
             pass
         except Exception as e:
             _log.exception("Chat endpoint error")
-            self.send_response(500)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": str(e)}).encode("utf-8"))
+            self._json_response({"error": str(e)}, 500)
 
     def log_message(self, format, *args):
         pass
@@ -476,8 +611,7 @@ def serve(prof, device: int, trim: tuple[int, int], *, port: int = 8142, open_br
     """Start a local HTTP server serving the interactive HTML viewer.
     If the requested port is in use, tries port 0 (system assigns a free port) and opens that URL.
     """
-    html = generate_html(prof, device, trim)
-    _ViewerHandler.html_bytes = html.encode("utf-8")
+    _ViewerHandler.html_gz = _gzip_payload(generate_html(prof, device, trim).encode("utf-8"))
 
     try:
         server = _ThreadedHTTPServer(("127.0.0.1", port), _ViewerHandler)
@@ -579,18 +713,19 @@ def serve_timeline(
 
     if trim is not None:
         # Legacy: render full HTML with all data baked in
-        html = generate_timeline_html(
+        html_bytes = generate_timeline_html(
             prof, devices, trim, findings_data=findings_data, profile_path=_profile_path
-        )
+        ).encode("utf-8")
         _ViewerHandler._prebuilt_nvtx_mode = "full"
     else:
         # Progressive: generate shell HTML, data fetched via /api/data
-        html = generate_timeline_html(
+        html_bytes = generate_timeline_html(
             prof, devices, None, findings_data=findings_data, profile_path=_profile_path
-        )
+        ).encode("utf-8")
         _ViewerHandler._prebuilt_nvtx_mode = "tile"
 
-    _ViewerHandler.html_bytes = html.encode("utf-8")
+    _ViewerHandler.html_gz = _gzip_payload(html_bytes)
+    del html_bytes
 
     # Pre-build full kernel-first timeline payload for all GPUs (progressive mode)
     if trim is None:
@@ -679,10 +814,10 @@ def serve_timeline(
 # ── Mode 3: Evidence View ────────────────────────────────────────
 
 
-class _EvidenceHandler(BaseHTTPRequestHandler):
+class _EvidenceHandler(_KeepAliveHandler):
     """Serve the Evidence View HTML; GET /api/data for progressive kernel tiles."""
 
-    html_bytes: bytes = b""
+    html_gz: bytes = b""  # gzip-compressed page, see _gzip_payload
     prof = None
     devices: list = []
     _prebuilt_data: list = []
@@ -704,11 +839,9 @@ class _EvidenceHandler(BaseHTTPRequestHandler):
             self._handle_data()
             return
         # Default: serve evidence HTML
-        self.send_response(200)
-        self.send_header("Content-Type", "text/html; charset=utf-8")
-        self.send_header("Content-Length", str(len(self.html_bytes)))
+        body = _begin_gzipped(self, self.html_gz, "text/html; charset=utf-8")
         self.end_headers()
-        self.wfile.write(self.html_bytes)
+        self.wfile.write(body)
 
     def _serve_asset(self, filename: str, content_type: str):
         body = self.__class__._asset_cache.get(filename)
@@ -757,7 +890,7 @@ class _EvidenceHandler(BaseHTTPRequestHandler):
                 if "kernels" in gpu_data:
                     filtered = _filter_timeline_gpu_entry(gpu_data, start_ns, end_ns)
                     gpu_entries.append(filtered)
-            data_json = json.dumps({"gpus": gpu_entries})
+            data_json = json.dumps({"gpus": gpu_entries}, **_JSON_KW)
             body = data_json.encode("utf-8")
             self.send_response(200)
             self.send_header("Content-Type", "application/json; charset=utf-8")
@@ -790,8 +923,9 @@ def serve_evidence(
 
     devices: list[int] = list(device) if isinstance(device, Sequence) else [device]
 
-    html = generate_evidence_html(prof, devices, findings_data, title)
-    _EvidenceHandler.html_bytes = html.encode("utf-8")
+    _EvidenceHandler.html_gz = _gzip_payload(
+        generate_evidence_html(prof, devices, findings_data, title).encode("utf-8")
+    )
 
     # Set up progressive tile data (reuse _ViewerHandler's prebuilt data)
     _ViewerHandler.prof = prof
@@ -825,10 +959,10 @@ def serve_evidence(
 # ── Mode 4: Perfetto UI ─────────────────────────────────────────
 
 
-class _PerfettoHandler(BaseHTTPRequestHandler):
+class _PerfettoHandler(_KeepAliveHandler):
     """Serve Perfetto JSON trace with CORS so ui.perfetto.dev can fetch it."""
 
-    trace_bytes: bytes = b""
+    trace_gz: bytes = b""  # gzip-compressed trace JSON, see _gzip_payload
 
     def do_OPTIONS(self):
         """Handle CORS preflight."""
@@ -837,17 +971,16 @@ class _PerfettoHandler(BaseHTTPRequestHandler):
         self.end_headers()
 
     def do_GET(self):
-        self.send_response(200)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(self.trace_bytes)))
+        body = _begin_gzipped(self, self.trace_gz, "application/json", ranges=True)
         self._cors_headers()
         self.end_headers()
-        self.wfile.write(self.trace_bytes)
+        self.wfile.write(body)
 
     def _cors_headers(self):
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "*")
+        self.send_header("Access-Control-Expose-Headers", "Content-Range, Accept-Ranges")
 
     def log_message(self, format, *args):
         pass
@@ -857,15 +990,21 @@ def serve_perfetto(
     prof, device: int, trim: tuple[int, int], *, port: int = 8143, open_browser: bool = True
 ):
     """Generate Perfetto JSON, serve it locally, and open ui.perfetto.dev."""
-    events = gpu_trace(prof, device, trim)
-    trace = json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
-    _PerfettoHandler.trace_bytes = trace.encode("utf-8")
+    # Deferred: .export pulls in the DuckDB/Parquet cache, which the other
+    # views and importers of this module's helpers do not need.
+    from .export import gpu_trace
 
+    events = gpu_trace(prof, device, trim)
     nk = sum(1 for e in events if e.get("cat") == "gpu_kernel")
     nn = sum(1 for e in events if e.get("cat") == "nvtx_projected")
-    print(f"Trace: {nk} kernels, {nn} NVTX, {len(trace) // 1024} KB")
+    _PerfettoHandler.trace_gz, trace_size = _gzip_trace_json(events)
+    del events
+    print(
+        f"Trace: {nk} kernels, {nn} NVTX, {trace_size // 1024} KB "
+        f"({len(_PerfettoHandler.trace_gz) // 1024} KB gzipped)"
+    )
 
-    server = HTTPServer(("127.0.0.1", port), _PerfettoHandler)
+    server = _ThreadedHTTPServer(("127.0.0.1", port), _PerfettoHandler)
     actual_port = server.server_address[1]
     trace_url = f"http://127.0.0.1:{actual_port}/trace.json"
     perfetto_url = f"https://ui.perfetto.dev/#!/?url={quote(trace_url, safe='')}"
@@ -4,7 +4,10 @@ conftest.py — Shared pytest fixtures for nsys-ai tests.
 All fixtures here are available to every test module without explicit imports.
 """
 
+import os
 import sqlite3
+import subprocess
+import sys
 
 import pytest
 
@@ -170,6 +173,52 @@ INSERT INTO NVTX_EVENTS (globalTid, start, end, text, eventType, rangeId) VALUES
 """
 
 
+@pytest.fixture(autouse=True)
+def _disable_skill_result_cache(monkeypatch):
+    """Keep tests off the user's on-disk skill result and profile metadata caches.
+
+    Tests that exercise a cache re-enable it with a temporary directory.
+    """
+    monkeypatch.setenv("NSYS_AI_SKILL_CACHE", "0")
+    monkeypatch.setenv("NSYS_AI_META_CACHE", "0")
+
+
+@pytest.fixture
+def run_cli(monkeypatch, capsys):
+    """Return a function that runs ``nsys-ai <argv...>`` in-process.
+
+    The result is a ``subprocess.CompletedProcess`` with the exit code and the
+    captured stdout/stderr, so tests read like ``subprocess.run`` callers
+    without paying an interpreter start per invocation.
+    """
+    from nsys_ai.cli.app import main
+
+    # main() exports these for the profile layer; restore them after the test.
+    for var in ("NSYS_AI_SQLITE_PRESET", "NSYS_AI_SQLITE_MMAP_BYTES"):
+        original = os.environ.get(var)
+        monkeypatch.setenv(var, original or "")
+        if original is None:
+            monkeypatch.delenv(var)
+
+    def run(*argv):
+        argv = ["nsys-ai", *map(str, argv)]
+        monkeypatch.setattr(sys, "argv", argv)
+        capsys.readouterr()
+        try:
+            main()
+            code = 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                code = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                code = 1
+        out, err = capsys.readouterr()
+        return subprocess.CompletedProcess(argv, code, out, err)
+
+    return run
+
+
 @pytest.fixture
 def minimal_nsys_conn():
     """Return a SQLite connection pre-populated with minimal Nsight tables.
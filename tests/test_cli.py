@@ -1,8 +1,11 @@
 """Basic smoke tests for nsys-ai package."""
 
+import re
 import subprocess
 import sys
 
+import pytest
+
 
 def test_help():
     """CLI --help should exit 0."""
@@ -22,12 +25,17 @@ def test_import():
     assert nsys_ai.__version__  # non-empty
 
 
-def test_subcommands():
+def test_help_subcommand_shows_guide(run_cli):
+    """``nsys-ai help`` has no handler and falls through to the guide."""
+    result = run_cli("help")
+    assert result.returncode == 0
+    assert "Getting Started:" in result.stdout
+
+
+def test_subcommands(run_cli):
     """Public CLI surface should stay small and web/AI focused."""
-    result = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "--help"], capture_output=True, text=True
-    )
-    for cmd in [
+    result = run_cli("--help")
+    expected = {
         "open",
         "web",
         "timeline-web",
@@ -42,8 +50,10 @@ def test_subcommands():
         "skill",
         "evidence",
         "cutracer",
-    ]:
-        assert cmd in result.stdout, f"Missing subcommand: {cmd}"
+    }
+    listed = set(re.findall(r"^\s{2,}(\w[\w-]*)\s", result.stdout, re.M))
+    missing = expected - listed
+    assert not missing, f"Missing subcommands: {sorted(missing)}"
 
     # Legacy command names should be hidden from top-level help.
     usage_line = result.stdout.splitlines()[0]
@@ -55,74 +65,171 @@ def test_subcommands():
     assert ",agent}" not in usage_line
 
 
-def test_chat_subcommand_help():
-    """chat subcommand should have --help and accept a profile argument."""
-    result = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "chat", "--help"], capture_output=True, text=True
+def test_parser_builds_only_requested_subcommand():
+    """A known command only constructs its own subparser; unknown ones get all."""
+    from nsys_ai.cli.parsers import _MAIN_COMMANDS, _build_legacy_parser, _build_parser
+
+    def choices(parser):
+        return set(parser._subparsers._group_actions[0].choices)
+
+    assert choices(_build_parser("info")) == {"info"}
+    assert choices(_build_legacy_parser("summary")) == {"summary"}
+    assert choices(_build_parser("not-a-command")) == set(_MAIN_COMMANDS)
+    assert choices(_build_parser()) == set(_MAIN_COMMANDS)
+
+    args = _build_parser("skill").parse_args(["skill", "run", "top_kernels", "p.sqlite"])
+    assert args.skill_name == "top_kernels"
+
+
+def test_gpu_trim_command_table_is_registered():
+    """Every spec-table command is reachable and parses its extra options."""
+    from nsys_ai.cli.handlers import _cmd_tui
+    from nsys_ai.cli.parsers import (
+        _GPU_TRIM_COMMANDS,
+        _LEGACY_COMMANDS,
+        _MAIN_COMMANDS,
+        _build_legacy_parser,
+    )
+
+    registered = set(_MAIN_COMMANDS) | set(_LEGACY_COMMANDS)
+    assert {spec[0] for spec in _GPU_TRIM_COMMANDS} <= registered
+
+    args = _build_legacy_parser("tui").parse_args(
+        ["tui", "p.sqlite", "--gpu", "1", "--trim", "1", "2", "--depth", "3"]
+    )
+    assert (args.gpu, args.trim, args.depth, args.min_ms) == (1, [1.0, 2.0], 3, 0)
+    assert args.handler is _cmd_tui
+
+
+def test_cli_import_defers_cutracer_installer():
+    """Building a non-cutracer parser must not import the cutracer installer."""
+    code = (
+        "import sys\n"
+        "from nsys_ai.cli.parsers import _build_parser\n"
+        "_build_parser('info')\n"
+        "print('nsys_ai.cutracer.installer' in sys.modules)\n"
     )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_parser_builder_routes_from_command_registries():
+    """Legacy-only commands and skill management go to the legacy parser."""
+    from nsys_ai.cli.parsers import _build_legacy_parser, _build_parser, _parser_builder_for
+
+    assert _parser_builder_for(["summary", "p.sqlite"]) is _build_legacy_parser
+    assert _parser_builder_for(["skill", "add", "x.md"]) is _build_legacy_parser
+    assert _parser_builder_for(["skill", "list"]) is _build_parser
+    assert _parser_builder_for(["info", "p.sqlite"]) is _build_parser
+    assert _parser_builder_for(["p.sqlite"]) is _build_parser
+    assert _parser_builder_for([]) is _build_parser
+
+
+def test_parse_trim_returns_cached_trim():
+    """_parse_trim converts seconds to a Trim in ns and caches it on args."""
+    import argparse
+
+    from nsys_ai.cli.handlers import Trim, _parse_trim
+
+    args = argparse.Namespace(trim=[1.5, 2.0])
+    trim = _parse_trim(args)
+    assert trim == Trim(1_500_000_000, 2_000_000_000)
+    assert _parse_trim(args) is trim
+    assert _parse_trim(argparse.Namespace(trim=None)) is None
+
+
+def test_parse_trim_rejects_inverted_window(capsys):
+    """An empty or inverted --trim window is an error, not an empty result."""
+    import argparse
+
+    import pytest
+
+    from nsys_ai.cli.handlers import _parse_trim
+
+    with pytest.raises(SystemExit):
+        _parse_trim(argparse.Namespace(trim=[3.0, 1.0]))
+    assert "must be less than END" in capsys.readouterr().err
+
+
+def test_parse_trim_converts_seconds_exactly():
+    """Decimal --trim values map to exact ns, not float-truncated ones."""
+    import argparse
+
+    from nsys_ai.cli.handlers import Trim, _parse_trim, _seconds_to_ns
+
+    assert int(8.2 * 1e9) == 8_199_999_999
+    assert _seconds_to_ns(8.2) == 8_200_000_000
+    assert _seconds_to_ns(0.000001) == 1_000
+    assert _parse_trim(argparse.Namespace(trim=[1.005, 8.2])) == Trim(1_005_000_000, 8_200_000_000)
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ("skill", "run", "top_kernels", "p.sqlite"),
+        ("cutracer", "plan", "p.sqlite"),
+    ],
+)
+def test_inverted_trim_is_an_argument_error(run_cli, argv):
+    """An inverted --trim is reported like any other argparse error (exit 2)."""
+    result = run_cli(*argv, "--trim", "3", "1")
+    assert result.returncode == 2
+    assert result.stderr.startswith("usage:")
+    assert "--trim START (3.0s) must be less than END (1.0s)" in result.stderr
+
+
+def test_chat_subcommand_help(run_cli):
+    """chat subcommand should have --help and accept a profile argument."""
+    result = run_cli("chat", "--help")
     assert result.returncode == 0
     assert "profile" in result.stdout
 
 
-def test_diff_web_subcommand_help():
+def test_diff_web_subcommand_help(run_cli):
     """diff-web subcommand should have --help and accept before/after paths."""
-    result = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "diff-web", "--help"], capture_output=True, text=True
-    )
+    result = run_cli("diff-web", "--help")
     assert result.returncode == 0
     assert "before" in result.stdout
     assert "after" in result.stdout
 
 
-def test_diff_subcommand_help():
+def test_diff_subcommand_help(run_cli):
     """diff subcommand should have --help and accept before/after paths."""
-    result = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "diff", "--help"], capture_output=True, text=True
-    )
+    result = run_cli("diff", "--help")
     assert result.returncode == 0
     assert "before" in result.stdout
     assert "after" in result.stdout
 
 
-def test_cutracer_subcommand_help():
+def test_cutracer_subcommand_help(run_cli):
     """cutracer subcommand should expose expected actions."""
-    result = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "cutracer", "--help"], capture_output=True, text=True
-    )
+    result = run_cli("cutracer", "--help")
     assert result.returncode == 0
     for action in ["check", "analyze", "plan", "install", "run"]:
         assert action in result.stdout
 
 
-def test_legacy_analyze_still_available():
+def test_legacy_analyze_still_available(run_cli):
     """Hidden legacy command should still parse and show help."""
-    result = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "analyze", "--help"], capture_output=True, text=True
-    )
+    result = run_cli("analyze", "--help")
     assert result.returncode == 0
     assert "--gpu" in result.stdout
 
 
-def test_agent_guide():
+def test_agent_guide(run_cli):
     """agent-guide subcommand should print the system prompt payload."""
-    result = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "agent-guide"], capture_output=True, text=True
-    )
+    result = run_cli("agent-guide")
     assert result.returncode == 0
     assert "nsys-ai Agent Guide" in result.stdout
     assert "Orient" in result.stdout
     assert "Available Skills" in result.stdout
 
 
-def test_skill_info():
+def test_skill_info(run_cli):
     """skill info subcommand should return a JSON schema."""
     import json
 
-    result = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "skill", "info", "top_kernels"],
-        capture_output=True,
-        text=True,
-    )
+    result = run_cli("skill", "info", "top_kernels")
     assert result.returncode == 0
     schema = json.loads(result.stdout)
     assert schema["name"] == "top_kernels"
@@ -133,25 +240,21 @@ def test_skill_info():
     assert schema["parameters"]["limit"]["default"] == 15
 
 
-def test_hidden_skill_management_commands():
+def test_hidden_skill_management_commands(run_cli):
     """Hidden skill management subcommands like add/remove/save should still parse correctly."""
-    result = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "skill", "add", "--help"], capture_output=True, text=True
-    )
+    result = run_cli("skill", "add", "--help")
     assert result.returncode == 0
     assert "skill_file" in result.stdout
 
 
-def test_evidence_requires_subcommand():
+def test_evidence_requires_subcommand(run_cli):
     """'nsys-ai evidence' without a sub-action should fail fast (exit != 0)."""
-    result = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "evidence"], capture_output=True, text=True
-    )
+    result = run_cli("evidence")
     assert result.returncode != 0
     assert "build" in result.stderr  # argparse should mention valid choices
 
 
-def test_skill_run_duckdb_cache(tmp_path):
+def test_skill_run_duckdb_cache(tmp_path, run_cli):
     """skill run should work end-to-end, preferring DuckDB/Parquet cache when available."""
     import json
     import sqlite3
@@ -176,21 +279,7 @@ def test_skill_run_duckdb_cache(tmp_path):
     """)
     conn.close()
 
-    result = subprocess.run(
-        [
-            sys.executable,
-            "-m",
-            "nsys_ai",
-            "skill",
-            "run",
-            "schema_inspect",
-            str(db_path),
-            "--format",
-            "json",
-        ],
-        capture_output=True,
-        text=True,
-    )
+    result = run_cli("skill", "run", "schema_inspect", str(db_path), "--format", "json")
     assert result.returncode == 0, f"stderr: {result.stderr}\nstdout: {result.stdout}"
     rows = json.loads(result.stdout)
     assert isinstance(rows, list)
@@ -57,6 +57,22 @@ def minimal_conn(tmp_path):
 
 
 class TestBuildPlan:
+    def test_trim_converts_seconds_exactly(self, minimal_conn, monkeypatch):
+        """The trim window reaches top_kernels as exact ns, like every other command."""
+        from nsys_ai.cutracer.planner import build_plan
+        from nsys_ai.skills.builtins.top_kernels import SKILL
+
+        seen = {}
+
+        def capture(conn, **kwargs):
+            seen.update(kwargs)
+            return []
+
+        monkeypatch.setattr(SKILL, "execute_fn", capture)
+        plan = build_plan(minimal_conn, profile_path="/fake/p.sqlite", trim=(1.005, 8.2))
+        assert (seen["trim_start_ns"], seen["trim_end_ns"]) == (1_005_000_000, 8_200_000_000)
+        assert plan.trim == (1.005, 8.2)
+
     def test_returns_plan(self, minimal_conn):
         from nsys_ai.cutracer.planner import build_plan
 
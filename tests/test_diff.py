@@ -1,7 +1,5 @@
 import json
 import sqlite3
-import subprocess
-import sys
 
 
 def _make_db_with_target_info(path: str, gpu_name: str = "NVIDIA A100-SXM4-80GB"):
@@ -165,7 +163,7 @@ def test_diff_engine_math(tmp_path):
     assert kC.classification == "new"
 
 
-def test_diff_cli_json_output(tmp_path):
+def test_diff_cli_json_output(tmp_path, run_cli):
     before = tmp_path / "before.sqlite"
     after = tmp_path / "after.sqlite"
     _make_profile(
@@ -181,23 +179,7 @@ def test_diff_cli_json_output(tmp_path):
         ],
     )
 
-    result = subprocess.run(
-        [
-            sys.executable,
-            "-m",
-            "nsys_ai",
-            "diff",
-            str(before),
-            str(after),
-            "--gpu",
-            "0",
-            "--format",
-            "json",
-            "--no-ai",
-        ],
-        capture_output=True,
-        text=True,
-    )
+    result = run_cli("diff", str(before), str(after), "--gpu", "0", "--format", "json", "--no-ai")
     assert result.returncode == 0, result.stderr
     payload = json.loads(result.stdout)
     assert payload["before"]["total_gpu_ns"] == 10
@@ -296,13 +278,9 @@ def test_diff_tools_get_iteration_boundaries_shape(tmp_path):
         assert "start_ns" in bnd["before"] or bnd["before"]["start_ns"] is None
 
 
-def test_diff_cli_iteration_and_marker_help():
+def test_diff_cli_iteration_and_marker_help(run_cli):
     """Phase C: diff --help shows --iteration and --marker."""
-    result = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "diff", "--help"],
-        capture_output=True,
-        text=True,
-    )
+    result = run_cli("diff", "--help")
     assert result.returncode == 0
     assert "--iteration" in result.stdout
     assert "iteration" in result.stdout.lower()
@@ -310,13 +288,9 @@ def test_diff_cli_iteration_and_marker_help():
     assert "sample_0" in result.stdout or "marker" in result.stdout.lower()
 
 
-def test_diff_cli_chat_help():
+def test_diff_cli_chat_help(run_cli):
     """Stage 6: diff --help shows --chat."""
-    result = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "diff", "--help"],
-        capture_output=True,
-        text=True,
-    )
+    result = run_cli("diff", "--help")
     assert result.returncode == 0
     assert "--chat" in result.stdout
     assert "chat" in result.stdout.lower()
@@ -587,28 +561,21 @@ def test_diff_format_terminal_with_narrative(tmp_path):
     assert "AI Narrative" not in out_no_ai
 
 
-def test_diff_cli_terminal_no_ai_shows_executive_summary(tmp_path):
+def test_diff_cli_terminal_no_ai_shows_executive_summary(tmp_path, run_cli):
     """diff --format terminal --no-ai shows Executive Summary and no AI section."""
     before = tmp_path / "before.sqlite"
     after = tmp_path / "after.sqlite"
     _make_profile(str(before), kernels=[(0, 10, 0, 7, 1, 1, 2)])
     _make_profile(str(after), kernels=[(0, 20, 0, 7, 1, 1, 2)])
-    result = subprocess.run(
-        [
-            sys.executable,
-            "-m",
-            "nsys_ai",
-            "diff",
-            str(before),
-            str(after),
-            "--gpu",
-            "0",
-            "--format",
-            "terminal",
-            "--no-ai",
-        ],
-        capture_output=True,
-        text=True,
+    result = run_cli(
+        "diff",
+        str(before),
+        str(after),
+        "--gpu",
+        "0",
+        "--format",
+        "terminal",
+        "--no-ai",
     )
     assert result.returncode == 0, result.stderr
     assert "Executive Summary" in result.stdout
@@ -619,28 +586,13 @@ def test_diff_cli_terminal_no_ai_shows_executive_summary(tmp_path):
     assert "10" in result.stdout and "20" in result.stdout
 
 
-def test_diff_cli_json_structure_unchanged(tmp_path):
+def test_diff_cli_json_structure_unchanged(tmp_path, run_cli):
     """diff --format json output does not include narrative fields (contract unchanged)."""
     before = tmp_path / "before.sqlite"
     after = tmp_path / "after.sqlite"
     _make_profile(str(before), kernels=[(0, 10, 0, 7, 1, 1, 2)])
     _make_profile(str(after), kernels=[(0, 20, 0, 7, 1, 1, 2)])
-    result = subprocess.run(
-        [
-            sys.executable,
-            "-m",
-            "nsys_ai",
-            "diff",
-            str(before),
-            str(after),
-            "--gpu",
-            "0",
-            "--format",
-            "json",
-        ],
-        capture_output=True,
-        text=True,
-    )
+    result = run_cli("diff", str(before), str(after), "--gpu", "0", "--format", "json")
     assert result.returncode == 0, result.stderr
     payload = json.loads(result.stdout)
     assert "before" in payload and "after" in payload and "top_regressions" in payload
@@ -234,6 +234,82 @@ class TestDuckDBCompatibilityFixes:
         # but the method should have run without crashing on PRAGMA
         assert type(p.meta).__name__ == "ProfileMeta"
 
+    def test_gpu_summary_batch_matches_per_gpu(self, duckdb_conn):
+        """gpu_summary_batch should equal per-device gpu_summary calls."""
+        from nsys_ai.profile import Profile
+        from nsys_ai.summary import gpu_summary, gpu_summary_batch
+
+        p = Profile._from_conn(duckdb_conn)
+        devices = p.meta.devices + [99]  # 99 has no kernels
+        trim = (0, 10_000_000)
+        batch = gpu_summary_batch(p, devices, trim)
+        assert list(batch) == devices
+        for dev in devices:
+            assert batch[dev] == gpu_summary(p, dev, trim)
+        assert batch[99] == {"device": 99, "error": "no kernels found"}
+
+    def test_runtime_index_buckets_threads(self, duckdb_conn):
+        """runtime_index fetches all threads at once; each gets its rows by start."""
+        from nsys_ai.profile import Profile
+
+        p = Profile._from_conn(duckdb_conn)
+        idx = p.runtime_index({100, 999}, (0, 10_000_000))
+        assert set(idx) == {100, 999}
+        assert idx[999] == []
+        expected = p._duckdb_query(
+            "SELECT start, [end], correlationId FROM CUPTI_ACTIVITY_KIND_RUNTIME "
+            "WHERE globalTid = 100 AND start >= 0 AND [end] <= 10000000 ORDER BY start"
+        )
+        assert idx[100] == expected and expected
+
+        p._RUNTIME_TID_IN_MAX = 0  # window scan, other threads dropped in Python
+        assert p.runtime_index({100, 999}, (0, 10_000_000)) == idx
+
+    def test_nvtx_events_binds_thread_ids(self, duckdb_conn):
+        """nvtx_events filters threads through bound parameters."""
+        from nsys_ai.profile import Profile
+
+        p = Profile._from_conn(duckdb_conn)
+        rows = p.nvtx_events({100, 999}, (0, 10_000_000))
+        assert [r["text"] for r in rows] == ["train_step", "forward"]
+        assert p.nvtx_events({999}, (0, 10_000_000)) == []
+
+    def test_kernels_iter_matches_kernels(self, duckdb_conn):
+        """kernels_iter yields kernels() rows across batches, even with queries in between."""
+        from nsys_ai.profile import Profile
+
+        p = Profile._from_conn(duckdb_conn)
+        p._ITER_BATCH_ROWS = 2
+        rows = []
+        for row in p.kernels_iter(None):
+            rows.append(row)
+            p.kernels(0)
+        assert rows == p.kernels(None) and len(rows) > 2
+
+    def test_kernel_map_shares_name_strings(self, duckdb_conn):
+        """kernel_map keys kernels by correlationId and reuses one string per name."""
+        from nsys_ai.profile import Profile
+
+        p = Profile._from_conn(duckdb_conn)
+        kmap = p.kernel_map(0)
+        assert len(kmap) == len(p.kernels(0))
+        first = next(iter(kmap.values()))
+        assert set(first) == {"start", "end", "stream", "name", "demangled"}
+        same_name = [k for k in kmap.values() if k["name"] == first["name"]]
+        assert len(same_name) > 1
+        assert all(k["name"] is first["name"] for k in same_name)
+
+    def test_worker_queries_on_own_cursor(self, duckdb_conn):
+        """Profile.worker() on DuckDB queries through a cursor and leaves the connection open."""
+        from nsys_ai.profile import Profile
+
+        p = Profile._from_conn(duckdb_conn)
+        worker = p.worker()
+        assert worker.db is not duckdb_conn and worker.conn is worker.db
+        assert worker.kernels(0) == p.kernels(0)
+        worker.close()
+        assert p.kernels(0)
+
     def test_memory_transfers_duckdb_error(self, duckdb_conn):
         """memory_transfers H2D distribution should catch duckdb.Error on missing table."""
         import duckdb
@@ -324,6 +324,41 @@ class TestHostSyncParentRanges:
         assert "train_step" in parents
         assert "fake_marker_range" not in parents
 
+    def test_sweep_matches_pairwise_definition_on_overlapping_ranges(self):
+        # SQLite attribution is a sweep, not a range join; it must still
+        # credit every enclosing range when ranges partially overlap
+        # (StartEnd ranges need not nest) or are exact duplicates.
+        import random
+
+        rng = random.Random(7)
+        labels = ["step", "fwd", "aten::item", "bwd"]
+        ranges = []
+        for _ in range(200):
+            start = rng.randint(0, 1000)
+            ranges.append(
+                (rng.choice(labels), start, start + rng.choice([1, 5, 50, 300]), rng.randint(1, 2))
+            )
+        ranges += ranges[:5]
+        conn = _build_conn(ranges)
+
+        expected: dict[str, list[int]] = {}
+        for c_label, c_start, c_end, c_tid in ranges:
+            if "item" not in c_label:
+                continue
+            for p_label, p_start, p_end, p_tid in ranges:
+                if (
+                    p_tid == c_tid
+                    and p_start <= c_start
+                    and p_end >= c_end
+                    and (p_start, p_end) != (c_start, c_end)
+                ):
+                    totals = expected.setdefault(p_label, [0, 0])
+                    totals[0] += 1
+                    totals[1] += c_end - c_start
+
+        out = skill_mod._execute(conn, limit=10)
+        assert {r["parent_range"]: [r["n_syncs"], r["sync_ns"]] for r in out} == expected
+
     def test_registered_in_builtin_registry(self):
         from nsys_ai.skills import registry
 
@@ -5,10 +5,8 @@ converts when needed. Optional NSYS_TEST_GPU and NSYS_TEST_TRIM (e.g. "39 42")
 override GPU id and time window; if unset, they are derived from profile metadata.
 """
 
+import functools
 import os
-import subprocess
-import sys
-import tempfile
 
 import pytest
 
@@ -18,16 +16,20 @@ TRIM_ENV = "NSYS_TEST_TRIM"
 DEFAULT_PROFILE = "data/nsys-hero/distca-0/baseline.t128k.host-fs-mbz-gpu-899"
 
 
+@functools.cache
 def _profile_path():
+    """Return the test profile path if it exists, else None (probed once per process)."""
     path = os.environ.get(PROFILE_ENV, DEFAULT_PROFILE)
-    return path if os.path.exists(path) else None
+    try:
+        os.stat(path)
+    except OSError:
+        return None
+    return path
 
 
-def _test_gpu_trim():
-    """Return (gpu, trim_start_s, trim_end_s) from env or profile metadata."""
-    path = _profile_path()
-    if path is None:
-        return None, None, None
+@functools.cache
+def _test_gpu_trim(path):
+    """Return (gpu, trim_start_s, trim_end_s) for *path* from env or profile metadata."""
     gpu_env = os.environ.get(GPU_ENV)
     trim_env = os.environ.get(TRIM_ENV)
     if gpu_env is not None and trim_env is not None:
@@ -56,140 +58,72 @@ def _test_gpu_trim():
         prof.close()
 
 
+@pytest.fixture(scope="session")
+def resolved_profile():
+    """Path of the integration profile, resolved once per session.
+
+    A ``.nsys-rep`` is exported to ``.sqlite`` here so every CLI run below
+    reuses that file instead of resolving it again.
+    """
+    from nsys_ai.profile import resolve_profile_path
+
+    return resolve_profile_path(_profile_path())
+
+
+@pytest.fixture(scope="session")
+def gpu_trim(resolved_profile):
+    """``(gpu, trim_start_s, trim_end_s)`` for the integration profile, read once."""
+    return _test_gpu_trim(resolved_profile)
+
+
 @pytest.mark.skipif(_profile_path() is None, reason="No test profile")
-def test_info():
-    path = _profile_path()
-    r = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "info", path], capture_output=True, text=True, timeout=30
-    )
+def test_info(run_cli, resolved_profile):
+    path = resolved_profile
+    r = run_cli("info", path)
     assert r.returncode == 0
     assert "GPU" in r.stdout or "Kernels" in r.stdout
 
 
 @pytest.mark.skipif(_profile_path() is None, reason="No test profile")
-def test_summary():
-    path = _profile_path()
-    r = subprocess.run(
-        [sys.executable, "-m", "nsys_ai", "summary", path],
-        capture_output=True,
-        text=True,
-        timeout=60,
-    )
+def test_summary(run_cli, resolved_profile):
+    path = resolved_profile
+    r = run_cli("summary", path)
     assert r.returncode == 0
 
 
 @pytest.mark.skipif(_profile_path() is None, reason="No test profile")
-def test_analyze():
-    path = _profile_path()
-    gpu, t0, t1 = _test_gpu_trim()
-    r = subprocess.run(
-        [
-            sys.executable,
-            "-m",
-            "nsys_ai",
-            "analyze",
-            path,
-            "--gpu",
-            str(gpu),
-            "--trim",
-            str(t0),
-            str(t1),
-        ],
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
+def test_analyze(run_cli, resolved_profile, gpu_trim):
+    path = resolved_profile
+    gpu, t0, t1 = gpu_trim
+    r = run_cli("analyze", path, "--gpu", str(gpu), "--trim", str(t0), str(t1))
     assert r.returncode == 0
     assert "Span:" in r.stdout or "Kernels:" in r.stdout
 
 
 @pytest.mark.skipif(_profile_path() is None, reason="No test profile")
-def test_analyze_markdown_output():
-    path = _profile_path()
-    gpu, t0, t1 = _test_gpu_trim()
-    with tempfile.NamedTemporaryFile(suffix=".md", delete=False) as f:
-        out = f.name
-    try:
-        r = subprocess.run(
-            [
-                sys.executable,
-                "-m",
-                "nsys_ai",
-                "analyze",
-                path,
-                "--gpu",
-                str(gpu),
-                "--trim",
-                str(t0),
-                str(t1),
-                "-o",
-                out,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-        assert r.returncode == 0
-        assert os.path.getsize(out) > 100
-    finally:
-        os.unlink(out)
+def test_analyze_markdown_output(run_cli, resolved_profile, gpu_trim, tmp_path):
+    path = resolved_profile
+    gpu, t0, t1 = gpu_trim
+    out = tmp_path / "out.md"
+    r = run_cli("analyze", path, "--gpu", str(gpu), "--trim", str(t0), str(t1), "-o", out)
+    assert r.returncode == 0
+    assert out.stat().st_size > 100
 
 
 @pytest.mark.skipif(_profile_path() is None, reason="No test profile")
-def test_export_perfetto_json():
-    path = _profile_path()
-    gpu, t0, t1 = _test_gpu_trim()
-    with tempfile.TemporaryDirectory() as d:
-        r = subprocess.run(
-            [
-                sys.executable,
-                "-m",
-                "nsys_ai",
-                "export",
-                path,
-                "--gpu",
-                str(gpu),
-                "--trim",
-                str(t0),
-                str(t1),
-                "-o",
-                d,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
-        assert r.returncode == 0
-        assert any(f.startswith("trace_gpu") and f.endswith(".json") for f in os.listdir(d))
+def test_export_perfetto_json(run_cli, resolved_profile, gpu_trim, tmp_path):
+    path = resolved_profile
+    gpu, t0, t1 = gpu_trim
+    r = run_cli("export", path, "--gpu", str(gpu), "--trim", str(t0), str(t1), "-o", tmp_path)
+    assert r.returncode == 0
+    assert any(f.startswith("trace_gpu") and f.endswith(".json") for f in os.listdir(tmp_path))
 
 
 @pytest.mark.skipif(_profile_path() is None, reason="No test profile")
-def test_export_csv():
-    path = _profile_path()
-    gpu, t0, t1 = _test_gpu_trim()
-    with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as f:
-        out = f.name
-    try:
-        r = subprocess.run(
-            [
-                sys.executable,
-                "-m",
-                "nsys_ai",
-                "export-csv",
-                path,
-                "--gpu",
-                str(gpu),
-                "--trim",
-                str(t0),
-                str(t1),
-                "-o",
-                out,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-        assert r.returncode == 0
-        assert os.path.getsize(out) > 50
-    finally:
-        os.unlink(out)
+def test_export_csv(run_cli, resolved_profile, gpu_trim, tmp_path):
+    path = resolved_profile
+    gpu, t0, t1 = gpu_trim
+    out = tmp_path / "out.csv"
+    r = run_cli("export-csv", path, "--gpu", str(gpu), "--trim", str(t0), str(t1), "-o", out)
+    assert r.returncode == 0
+    assert out.stat().st_size > 50
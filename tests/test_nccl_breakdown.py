@@ -73,6 +73,21 @@ class TestPerStreamGrouping:
         rows = nccl_breakdown(prof, device=99)
         assert rows == []
 
+    def test_name_match_is_case_insensitive_and_trimmed(self, minimal_nsys_conn):
+        """Upper-case NCCL names still count; the trim window still applies."""
+        from nsys_ai.overlap import nccl_breakdown
+        from nsys_ai.profile import Profile
+
+        minimal_nsys_conn.execute("UPDATE StringIds SET value = UPPER(value) WHERE value LIKE 'nccl%'")
+        prof = Profile._from_conn(minimal_nsys_conn)
+        rows = nccl_breakdown(prof, device=0)
+        assert {(r["stream_id"], r["type"]) for r in rows} >= {
+            (7, "reducescatter"),
+            (8, "allreduce"),
+        }
+        trimmed = nccl_breakdown(prof, device=0, trim=(2_000_000, 4_000_000))
+        assert {(r["stream_id"], r["type"]) for r in trimmed} == {(8, "allreduce")}
+
 
 # ── Format tests ─────────────────────────────────────────────────
 
@@ -80,3 +80,161 @@ def test_cache_mode_auto_large_mocked(minimal_nsys_db_path, tmp_path):
             # Alias views should still be accessible
             res = prof.db.execute("SELECT COUNT(*) FROM CUPTI_ACTIVITY_KIND_RUNTIME").fetchone()
             assert res[0] >= 0
+
+
+def test_sqlite_mmap_disabled_by_default(minimal_nsys_db_path, monkeypatch):
+    monkeypatch.delenv("NSYS_AI_SQLITE_MMAP_BYTES", raising=False)
+    monkeypatch.delenv("NSYS_AI_SQLITE_PRESET", raising=False)
+    with Profile(str(minimal_nsys_db_path), cache_mode="direct") as prof:
+        assert prof.conn.execute("PRAGMA mmap_size").fetchone()[0] == 0
+
+
+def test_sqlite_mmap_env_override(minimal_nsys_db_path, monkeypatch):
+    monkeypatch.setenv("NSYS_AI_SQLITE_MMAP_BYTES", str(1 << 20))
+    with Profile(str(minimal_nsys_db_path), cache_mode="direct") as prof:
+        assert prof.conn.execute("PRAGMA mmap_size").fetchone()[0] == 1 << 20
+
+
+def test_sqlite_cache_size_env_override(minimal_nsys_db_path, monkeypatch):
+    monkeypatch.setenv("NSYS_AI_SQLITE_CACHE_MB", "512")
+    with Profile(str(minimal_nsys_db_path), cache_mode="direct") as prof:
+        assert prof.conn.execute("PRAGMA cache_size").fetchone()[0] == -512 * 1024
+
+
+def test_sqlite_scan_preset(minimal_nsys_db_path, monkeypatch):
+    monkeypatch.delenv("NSYS_AI_SQLITE_MMAP_BYTES", raising=False)
+    monkeypatch.setenv("NSYS_AI_SQLITE_PRESET", "scan")
+    with Profile(str(minimal_nsys_db_path), cache_mode="direct") as prof:
+        assert prof.conn.execute("PRAGMA mmap_size").fetchone()[0] == 256 * 1024 * 1024
+        assert prof.conn.execute("PRAGMA query_only").fetchone()[0] == 1
+
+
+def test_profile_meta_reused_for_unchanged_file(minimal_nsys_db_path):
+    import os
+
+    path = str(minimal_nsys_db_path)
+    with Profile(path) as prof:
+        first = prof.meta
+
+    with mock.patch.object(Profile, "_discover", side_effect=AssertionError("rediscovered")):
+        with Profile(path) as prof:
+            assert prof.meta == first
+            assert prof.meta is not first  # callers get private copies
+
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    with mock.patch.object(Profile, "_discover", return_value=first) as discover:
+        with Profile(path):
+            pass
+    discover.assert_called_once()
+
+
+def test_profile_meta_persisted_across_processes(minimal_nsys_db_path, monkeypatch, tmp_path):
+    from nsys_ai import profile as profile_mod
+
+    monkeypatch.setenv("NSYS_AI_META_CACHE", "1")
+    monkeypatch.setenv("NSYS_AI_META_CACHE_DIR", str(tmp_path / "meta"))
+    path = str(minimal_nsys_db_path)
+    with Profile(path) as prof:
+        first = prof.meta
+    assert len(list((tmp_path / "meta").glob("*.json"))) == 1
+
+    # A fresh process starts with an empty in-memory cache.
+    monkeypatch.setattr(profile_mod, "_META_CACHE", {})
+    with mock.patch.object(Profile, "_discover", side_effect=AssertionError("rediscovered")):
+        with Profile(path) as prof:
+            assert prof.meta == first
+
+
+@pytest.mark.parametrize("preset", ["default", "scan"])
+def test_sqlite_fallback_builds_kernel_indexes(minimal_nsys_db_path, monkeypatch, preset):
+    """Without DuckDB, Profile indexes the kernel columns its own queries filter on.
+
+    The "scan" preset's ``query_only`` is lifted for the build and restored.
+    """
+    monkeypatch.setenv("NSYS_AI_SQLITE_PRESET", preset)
+    path = str(minimal_nsys_db_path)
+    with mock.patch(
+        "nsys_ai.parquet_cache.open_direct_sqlite", side_effect=RuntimeError("no duckdb")
+    ):
+        with Profile(path, cache_mode="direct") as prof:
+            assert prof.db is None
+            indexes = {
+                r[0]
+                for r in prof.conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                ).fetchall()
+            }
+            query_only = prof.conn.execute("PRAGMA query_only").fetchone()[0]
+    assert {"_nsysai_kernel_dev_start", "_nsysai_kernel_dev_stream_start"} <= indexes
+    # (deviceId, streamId) is a prefix of the covering index; no separate copy
+    assert "_nsysai_kernel_dev_stream" not in indexes
+    assert query_only == (preset == "scan")
+
+
+def test_schema_version_from_export_skips_capture_table():
+    import sqlite3
+
+    from nsys_ai.profile import NsightSchema
+
+    conn = sqlite3.connect(":memory:")
+    for table, version in (("META_DATA_EXPORT", "2024.5.1"), ("META_DATA_CAPTURE", "old")):
+        conn.execute(f"CREATE TABLE {table} (key TEXT, value TEXT)")
+        conn.execute(f"INSERT INTO {table} VALUES ('Nsight Systems version', ?)", (version,))
+    with mock.patch.object(
+        NsightSchema, "_read_kv_table", autospec=True, side_effect=NsightSchema._read_kv_table
+    ) as read:
+        schema = NsightSchema(conn)
+    assert schema.version == "2024.5.1"
+    assert [c.args[1] for c in read.call_args_list] == ["META_DATA_EXPORT"]
+
+
+def test_read_transaction_wraps_batch_once():
+    import sqlite3
+
+    from nsys_ai.profile import _read_transaction
+
+    conn = sqlite3.connect(":memory:")
+    with _read_transaction(conn):
+        assert conn.in_transaction
+        with _read_transaction(conn):  # nested: reuses the open transaction
+            conn.execute("SELECT 1").fetchone()
+        assert conn.in_transaction
+    assert not conn.in_transaction
+
+
+def test_profile_worker_has_own_connection(minimal_nsys_db_path):
+    with Profile(str(minimal_nsys_db_path), cache_mode="direct") as prof:
+        worker = prof.worker()
+        try:
+            assert worker.conn is not prof.conn and worker._lock is not prof._lock
+            assert worker.meta == prof.meta and worker.meta is not prof.meta
+            assert worker.kernels(0) == prof.kernels(0)
+        finally:
+            worker.close()
+        assert prof.kernels(0)  # the profile's own connection stays open
+
+
+def test_profile_map_workers_keeps_order_and_handles_borrowed_conn(minimal_nsys_db_path):
+    import sqlite3
+    import threading
+
+    def probe(handle, item):
+        return item, handle.conn, threading.get_ident(), handle.kernels(0)
+
+    with Profile(str(minimal_nsys_db_path), cache_mode="direct") as prof:
+        results = prof.map_workers(probe, [1, 2, 3])
+        assert [r[0] for r in results] == [1, 2, 3]
+        assert all(r[1] is not prof.conn and r[3] == prof.kernels(0) for r in results)
+
+    # A borrowed SQLite connection is thread-bound: stay on the calling thread.
+    conn = sqlite3.connect(str(minimal_nsys_db_path))
+    try:
+        prof = Profile._from_conn(conn)
+        results = prof.map_workers(probe, [1, 2])
+        assert [(r[0], r[1], r[2]) for r in results] == [
+            (1, conn, threading.get_ident()),
+            (2, conn, threading.get_ident()),
+        ]
+    finally:
+        conn.close()
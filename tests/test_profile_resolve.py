@@ -136,6 +136,23 @@ def test_resolve_nsys_rep_failure(monkeypatch, tmp_path: Path):
     assert "nsys error" in str(exc.value)
 
 
+def test_resolve_nsys_rep_failure_discards_partial_export(monkeypatch, tmp_path: Path):
+    """A failed export must not leave a fresh .sqlite that the next open would reuse."""
+    monkeypatch.setattr(profile_mod.shutil, "which", lambda name: "/opt/nsys")
+
+    def fake_run(args, **kwargs):
+        Path(args[args.index("-o") + 1]).write_bytes(b"partial")
+        raise subprocess.CalledProcessError(1, ["nsys"], output="", stderr="killed")
+
+    monkeypatch.setattr(profile_mod.subprocess, "run", fake_run)
+
+    rep = tmp_path / "foo.nsys-rep"
+    rep.write_bytes(b"0")
+    with pytest.raises(ExportError):
+        profile_mod.resolve_profile_path(str(rep))
+    assert not (tmp_path / "foo.sqlite").exists()
+
+
 def test_resolve_nsys_rep_timeout(monkeypatch, tmp_path: Path):
     """If nsys export hangs past timeout, raise a clear RuntimeError."""
     monkeypatch.setattr(profile_mod.shutil, "which", lambda name: "/opt/nsys")
@@ -51,6 +51,16 @@ def test_list_skills():
     assert names == expected
 
 
+def test_builtin_modules_list_matches_package():
+    """builtins.MODULES must name every skill module in the package."""
+    import pkgutil
+
+    from nsys_ai.skills import builtins
+
+    found = sorted(name for _, name, _ in pkgutil.iter_modules(builtins.__path__))
+    assert sorted(builtins.MODULES) == found
+
+
 def test_get_skill():
     """Should retrieve a specific skill by name."""
     from nsys_ai.skills.registry import get_skill
@@ -159,6 +169,98 @@ def test_skill_execute_json_serializable():
     conn.close()
 
 
+def test_skill_execute_columnar_matches_rows(minimal_nsys_conn):
+    """execute_columnar() returns the execute() rows transposed, for SQL and Python skills."""
+    from nsys_ai.skills.registry import get_skill
+
+    for name in ("stream_concurrency", "schema_inspect"):
+        skill = get_skill(name)
+        rows = skill.execute(minimal_nsys_conn)
+        columns = skill.execute_columnar(minimal_nsys_conn)
+        assert rows
+        assert list(columns) == list(rows[0])
+        assert [dict(zip(columns, vals)) for vals in zip(*columns.values())] == rows
+
+
+def test_top_kernels_stats_table_matches_full_scan(minimal_nsys_conn):
+    """Untrimmed top_kernels reads a TEMP stats table that agrees with a raw scan."""
+    from nsys_ai.skills.registry import get_skill
+
+    skill = get_skill("top_kernels")
+    rows = skill.execute(minimal_nsys_conn)
+    tables = minimal_nsys_conn.execute("SELECT name FROM temp.sqlite_master").fetchall()
+    assert ("_nsysai_kernel_stats",) in tables
+    # A trim window covering everything bypasses the stats table.
+    assert rows == skill.execute(minimal_nsys_conn, trim_start_ns=0, trim_end_ns=2**62)
+    assert skill.execute(minimal_nsys_conn, limit=1) == rows[:1]
+
+
+def test_top_kernels_stats_table_under_scan_preset(minimal_nsys_db_path, monkeypatch):
+    """The "scan" preset's query_only is lifted for the TEMP table and restored."""
+    from nsys_ai.profile import _connect_sqlite
+    from nsys_ai.skills.registry import get_skill
+
+    monkeypatch.setenv("NSYS_AI_SQLITE_PRESET", "scan")
+    conn = _connect_sqlite(minimal_nsys_db_path)
+    try:
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        rows = get_skill("top_kernels").execute(conn)
+        assert rows
+        tables = conn.execute("SELECT name FROM temp.sqlite_master").fetchall()
+        assert [tuple(t) for t in tables] == [("_nsysai_kernel_stats",)]
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def test_thread_utilization_percentages_and_names():
+    """thread_utilization reports each thread's share of cycles, named when known."""
+    from nsys_ai.skills.registry import get_skill
+
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
+        """
+        CREATE TABLE StringIds (id INTEGER PRIMARY KEY, value TEXT);
+        CREATE TABLE ThreadNames (nameId INTEGER, priority INTEGER, globalTid INTEGER);
+        CREATE TABLE COMPOSITE_EVENTS (start INTEGER, globalTid INTEGER, cpuCycles INTEGER);
+        INSERT INTO StringIds VALUES (1, 'dataloader');
+        INSERT INTO ThreadNames VALUES (1, 0, 16777217);
+        INSERT INTO COMPOSITE_EVENTS VALUES (0, 16777217, 60), (1, 16777217, 15), (2, 16777218, 25);
+        """
+    )
+    rows = get_skill("thread_utilization").execute(conn)
+    assert rows == [
+        {"tid": 1, "thread_name": "dataloader", "cpu_pct": 75.0},
+        {"tid": 2, "thread_name": None, "cpu_pct": 25.0},
+    ]
+    conn.close()
+
+
+def test_memory_transfers_labels_directions_in_sql():
+    """memory_transfers names known copy kinds and falls back to kind=N."""
+    from nsys_ai.skills.registry import get_skill
+
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
+        """
+        CREATE TABLE CUPTI_ACTIVITY_KIND_MEMCPY (
+            deviceId INT, copyKind INT, bytes INT, start INT, [end] INT
+        );
+        INSERT INTO CUPTI_ACTIVITY_KIND_MEMCPY VALUES
+            (0, 1, 2000000, 0, 3000000), (0, 11, 1000000, 0, 2000000), (0, 10, 0, 0, 1000000);
+        """
+    )
+    skill = get_skill("memory_transfers")
+    rows = skill.execute(conn)
+    assert [(r["copyKind"], r["direction"]) for r in rows] == [
+        (1, "H2D"),
+        (11, "kind=11"),
+        (10, "P2P"),
+    ]
+    assert "kind=11" in skill.format_rows(rows)
+    conn.close()
+
+
 # ---------------------------------------------------------------------------
 # C4: Markdown skill persistence tests
 # ---------------------------------------------------------------------------
@@ -326,6 +428,23 @@ def test_remove_custom_skill(tmp_path):
     assert not (tmp_path / "removable.md").exists()
 
 
+def test_skill_catalog_tracks_registered_and_removed_skills(tmp_path):
+    """The cached catalog is re-rendered when the registry changes."""
+    (tmp_path / "catalogued.md").write_text(_SAMPLE_SKILL_MD.replace("test_query", "catalogued"))
+    from nsys_ai.skills.registry import (
+        load_skill_from_markdown,
+        remove_custom_skill,
+        skill_catalog,
+    )
+
+    assert skill_catalog() is skill_catalog()
+    assert "catalogued" not in skill_catalog()
+    load_skill_from_markdown(str(tmp_path / "catalogued.md"))
+    assert "catalogued" in skill_catalog()
+    remove_custom_skill("catalogued", str(tmp_path))
+    assert "catalogued" not in skill_catalog()
+
+
 def test_remove_custom_skill_not_found(tmp_path):
     """Should return False when skill file doesn't exist."""
     from nsys_ai.skills.registry import remove_custom_skill
@@ -452,6 +571,17 @@ def test_trim_clause_no_placeholder():
     conn.close()
 
 
+def test_render_sql_memoizes_and_accepts_unhashable_params():
+    """Rendered SQL is cached per parameter set; unhashable values still format."""
+    from nsys_ai.skills.base import _render_sql, _render_sql_cached
+
+    _render_sql_cached.cache_clear()
+    assert _render_sql("SELECT {a} LIMIT {b}", {"b": 5, "a": 1}) == "SELECT 1 LIMIT 5"
+    assert _render_sql("SELECT {a} LIMIT {b}", {"a": 1, "b": 5}) == "SELECT 1 LIMIT 5"
+    assert _render_sql_cached.cache_info().hits == 1
+    assert _render_sql("SELECT {a}", {"a": [1, 2]}) == "SELECT [1, 2]"
+
+
 def test_skill_run_cli_trim_arg():
     """skill run parser should accept --trim argument."""
     from nsys_ai.cli.parsers import _build_parser
@@ -793,6 +923,30 @@ def test_gpu_idle_gaps_cpu_attribution(minimal_nsys_conn):
         )
 
 
+def test_gpu_idle_gaps_skips_kernels_without_names(minimal_nsys_conn):
+    """Unnamed kernels neither split gaps nor drop top rows after the LIMIT."""
+    from nsys_ai.skills.registry import get_skill
+
+    skill = get_skill("gpu_idle_gaps")
+
+    def gaps(**kwargs):
+        rows = skill.execute(minimal_nsys_conn, min_gap_ns=100_000, **kwargs)
+        return [
+            (r["start_ns"], r["end_ns"], r["before_kernel"], r["after_kernel"])
+            for r in rows
+            if not r.get("_summary")
+        ]
+
+    expected = gaps()
+    # shortName 999 has no StringIds row; it sits inside the 5.5-8ms gap on stream 7
+    minimal_nsys_conn.execute(
+        "INSERT INTO CUPTI_ACTIVITY_KIND_KERNEL VALUES "
+        "(100, 0, 7, 99, 6000000, 6500000, 999, 999, 1, 1, 1, 1, 1, 1)"
+    )
+    assert gaps() == expected
+    assert gaps(limit=1) == [(5_500_000, 8_000_000, "nccl_ReduceScatter_kernel", "kernel_A")]
+
+
 def test_gpu_idle_gaps_format_output(minimal_nsys_conn):
     """Format output should include summary header and attribution."""
     from nsys_ai.skills.registry import get_skill
@@ -60,3 +60,47 @@ def test_profiler_overhead_probing_and_trimming():
     # Expected union = 150 ns
     res_trimmed = dummy_skill.execute(conn, trim_start_ns=200, trim_end_ns=550)
     assert res_trimmed[0]["overhead_ns"] == 150
+
+
+def test_static_sql_skill_skips_formatting_and_overhead_probe():
+    """SQL without placeholders runs verbatim; overhead is only probed when referenced."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE PROFILER_OVERHEAD (start INTEGER, [end] INTEGER)")
+    conn.execute("INSERT INTO PROFILER_OVERHEAD VALUES (100, 400)")
+    statements = []
+    conn.set_trace_callback(statements.append)
+
+    static = Skill(name="s", title="S", description="", category="utility", sql="SELECT 1 AS x")
+    assert static._is_static
+    assert static.execute(conn, trim_start_ns=0, trim_end_ns=10) == [{"x": 1}]
+    assert not any("PROFILER_OVERHEAD" in sql for sql in statements)
+
+    templated = Skill(
+        name="t", title="T", description="", category="utility", sql="SELECT {overhead_ns} AS x"
+    )
+    assert not templated._is_static
+    assert templated.execute(conn) == [{"x": 300}]
+
+
+def test_ellipsize():
+    from nsys_ai.skills.base import ellipsize
+
+    assert ellipsize("short", 10) == "short"
+    assert ellipsize("exactly10!", 10) == "exactly10!"
+    assert ellipsize("a much longer kernel name", 10) == "a much ..."
+
+
+def test_sql_skill_fetches_tuples_on_row_factory_connections():
+    built = []
+
+    def counting_row(cursor, row):
+        built.append(row)
+        return sqlite3.Row(cursor, row)
+
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = counting_row
+    skill = Skill(name="s", title="S", description="", category="utility", sql="SELECT 1 AS x")
+    assert skill.execute(conn) == [{"x": 1}]
+    assert skill.execute_columnar(conn) == {"x": [1]}
+    assert built == []
+    assert conn.row_factory is counting_row
@@ -157,3 +157,142 @@ def test_timeline_html_export_writes_sidecar_assets(minimal_nsys_db_path, tmp_pa
     html_text = out_html.read_text(encoding="utf-8")
     assert 'href="timeline.css"' in html_text
     assert 'src="timeline.js"' in html_text
+
+
+def test_web_handlers_serve_pregzipped_payload_by_accept_encoding():
+    import gzip
+    import threading
+    import urllib.request
+    from http.server import HTTPServer
+
+    from nsys_ai import web
+
+    payload = b'{"traceEvents": []}' * 100
+    web._PerfettoHandler.trace_gz = web._gzip_payload(payload)
+    server = HTTPServer(("127.0.0.1", 0), web._PerfettoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/trace.json"
+    try:
+        req = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+        with urllib.request.urlopen(req) as resp:
+            assert resp.headers["Content-Encoding"] == "gzip"
+            assert resp.headers["Access-Control-Allow-Origin"] == "*"
+            assert gzip.decompress(resp.read()) == payload
+        with urllib.request.urlopen(url) as resp:
+            assert resp.headers["Content-Encoding"] is None
+            assert resp.read() == payload
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_perfetto_handler_keeps_alive_and_serves_byte_ranges():
+    import http.client
+    import threading
+
+    from nsys_ai import web
+
+    payload = bytes(range(256)) * 40
+    web._PerfettoHandler.trace_gz = web._gzip_payload(payload)
+    server = web._ThreadedHTTPServer(("127.0.0.1", 0), web._PerfettoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    try:
+        conn.request("GET", "/trace.json")
+        resp = conn.getresponse()
+        assert resp.status == 200 and resp.version == 11
+        assert resp.headers["Accept-Ranges"] == "bytes"
+        assert resp.read() == payload
+        sock = conn.sock
+        # Same connection: open-ended, bounded and suffix ranges, then past the end.
+        for spec, expected, content_range in (
+            ("bytes=10000-", payload[10000:], "bytes 10000-10239/10240"),
+            ("bytes=5-9", payload[5:10], "bytes 5-9/10240"),
+            ("bytes=-3", payload[-3:], "bytes 10237-10239/10240"),
+        ):
+            conn.request("GET", "/trace.json", headers={"Range": spec})
+            resp = conn.getresponse()
+            assert resp.status == 206
+            assert resp.headers["Content-Range"] == content_range
+            assert resp.read() == expected
+        conn.request("GET", "/trace.json", headers={"Range": "bytes=99999-"})
+        resp = conn.getresponse()
+        assert resp.status == 416
+        assert resp.headers["Content-Range"] == "bytes */10240"
+        resp.read()
+        assert conn.sock is sock
+    finally:
+        conn.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_idle_keepalive_connections_do_not_delay_new_requests():
+    import http.client
+    import threading
+    import time
+
+    from nsys_ai import web
+
+    web._PerfettoHandler.trace_gz = web._gzip_payload(b"{}")
+    server = web._ThreadedHTTPServer(("127.0.0.1", 0), web._PerfettoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    idle = []
+    try:
+        # Pin every pool worker with an idle keep-alive connection.
+        for _ in range(web.CHAT_SERVER_POOL_SIZE):
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            conn.request("GET", "/trace.json")
+            conn.getresponse().read()
+            idle.append(conn)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        idle.append(conn)
+        start = time.monotonic()
+        conn.request("GET", "/trace.json")
+        resp = conn.getresponse()
+        assert resp.status == 200 and resp.read() == b"{}"
+        assert time.monotonic() - start < web._KEEPALIVE_TIMEOUT / 2
+    finally:
+        for conn in idle:
+            conn.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_gzip_trace_json_matches_json_dumps(monkeypatch):
+    import gzip
+
+    from nsys_ai import web
+
+    monkeypatch.setattr(web, "_TRACE_ENCODE_BATCH", 3)
+    for n in (0, 1, 3, 7):
+        events = [{"name": f"k{i}", "ph": "X", "ts": i * 1.5, "args": {"é": i}} for i in range(n)]
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        expected = json.dumps(trace, **web._JSON_KW).encode("utf-8")
+        body_gz, size = web._gzip_trace_json(events)
+        assert gzip.decompress(body_gz) == expected
+        assert size == len(expected)
+
+
+def test_timeline_html_embeds_compact_json(minimal_nsys_db_path):
+    with Profile(minimal_nsys_db_path) as prof:
+        data_json = generate_timeline_data_json(prof, [0], (0, 10_000_000))
+        html = generate_timeline_html(prof, [0], (0, 10_000_000), profile_path="é</script>")
+    assert ", " not in data_json and '": ' not in data_json
+    assert data_json in html.replace("<\\/", "</")
+    assert '"é<\\/script>"' in html
+
+
+def test_web_import_defers_export_and_webbrowser():
+    """Importing web helpers must not load the trace exporter or webbrowser."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "import nsys_ai.web\n"
+        "print(sorted(m for m in ('nsys_ai.export', 'webbrowser') if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"